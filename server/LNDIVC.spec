@@ -26,6 +26,28 @@ a = Analysis(
         ('install_drivers.py', '.'),
         # customtkinter 테마 파일
         ('server.py', '.'),
+        # 출력 싱크
+        ('sinks.py', '.'),
+        ('frame_ring.py', '.'),
+        ('session_capture.py', '.'),
+        ('recorder.py', '.'),
+        ('pipeline.py', '.'),
+        ('autoframe.py', '.'),
+        ('effects.py', '.'),
+        ('standby.py', '.'),
+        ('qr_cache.py', '.'),
+        ('signaling.py', '.'),
+        ('rtc_internals.py', '.'),
+        ('tls.py', '.'),
+        ('static_assets.py', '.'),
+        ('cert_manager.py', '.'),
+        ('net_path.py', '.'),
+        ('netinfo.py', '.'),
+        ('ice_config.py', '.'),
+        ('listeners.py', '.'),
+        ('task_runner.py', '.'),
+        ('perf.py', '.'),
+        ('status_bus.py', '.'),
     ],
     hiddenimports=[
         # aiohttp 내부 모듈
@@ -48,6 +70,7 @@ a = Analysis(
         'av.codec',
         'av.codec.context',
         'av.container',
+        'av.audio.fifo',
         'av.filter',
         'av.frame',
         'av.packet',
@@ -0,0 +1,158 @@
+"""
+LNDIVC 자동 프레이밍
+--------------------
+중앙 크롭 대신 페르소나 얼굴을 따라가는 크롭 창.
+
+  - N 프레임마다 축소된 그레이스케일 사본을 워커 스레드의 얼굴 검출기에 넘긴다.
+    워커가 아직 바쁘면 그 프레임은 건너뛰므로 검출 비용이 프레임 경로를 막지 않는다.
+  - 검출 사이에는 마지막 얼굴 위치를 향해 크롭 창을 지수 평활로 이동하고,
+    데드존(히스테리시스) 안의 작은 움직임은 무시해 떨림을 막는다.
+  - 검출이 느리면 검출 간격을 늘려 비용을 프레임 예산 안으로 유지한다.
+
+검출기: config 'autoframe_model' 에 YuNet ONNX 경로가 있으면 cv2.FaceDetectorYN,
+없으면 OpenCV 내장 Haar cascade.  둘 다 없으면 중앙 크롭과 동일하게 동작.
+"""
+
+import logging
+import math
+import time
+
+import cv2
+import numpy as np
+
+from pipeline import LatestWorker
+
+log = logging.getLogger(__name__)
+
+_HAAR = 'haarcascade_frontalface_default.xml'
+
+
+def _make_detector(model: "str | None", width: int):
+    """(detect(gray_or_bgr) -> [(x, y, w, h), ...], 입력이 컬러인지) 반환. 불가하면 None"""
+    if model and hasattr(cv2, 'FaceDetectorYN'):
+        try:
+            yn = cv2.FaceDetectorYN.create(model, '', (width, width))
+
+            def _yunet(img):
+                yn.setInputSize((img.shape[1], img.shape[0]))
+                _, faces = yn.detect(img)
+                return [] if faces is None else [tuple(f[:4]) for f in faces]
+            return _yunet, True
+        except Exception as e:
+            log.warning(f"YuNet 로드 실패 ({e}) → Haar cascade 사용")
+    if not hasattr(cv2, 'CascadeClassifier'):   # OpenCV 5: objdetect 에서 제거됨
+        return None
+    path = getattr(getattr(cv2, 'data', None), 'haarcascades', '') + _HAAR
+    cascade = cv2.CascadeClassifier(path)
+    if cascade.empty():
+        return None
+
+    def _haar(gray):
+        return list(cascade.detectMultiScale(gray, scaleFactor=1.15, minNeighbors=4,
+                                             minSize=(24, 24)))
+    return _haar, False
+
+
+class AutoFramer:
+    """
+    crop(img) 가 target 해상도를 가득 채우는 크롭을 반환하되, 크롭 창 중심을 얼굴에 맞춘다.
+    zoom > 1 이면 채우기 크롭보다 더 좁게 잘라 얼굴을 따라갈 여유를 만든다.
+    """
+
+    def __init__(self, target_w: int, target_h: int, fps: int = 30,
+                 detect_every: int = 5, detect_width: int = 320,
+                 zoom: float = 1.2, smoothing: float = 0.12,
+                 deadzone: float = 0.06, model: "str | None" = None):
+        self.target_w     = target_w
+        self.target_h     = target_h
+        self.base_every   = max(1, detect_every)
+        self.every        = self.base_every
+        self.detect_width = detect_width
+        self.zoom         = max(1.0, zoom)
+        self.alpha        = smoothing
+        self.deadzone     = deadzone
+        self._budget_ms   = 1000.0 / fps / 2     # 검출 1회에 허용하는 워커 시간
+        self._n           = 0
+        self._cx = self._cy = 0.5                # 현재 크롭 중심 (정규화)
+        self._tx = self._ty = 0.5                # 목표 중심 (히스테리시스 적용 후)
+        self._last_face_t = 0.0
+
+        det = _make_detector(model, detect_width)
+        if det is None:
+            log.warning("얼굴 검출기 없음 → 중앙 크롭으로 동작")
+        self._detect, self._color = det if det else (None, False)
+        self._worker = LatestWorker(self._find_face, 'autoframe') if self._detect else None
+
+    @property
+    def detect_ms(self) -> float:
+        return self._worker.last_ms if self._worker is not None else 0.0
+
+    # ── 워커 ─────────────────────────────────────────────────────────
+    def _find_face(self, small: np.ndarray) -> "tuple[float, float] | None":
+        """가장 큰 얼굴의 정규화 중심 (없으면 None)"""
+        faces = self._detect(small)
+        if not len(faces):
+            return None
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        sh, sw = small.shape[:2]
+        return (x + w / 2) / sw, (y + h / 2) / sh
+
+    def _submit(self, img: np.ndarray) -> None:
+        if self._worker.busy:
+            return   # 이전 검출이 아직 진행 중 → 이번 프레임은 건너뜀
+        h, w = img.shape[:2]
+        dw = min(self.detect_width, w)
+        small = cv2.resize(img, (dw, int(h * dw / w)), interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_RGB2BGR if self._color else cv2.COLOR_RGB2GRAY)
+        self._worker.submit(small)
+
+    def _adapt(self) -> None:
+        """검출 시간이 예산을 넘으면 간격을 늘리고, 여유가 생기면 되돌린다"""
+        if self.detect_ms > self._budget_ms * self.every:
+            self.every = min(self.every * 2, 60)
+        elif self.every > self.base_every and self.detect_ms < self._budget_ms * self.every / 4:
+            self.every = max(self.every // 2, self.base_every)
+
+    # ── 프레임 경로 ─────────────────────────────────────────────────
+    def crop(self, img: np.ndarray) -> np.ndarray:
+        h, w = img.shape[:2]
+        if self._detect is not None:
+            self._n += 1
+            if self._n % self.every == 0:
+                self._adapt()
+                self._submit(img)
+            face = self._worker.poll()
+            now = time.monotonic()
+            if face is not None:
+                self._last_face_t = now
+                fx, fy = face
+                # 히스테리시스: 목표와 충분히 멀어졌을 때만 목표 갱신
+                if abs(fx - self._tx) > self.deadzone or abs(fy - self._ty) > self.deadzone:
+                    self._tx, self._ty = fx, fy
+            elif now - self._last_face_t > 3.0:
+                self._tx, self._ty = 0.5, 0.5    # 얼굴을 오래 놓치면 중앙으로 복귀
+            self._cx += self.alpha * (self._tx - self._cx)
+            self._cy += self.alpha * (self._ty - self._cy)
+
+        # 원본에서 크롭 창을 먼저 잘라낸 뒤 target 크기로 리사이즈 (전체 리사이즈보다 저렴)
+        scale = max(self.target_w / w, self.target_h / h) * self.zoom
+        cw = min(w, math.ceil(self.target_w / scale))
+        ch = min(h, math.ceil(self.target_h / scale))
+        x0 = int(np.clip(self._cx * w - cw / 2, 0, w - cw))
+        y0 = int(np.clip(self._cy * h - ch / 2, 0, h - ch))
+        roi = img[y0:y0 + ch, x0:x0 + cw]
+        if cw == self.target_w and ch == self.target_h:
+            return roi
+        return cv2.resize(roi, (self.target_w, self.target_h), interpolation=cv2.INTER_LINEAR)
+
+    def stats(self) -> dict:
+        return {
+            'detect_ms':    round(self.detect_ms, 2),
+            'detect_every': self.every,
+            'detections':   self._worker.runs if self._worker is not None else 0,
+            'center':       (round(self._cx, 3), round(self._cy, 3)),
+        }
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.close()
@@ -0,0 +1,213 @@
+"""
+LNDIVC 인증서 수명 관리
+-----------------------
+Tailscale 인증서(Let's Encrypt)는 약 90일마다 만료된다.  CertManager 는 서버 이벤트 루프
+안에서 주기적으로 cert.pem 만료일을 확인하고:
+
+  - tailscale 모드: 만료 renew_days 일 전부터 `tailscale cert` 를 비동기 subprocess 로
+    실행해 새 인증서를 받는다 (임시 파일에 받아 키 쌍을 검증한 뒤 교체).
+  - self_signed 모드: 자동 재발급하지 않는다 (Vision Pro 에서 다시 신뢰 설정이 필요하므로)
+    만료 임박 경고만 남긴다.
+  - 두 모드 공통: cert.pem / key.pem 이 밖에서 바뀌면(설정 마법사 재실행 등) 다시 읽는다.
+
+새 인증서는 실행 중인 SSLContext 에 load_cert_chain 으로 다시 올린다.  이후의 새 TLS
+핸드셰이크부터 적용되고, 이미 열린 HTTPS/WSS 연결과 WebRTC(DTLS 는 별도 인증서) 세션은
+그대로 유지된다 — aiohttp 재시작 없음.
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+import ssl
+import sys
+from pathlib import Path
+
+from cryptography import x509
+
+from setup_wizard import tailscale_cert_cmd
+
+log = logging.getLogger(__name__)
+
+# CREATE_NO_WINDOW: 콘솔 창 없이 subprocess 실행 (Windows 전용)
+_CF = 0x08000000 if sys.platform == 'win32' else 0
+
+RENEW_TIMEOUT = 120.0   # `tailscale cert` 최대 대기 (초)
+RETRY_AFTER   = 600.0   # 갱신 실패 시 재시도 간격 (초)
+POLL_INTERVAL = 60.0    # 파일 변경 확인 간격 (초, stat 2회 — 비용 무시 가능)
+
+
+def cert_expiry(cert: Path) -> datetime.datetime:
+    """PEM 인증서 첫 번째 항목의 만료 시각 (UTC)"""
+    c = x509.load_pem_x509_certificate(cert.read_bytes())
+    exp = getattr(c, 'not_valid_after_utc', None)
+    if exp is None:   # cryptography < 42
+        exp = c.not_valid_after.replace(tzinfo=datetime.timezone.utc)
+    return exp
+
+
+def cert_ips(cert: Path) -> "set[str]":
+    """PEM 인증서 SAN 의 IP 주소 (자체 서명 인증서가 현재 주소를 포함하는지 확인용)"""
+    c = x509.load_pem_x509_certificate(cert.read_bytes())
+    try:
+        san = c.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    except x509.ExtensionNotFound:
+        return set()
+    return {str(ip) for ip in san.get_values_for_type(x509.IPAddress)}
+
+
+class CertManager:
+    """실행 중인 SSLContext 의 인증서 만료 추적, 백그라운드 갱신 및 핫 리로드"""
+
+    def __init__(self, ctx: ssl.SSLContext, cert: Path, key: Path,
+                 hostname: "str | None" = None, renew_days: float = 30,
+                 check_interval: float = 12 * 3600):
+        self.ctx            = ctx
+        self.cert           = Path(cert)
+        self.key            = Path(key)
+        self.hostname       = hostname or None   # None → 자동 갱신 안 함 (self_signed)
+        self.renew_before   = datetime.timedelta(days=renew_days)
+        self.check_interval = check_interval
+        self.expires: "datetime.datetime | None" = None
+        self.reloads        = 0
+        self.renewals       = 0
+        self.last_error: "str | None" = None
+        self._mtimes        = self._stat()
+        self._next_attempt  = 0.0   # loop.time() 기준 다음 갱신 시도 시각
+        self._task: "asyncio.Task | None" = None
+        self._wake          = asyncio.Event()
+        try:
+            self.expires = cert_expiry(self.cert)
+        except Exception as e:
+            self.last_error = f"만료일 확인 실패: {e}"
+
+    # ── 상태 ─────────────────────────────────────────────────────────
+    def _stat(self) -> tuple:
+        try:
+            return (self.cert.stat().st_mtime_ns, self.key.stat().st_mtime_ns)
+        except OSError:
+            return (None, None)
+
+    def days_left(self) -> "float | None":
+        if self.expires is None:
+            return None
+        left = self.expires - datetime.datetime.now(tz=datetime.timezone.utc)
+        return left.total_seconds() / 86400
+
+    def due(self) -> bool:
+        left = self.days_left()
+        return left is not None and left <= self.renew_before.total_seconds() / 86400
+
+    # ── 리로드 / 갱신 ────────────────────────────────────────────────
+    def reload(self) -> None:
+        """
+        디스크의 cert/key 를 실행 중인 SSLContext 에 다시 올린다 (새 연결부터 적용).
+        먼저 별도 컨텍스트로 키 쌍을 검증한다 — 실행 중인 컨텍스트에서 load_cert_chain 이
+        실패하면 키가 빠진 채로 남아 모든 핸드셰이크가 실패하므로, 맞지 않으면(설정 마법사가
+        한 파일만 쓴 상태 등) 예외를 던지고 이전 인증서를 유지한다.
+        """
+        mtimes = self._stat()
+        ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER).load_cert_chain(self.cert, self.key)
+        self.ctx.load_cert_chain(self.cert, self.key)
+        self._mtimes = mtimes   # 검증 뒤에 파일이 또 바뀌었으면 다음 check() 가 다시 리로드
+        self.expires = cert_expiry(self.cert)
+        self.reloads += 1
+        log.info(f"TLS 인증서 리로드 (만료 {self.expires:%Y-%m-%d}, {self.days_left():.0f}일 남음)")
+
+    async def renew(self) -> bool:
+        """`tailscale cert` 로 새 인증서를 받아 교체 후 리로드. 성공 여부 반환"""
+        if not self.hostname:
+            return False
+        new_cert = self.cert.with_name(self.cert.name + '.new')
+        new_key  = self.key.with_name(self.key.name + '.new')
+        log.info(f"Tailscale 인증서 갱신 중: {self.hostname}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *tailscale_cert_cmd(self.hostname, new_cert, new_key),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                creationflags=_CF,
+            )
+            try:
+                out, _ = await asyncio.wait_for(proc.communicate(), RENEW_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise RuntimeError(f"시간 초과 ({RENEW_TIMEOUT:.0f}초)")
+            if proc.returncode != 0:
+                raise RuntimeError(out.decode('utf-8', 'replace').strip() or
+                                   f"종료 코드 {proc.returncode}")
+            # 교체 전에 키 쌍이 맞는지 별도 컨텍스트로 검증 (reload 도 다시 검증함)
+            ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER).load_cert_chain(new_cert, new_key)
+            os.replace(new_key, self.key)
+            os.replace(new_cert, self.cert)
+            self.reload()
+            self.renewals += 1
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.last_error = f"갱신 실패: {e}"
+            log.warning(f"Tailscale 인증서 {self.last_error}")
+            return False
+        finally:
+            for p in (new_cert, new_key):
+                p.unlink(missing_ok=True)
+
+    async def check(self) -> None:
+        """파일 변경 감지 → 리로드, 만료 임박 → 갱신 (또는 경고, check_interval 마다)"""
+        if self._stat() != self._mtimes:
+            try:
+                self.reload()
+                self.last_error = None
+            except Exception as e:
+                # 설정 마법사가 cert/key 를 쓰는 도중일 수 있음 → 이전 인증서 유지, 다음 확인 때 재시도
+                self.last_error = f"리로드 실패: {e}"
+                log.warning(f"TLS 인증서 {self.last_error}")
+        now = asyncio.get_running_loop().time()
+        if not self.due() or now < self._next_attempt:
+            return
+        if self.hostname:
+            ok = await self.renew()
+            # 갱신 실패면 짧은 간격으로 재시도
+            self._next_attempt = now + (self.check_interval if ok else RETRY_AFTER)
+        else:
+            log.warning(f"TLS 인증서 만료 임박 ({self.days_left():.0f}일 남음) — 설정 마법사를 다시 실행하세요")
+            self._next_attempt = now + self.check_interval
+
+    # ── 백그라운드 태스크 ────────────────────────────────────────────
+    def start(self) -> "CertManager":
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def poke(self) -> None:
+        """즉시 확인 요청 (설정 변경 직후 등). 이벤트 루프 스레드에서 호출"""
+        self._next_attempt = 0.0
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        left = self.days_left()
+        return {
+            'expires':    self.expires.isoformat() if self.expires else None,
+            'days_left':  round(left, 1) if left is not None else None,
+            'auto_renew': self.hostname is not None,
+            'renewals':   self.renewals,
+            'reloads':    self.reloads,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,231 @@
+"""
+LNDIVC 배경 효과
+----------------
+가상 카메라로 보내기 직전에 배경을 흐리게(blur) 하거나 이미지로 교체(replace)한다.
+Zoom 자체 배경 효과는 가상 카메라에 잘 맞지 않고 회의 앱의 CPU 를 추가로 쓰므로
+서버 쪽에서 한 번만 처리한다.
+
+  - 세그멘테이션은 축소 해상도(기본 폭 160)에서 N 프레임마다 워커 스레드가 수행.
+    워커가 바쁘면 그 프레임은 건너뛰고 마지막 마스크를 계속 사용한다.
+  - 마스크는 작은 해상도에서 페더링·시간 평활 후 출력 크기로 업스케일해 알파로 보관.
+    새 마스크가 올 때만 업스케일하므로 나머지 프레임은 합성 비용만 든다.
+  - 흐림 배경은 1/8 로 축소 → box blur → 업스케일 (전체 해상도 가우시안보다 훨씬 저렴).
+  - 합성은 cv2.blendLinear 한 번으로 프레임 버퍼에 직접 기록. 중간 버퍼는 모두 미리 할당.
+  - 프레임당 예산(background_budget_ms)을 넘으면 세그멘테이션 간격을 늘리고,
+    여유가 생기면 되돌린다.
+
+세그멘터: config 'background_model' 에 ONNX 경로가 있으면 cv2.dnn (NCHW 입력,
+사람 확률 1채널 또는 [배경, 사람] 2채널 출력 모델 — MODNet, PP-HumanSeg 등),
+없으면 중앙 인물을 가정한 GrabCut (이전 마스크로 초기화해 프레임 간 일관성 유지).
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from pipeline import LatestWorker
+
+log = logging.getLogger(__name__)
+
+MODES = ('blur', 'replace')
+
+_BLUR_DIV = 8   # 흐림 배경 축소 비율
+
+
+class _DnnSegmenter:
+    """cv2.dnn ONNX 인물 세그멘테이션"""
+
+    name = 'dnn'
+
+    def __init__(self, model: str, size: "tuple[int, int]"):
+        self.net  = cv2.dnn.readNet(model)
+        self.size = tuple(size)
+
+    def __call__(self, small: np.ndarray) -> np.ndarray:
+        blob = cv2.dnn.blobFromImage(small, 1 / 255.0, self.size, swapRB=False)
+        self.net.setInput(blob)
+        out = np.squeeze(self.net.forward())
+        if out.ndim == 3:
+            out = out[-1]   # [배경, 사람] → 사람 채널
+        out = cv2.resize(out.astype(np.float32), (small.shape[1], small.shape[0]))
+        return np.clip(out, 0.0, 1.0, out=out)
+
+
+class _GrabCutSegmenter:
+    """모델 없이 쓰는 폴백: 화면 중앙 인물을 가정한 GrabCut"""
+
+    name = 'grabcut'
+
+    def __init__(self):
+        self._mask: "np.ndarray | None" = None
+        self._fg:   "np.ndarray | None" = None
+        self._bgd = np.zeros((1, 65), np.float64)
+        self._fgd = np.zeros((1, 65), np.float64)
+
+    def __call__(self, small: np.ndarray) -> np.ndarray:
+        h, w = small.shape[:2]
+        if self._mask is None or self._mask.shape != (h, w) or not self._fg.any() or self._fg.all():
+            # 첫 호출, 또는 이전 결과가 전경/배경 한쪽으로 무너지면 중앙 사각형으로 다시 시작
+            self._mask = np.zeros((h, w), np.uint8)
+            rect = (w // 5, h // 10, w * 3 // 5, h * 9 // 10)
+            cv2.grabCut(small, self._mask, rect, self._bgd, self._fgd, 2,
+                        cv2.GC_INIT_WITH_RECT)
+        else:
+            # 이전 결과를 '아마도' 로 낮추고 좌우/상단 가장자리는 확정 배경으로 고정
+            m = self._mask
+            m[m == cv2.GC_FGD] = cv2.GC_PR_FGD
+            m[m == cv2.GC_BGD] = cv2.GC_PR_BGD
+            m[:, :2] = m[:, -2:] = m[:2, :] = cv2.GC_BGD
+            cv2.grabCut(small, m, None, self._bgd, self._fgd, 1, cv2.GC_INIT_WITH_MASK)
+        self._fg = (self._mask == cv2.GC_FGD) | (self._mask == cv2.GC_PR_FGD)
+        return self._fg.astype(np.float32)
+
+
+def _make_segmenter(model: "str | None", size: "tuple[int, int]"):
+    if model:
+        try:
+            return _DnnSegmenter(model, size)
+        except Exception as e:
+            log.warning(f"세그멘테이션 모델 로드 실패 ({e}) → GrabCut 사용")
+    return _GrabCutSegmenter()
+
+
+def _load_background(path: "str | Path | None") -> "np.ndarray | None":
+    """교체 배경 이미지 (rgb24). 없거나 읽을 수 없으면 None"""
+    if not path:
+        return None
+    bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if bgr is None:
+        log.warning(f"배경 이미지를 읽을 수 없음: {path}")
+        return None
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def _fill(img: np.ndarray, w: int, h: int) -> np.ndarray:
+    """종횡비 유지하며 (w, h) 를 가득 채우도록 리사이즈 + 중앙 크롭"""
+    ih, iw = img.shape[:2]
+    scale = max(w / iw, h / ih)
+    nw, nh = max(w, round(iw * scale)), max(h, round(ih * scale))
+    resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_AREA)
+    y0, x0 = (nh - h) // 2, (nw - w) // 2
+    return np.ascontiguousarray(resized[y0:y0 + h, x0:x0 + w])
+
+
+class BackgroundEffect:
+    """
+    apply(img) 가 배경을 흐리거나 교체한 프레임을 반환한다.
+    inplace=True 면 img 버퍼에 직접 합성한다 (호출자가 img 를 소유할 때만).
+    """
+
+    def __init__(self, fps: int = 30, mode: str = 'blur', image=None,
+                 model: "str | None" = None, model_size: "tuple[int, int]" = (256, 256),
+                 seg_width: int = 160, seg_every: int = 3, blur: int = 9,
+                 smoothing: float = 0.5, budget_ms: "float | None" = None):
+        if mode not in MODES:
+            log.warning(f"알 수 없는 background_effect '{mode}' → blur")
+            mode = 'blur'
+        self._image = _load_background(image) if mode == 'replace' else None
+        if mode == 'replace' and self._image is None:
+            mode = 'blur'
+        self.mode       = mode
+        self.seg_width  = seg_width
+        self.base_every = max(1, seg_every)
+        self.every      = self.base_every
+        self.blur       = max(1, blur)
+        self.smoothing  = smoothing
+        self.budget_ms  = budget_ms if budget_ms else 1000.0 / fps / 2
+        self.frame_ms   = 0.0      # 프레임 경로 합성 시간 (EMA)
+        self.masks      = 0
+        self._n         = 0
+        self._shape: "tuple | None" = None
+
+        self._segmenter = _make_segmenter(model, model_size)
+        self._worker    = LatestWorker(self._segmenter, 'segment')
+
+    # ── 버퍼 ─────────────────────────────────────────────────────────
+    def _alloc(self, h: int, w: int) -> None:
+        sw = min(self.seg_width, w)
+        sh = max(1, round(h * sw / w))
+        self._seg_in = np.empty((sh, sw, 3), np.uint8)     # 워커 입력 (워커가 쉴 때만 덮어씀)
+        self._mask   = np.zeros((sh, sw), np.float32)      # 평활된 저해상도 마스크
+        self._alpha  = np.empty((h, w), np.float32)        # 전경 가중치
+        self._beta   = np.empty((h, w), np.float32)        # 배경 가중치 (1 - alpha)
+        if self.mode == 'replace':
+            self._bg = _fill(self._image, w, h)
+        else:
+            self._bg       = np.empty((h, w, 3), np.uint8)
+            self._bg_small = np.empty((max(1, h // _BLUR_DIV), max(1, w // _BLUR_DIV), 3),
+                                      np.uint8)
+        self._have_mask = False
+        self._shape = (h, w)
+
+    def _update_alpha(self, mask: np.ndarray) -> None:
+        """새 마스크 → 시간 평활 + 페더링 → 출력 해상도 알파"""
+        if self._have_mask:
+            cv2.addWeighted(mask, 1.0 - self.smoothing, self._mask, self.smoothing, 0.0,
+                            dst=self._mask)
+        else:
+            self._mask[...] = mask
+            self._have_mask = True
+        soft = cv2.GaussianBlur(self._mask, (5, 5), 0)
+        h, w = self._shape
+        cv2.resize(soft, (w, h), dst=self._alpha, interpolation=cv2.INTER_LINEAR)
+        np.subtract(1.0, self._alpha, out=self._beta)
+        self.masks += 1
+
+    def _adapt(self) -> None:
+        """합성 시간 + 세그멘테이션 분할 상환 비용이 예산을 넘으면 간격을 늘린다"""
+        cost = self.frame_ms + self._worker.last_ms / self.every
+        if cost > self.budget_ms:
+            self.every = min(self.every + 1, 30)
+        elif self.every > self.base_every and cost < self.budget_ms * 0.6:
+            self.every -= 1
+
+    # ── 프레임 경로 ─────────────────────────────────────────────────
+    def apply(self, img: np.ndarray, inplace: bool = False) -> np.ndarray:
+        t0 = time.perf_counter()
+        h, w = img.shape[:2]
+        if self._shape != (h, w):
+            self._alloc(h, w)
+
+        self._n += 1
+        if self._n % self.every == 0 and not self._worker.busy:
+            cv2.resize(img, (self._seg_in.shape[1], self._seg_in.shape[0]),
+                       dst=self._seg_in, interpolation=cv2.INTER_AREA)
+            self._worker.submit(self._seg_in)
+        mask = self._worker.poll()
+        if mask is not None and mask.shape == self._mask.shape:
+            self._update_alpha(mask)
+        if not self._have_mask:
+            return img   # 첫 마스크 전에는 원본 통과
+
+        if self.mode == 'blur':
+            cv2.resize(img, (self._bg_small.shape[1], self._bg_small.shape[0]),
+                       dst=self._bg_small, interpolation=cv2.INTER_AREA)
+            cv2.blur(self._bg_small, (self.blur, self.blur), dst=self._bg_small)
+            cv2.resize(self._bg_small, (w, h), dst=self._bg, interpolation=cv2.INTER_LINEAR)
+        out = cv2.blendLinear(img, self._bg, self._alpha, self._beta,
+                              dst=img if inplace else None)
+
+        dt = (time.perf_counter() - t0) * 1000
+        self.frame_ms = dt if not self.frame_ms else 0.9 * self.frame_ms + 0.1 * dt
+        if self._n % 15 == 0:
+            self._adapt()
+        return out
+
+    def stats(self) -> dict:
+        return {
+            'mode':          self.mode,
+            'segmenter':     self._segmenter.name,
+            'segment_ms':    round(self._worker.last_ms, 2),
+            'segment_every': self.every,
+            'frame_ms':      round(self.frame_ms, 2),
+            'budget_ms':     round(self.budget_ms, 2),
+            'masks':         self.masks,
+        }
+
+    def close(self) -> None:
+        self._worker.close()
@@ -0,0 +1,257 @@
+"""
+LNDIVC 공유 메모리 프레임 링
+----------------------------
+서버가 디코딩된 프레임을 공유 메모리 링 버퍼에 게시하고, 로컬 프로세스
+(레코더, 얼굴 추적기, 두 번째 가상 장치 등)가 복사 없이 최신 프레임을 읽는다.
+
+레이아웃 (리틀 엔디언):
+    전역 헤더 64B : magic 'LNDR' | version u32 | slots u32 | slot_bytes u32 | pad
+                    latest u64 (마지막으로 완료된 프레임 seq, 0 = 없음)
+    슬롯 × N      : 슬롯 헤더 64B + 프레임 데이터 slot_bytes
+    슬롯 헤더      : lock u64 (seqlock, 홀수 = 기록 중) | seq u64 | pts_us i64
+                    width u32 | height u32 | pixfmt u32 | nbytes u32
+
+작성자는 절대 리더를 기다리지 않는다.  느린 리더가 보던 슬롯이 덮어써지면
+FrameRingReader.valid() 가 False 를 반환하므로 버리고 다시 읽으면 된다.
+
+리더 예시:
+    from frame_ring import FrameRingReader
+    with FrameRingReader('lndivc_frames') as ring:
+        info, img = ring.wait_next()
+        ...   # img 는 공유 메모리 뷰 (복사 없음)
+        if not ring.valid(info):
+            pass  # 처리 중 덮어써짐 → 결과 폐기
+
+실행: python frame_ring.py [이름]   (수신 fps 출력)
+"""
+
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC   = b'LNDR'
+VERSION = 1
+
+GLOBAL_HEADER = 64
+SLOT_HEADER   = 64
+DEFAULT_NAME  = 'lndivc_frames'
+
+# pixfmt 코드 → (이름, 채널 수)
+PIXFMT_RGB24 = 1
+PIXFMT_BGR24 = 2
+PIXFMT_GRAY8 = 3
+_PIXFMT_CH   = {PIXFMT_RGB24: 3, PIXFMT_BGR24: 3, PIXFMT_GRAY8: 1}
+PIXFMT_NAMES = {PIXFMT_RGB24: 'rgb24', PIXFMT_BGR24: 'bgr24', PIXFMT_GRAY8: 'gray'}
+
+_GLOBAL_FMT = '<4sIII'   # magic, version, slots, slot_bytes
+_LATEST_OFF = 16
+
+# 이 프로세스의 작성자가 만든 링 이름 (같은 프로세스 리더는 resource_tracker 를 건드리지 않음)
+_OWNED: "set[str]" = set()
+
+
+@dataclass(frozen=True)
+class FrameInfo:
+    """링에서 읽은 프레임 메타데이터"""
+    seq: int
+    pts_us: int
+    width: int
+    height: int
+    pixfmt: int
+    slot: int
+    lock: int   # 읽은 시점의 seqlock 값 (valid() 검사용)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """기존 공유 메모리에 attach (리더 종료 시 작성자의 메모리를 unlink 하지 않도록)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if sys.platform != 'win32' and name not in _OWNED:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')   # type: ignore[attr-defined]
+        return shm
+
+
+class FrameRingWriter:
+    """단일 작성자.  write() 는 대기 없이 다음 슬롯에 덮어쓴다."""
+
+    def __init__(self, name: str, max_width: int, max_height: int,
+                 slots: int = 4, channels: int = 3):
+        self.name       = name
+        self.slots      = slots
+        self.slot_bytes = max_width * max_height * channels
+        self._shm: "shared_memory.SharedMemory | None" = None
+        self._seq = 0
+
+    def open(self) -> None:
+        size = GLOBAL_HEADER + self.slots * (SLOT_HEADER + self.slot_bytes)
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            # 이전 실행 잔재 (비정상 종료) → 제거 후 재생성
+            old = shared_memory.SharedMemory(name=self.name)
+            old.close()
+            old.unlink()
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        _OWNED.add(self.name)
+        buf = self._shm.buf
+        buf[:GLOBAL_HEADER] = bytes(GLOBAL_HEADER)
+        struct.pack_into(_GLOBAL_FMT, buf, 0, MAGIC, VERSION, self.slots, self.slot_bytes)
+        self._latest = np.ndarray((1,), np.uint64, buf, _LATEST_OFF)
+        self._heads  = []
+        self._data   = []
+        for i in range(self.slots):
+            off = GLOBAL_HEADER + i * (SLOT_HEADER + self.slot_bytes)
+            buf[off:off + SLOT_HEADER] = bytes(SLOT_HEADER)
+            self._heads.append((
+                np.ndarray((2,), np.uint64, buf, off),        # lock, seq
+                np.ndarray((1,), np.int64,  buf, off + 16),   # pts_us
+                np.ndarray((4,), np.uint32, buf, off + 24),   # w, h, pixfmt, nbytes
+            ))
+            self._data.append(np.ndarray((self.slot_bytes,), np.uint8, buf, off + SLOT_HEADER))
+        self._seq = 0
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._latest = None
+            self._heads = self._data = []
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            _OWNED.discard(self.name)
+
+    def write(self, img: np.ndarray, pts_us: int = 0,
+              pixfmt: int = PIXFMT_RGB24) -> int:
+        """프레임 게시. 게시된 seq 반환 (열리지 않았거나 크기 초과 시 0)"""
+        if self._shm is None:
+            return 0
+        nbytes = img.nbytes
+        if nbytes > self.slot_bytes:
+            return 0
+        self._seq += 1
+        slot = self._seq % self.slots
+        head, pts, geom = self._heads[slot]
+        head[0] += 1                                   # 홀수: 기록 중
+        self._data[slot][:nbytes] = img.reshape(-1)
+        head[1]   = self._seq
+        pts[0]    = pts_us
+        geom[:]   = (img.shape[1], img.shape[0], pixfmt, nbytes)
+        head[0] += 1                                   # 짝수: 완료
+        self._latest[0] = self._seq
+        return self._seq
+
+    def __enter__(self) -> "FrameRingWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FrameRingReader:
+    """다중 리더 지원.  읽기는 작성자를 막지 않으며 반환 이미지는 공유 메모리 뷰."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.name = name
+        self._shm: "shared_memory.SharedMemory | None" = None
+
+    def open(self) -> None:
+        self._shm = _attach(self.name)
+        buf = self._shm.buf
+        magic, version, self.slots, self.slot_bytes = struct.unpack_from(_GLOBAL_FMT, buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"프레임 링 형식 불일치: {self.name}")
+        self._latest = np.ndarray((1,), np.uint64, buf, _LATEST_OFF)
+        self._offs   = [GLOBAL_HEADER + i * (SLOT_HEADER + self.slot_bytes)
+                        for i in range(self.slots)]
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._latest = None
+            self._shm.close()
+            self._shm = None
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self._latest[0])
+
+    def _lock(self, slot: int) -> int:
+        return struct.unpack_from('<Q', self._shm.buf, self._offs[slot])[0]
+
+    def read_latest(self) -> "tuple[FrameInfo, np.ndarray] | None":
+        """가장 최근 완료 프레임 (없으면 None). 이미지는 복사 없는 뷰."""
+        for _ in range(8):
+            seq = self.latest_seq
+            if seq == 0:
+                return None
+            slot = seq % self.slots
+            off  = self._offs[slot]
+            buf  = self._shm.buf
+            lock, slot_seq, pts_us, w, h, fmt, nbytes = struct.unpack_from(
+                '<QQqIIII', buf, off)
+            if lock & 1 or slot_seq != seq:
+                continue   # 기록 중이거나 이미 다음 프레임으로 덮임 → 재시도
+            ch  = _PIXFMT_CH.get(fmt, 3)
+            img = np.ndarray((h, w, ch) if ch > 1 else (h, w), np.uint8,
+                             buf, off + SLOT_HEADER)
+            info = FrameInfo(seq, pts_us, w, h, fmt, slot, lock)
+            if self._lock(slot) == lock:
+                return info, img
+        return None
+
+    def valid(self, info: FrameInfo) -> bool:
+        """read_latest 로 얻은 뷰가 아직 덮어써지지 않았는지"""
+        return self._lock(info.slot) == info.lock
+
+    def wait_next(self, after: int = -1, timeout: "float | None" = None,
+                  poll: float = 0.002) -> "tuple[FrameInfo, np.ndarray] | None":
+        """seq 가 after 보다 큰 프레임이 게시될 때까지 폴링 (after=-1 → 현재 최신 이후)"""
+        if after < 0:
+            after = self.latest_seq
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.latest_seq > after:
+                res = self.read_latest()
+                if res is not None:
+                    return res
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def __enter__(self) -> "FrameRingReader":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> None:
+    name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NAME
+    with FrameRingReader(name) as ring:
+        print(f"프레임 링 '{name}' 연결 (slots={ring.slots})")
+        last, n, t0 = -1, 0, time.monotonic()
+        try:
+            while True:
+                res = ring.wait_next(last, timeout=1.0)
+                if res is not None:
+                    info, _ = res
+                    last = info.seq
+                    n += 1
+                now = time.monotonic()
+                if now - t0 >= 1.0:
+                    print(f"  seq={last}  {n / (now - t0):.1f} fps")
+                    n, t0 = 0, now
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,8 @@ generate_cert.py
 로컬 네트워크 HTTPS 용 자체 서명 인증서 생성기.
 
 사용법:
-    python generate_cert.py
+    python generate_cert.py            # RSA 2048
+    python generate_cert.py --ecdsa    # ECDSA P-256 (TLS 핸드셰이크 서명이 훨씬 빠름)
 
 생성 파일:
     cert.pem  - 인증서 (Vision Pro에 AirDrop 후 신뢰 설정)
@@ -19,6 +20,7 @@ Vision Pro에서 신뢰 설정 방법:
 
 import datetime
 import ipaddress
+import json
 import socket
 import sys
 from pathlib import Path
@@ -27,38 +29,54 @@ try:
     from cryptography import x509
     from cryptography.hazmat.backends import default_backend
     from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
     from cryptography.x509.oid import NameOID
 except ImportError:
     print("cryptography 패키지가 필요합니다.")
     print("설치: pip install cryptography")
     sys.exit(1)
 
+import listeners
+import netinfo
+
 
 def get_local_ip() -> str:
-    """LAN에서 실제 사용하는 IP 주소 조회"""
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-        try:
-            s.connect(("8.8.8.8", 80))
-            return s.getsockname()[0]
-        except Exception:
-            return socket.gethostbyname(socket.gethostname())
+    """접속 URL 에 쓰는 대표 IP 주소 (netinfo — 오프라인에서도 동작)"""
+    return netinfo.primary_ip()
+
+
+KEY_TYPES = ('rsa', 'ecdsa')
+
+
+def _config_port(base_dir: Path) -> int:
+    """config.json 의 'port' (없거나 읽을 수 없으면 기본 포트)"""
+    try:
+        return int(json.loads((base_dir / 'config.json').read_text(encoding='utf-8'))['port'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return listeners.DEFAULT_PORT
 
 
-def generate(out_dir: Path = Path(__file__).parent):
+def generate(out_dir: Path = Path(__file__).parent, key_type: str = 'rsa'):
     local_ip = get_local_ip()
+    san_ips  = netinfo.san_addresses()   # 도달 가능한 모든 주소 — 인증서 하나로 모두 접속
     hostname = socket.gethostname()
 
     print(f"인증서 생성 중...")
     print(f"  IP:       {local_ip}")
+    print(f"  SAN IP:   {', '.join(san_ips)}")
     print(f"  Hostname: {hostname}")
-
-    # RSA 2048 키 생성
-    key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-        backend=default_backend(),
-    )
+    print(f"  Key:      {'ECDSA P-256' if key_type == 'ecdsa' else 'RSA 2048'}")
+
+    if key_type == 'ecdsa':
+        # ECDSA P-256 — 서명/핸드셰이크 비용이 RSA 2048 의 일부
+        key = ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+    else:
+        # RSA 2048 키 생성
+        key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=2048,
+            backend=default_backend(),
+        )
 
     # 인증서 정보
     name = x509.Name([
@@ -66,13 +84,12 @@ def generate(out_dir: Path = Path(__file__).parent):
         x509.NameAttribute(NameOID.ORGANIZATION_NAME, "LNDIVC Local"),
     ])
 
-    # SAN: IP + hostname + localhost
-    san = x509.SubjectAlternativeName([
-        x509.IPAddress(ipaddress.IPv4Address(local_ip)),
-        x509.IPAddress(ipaddress.IPv4Address("127.0.0.1")),
-        x509.DNSName(hostname),
-        x509.DNSName("localhost"),
-    ])
+    # SAN: 모든 주소 (Tailscale, LAN, Wi-Fi, IPv6, 루프백) + hostname + localhost
+    san = x509.SubjectAlternativeName(
+        [x509.IPAddress(ipaddress.ip_address(ip)) for ip in san_ips] + [
+            x509.DNSName(hostname),
+            x509.DNSName("localhost"),
+        ])
 
     now = datetime.datetime.utcnow()
     cert = (
@@ -115,8 +132,9 @@ def generate(out_dir: Path = Path(__file__).parent):
     print(f"  3. 설정 → 일반 → 정보 → 인증서 신뢰 설정")
     print(f"     → LNDIVC Local → 스위치 켜기 → 계속")
     print("=" * 58)
-    print(f"\n  이후 Safari에서 https://{local_ip}:8443 접속")
+    port = _config_port(out_dir)
+    print(f"\n  이후 Safari에서 https://{netinfo.url_host(local_ip)}:{port} 접속")
 
 
 if __name__ == "__main__":
-    generate()
+    generate(key_type='ecdsa' if '--ecdsa' in sys.argv else 'rsa')
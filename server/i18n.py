@@ -8,6 +8,9 @@ _STRINGS: dict[str, dict[str, str]] = {
     'ko': {
         'server_start':       '서버 시작',
         'server_stop':        '서버 중지',
+        'server_restart':     '서버 재시작',
+        'restart_done':       '재시작 완료 ({ms:.0f} ms)',
+        'restart_failed':     '서버 재시작 실패 — 이전 서버가 시간 안에 종료되지 않았습니다',
         'status_stopped':     '중지됨',
         'status_running':     '대기 중 (Vision Pro 연결 기다리는 중)',
         'status_connected':   '연결됨',
@@ -17,6 +20,24 @@ _STRINGS: dict[str, dict[str, str]] = {
         'copy_url':           'URL 복사',
         'copied':             '복사됨!',
         'settings':           '설정',
+        'performance':        '성능',
+        'perf_fps_in':        '수신 fps',
+        'perf_fps_out':       '출력 fps',
+        'perf_latency':       '지연 (추정)',
+        'perf_audio':         '오디오 버퍼',
+        'perf_loss':          '패킷 손실',
+        'perf_cpu':           'CPU (프로세스)',
+        'perf_stage':         '스테이지 CPU',
+        'perf_no_session':    '스트리밍 중인 세션 없음',
+        'health_good':        '양호',
+        'path_lan':           '직접 연결',
+        'path_direct':        'Tailscale 직접',
+        'path_derp':          'Tailscale 릴레이(DERP)',
+        'path_relay':         'TURN 릴레이',
+        'path_tailscale':     'Tailscale',
+        'path_low_bandwidth': '릴레이 경로 — 저대역 모드(해상도·fps 낮춤, 오디오 우선)로 전환했습니다',
+        'health_warn':        '주의',
+        'health_bad':         '나쁨',
         'language':           '언어 / Language',
         'cert_mode':          '인증서 방식',
         'cert_tailscale':     'Tailscale (권장)',
@@ -28,6 +49,9 @@ _STRINGS: dict[str, dict[str, str]] = {
         'setup_in_progress':  '설정 중...',
         'setup_done':         '✓ 완료. 서버를 재시작하세요.',
         'setup_failed':       '✗ 실패. 다시 시도하세요.',
+        'setup_timeout':      '✗ 시간 초과. 네트워크 상태를 확인하고 다시 시도하세요.',
+        'setup_cancelled':    '취소됨. 기존 인증서는 그대로입니다.',
+        'tailscale_detecting':'Tailscale 확인 중...',
         'apply':              '적용',
         'cancel':             '취소',
         'close':              '닫기',
@@ -56,6 +80,7 @@ _STRINGS: dict[str, dict[str, str]] = {
         'drivers':            'OBS 상태 확인...',
         'drivers_title':      'OBS 가상 카메라 상태',
         'drivers_desc':       'LNDIVC는 OBS Virtual Camera를 사용합니다 (추가 드라이버 설치 불필요).',
+        'drv_checking':       '확인 중...',
         'drv_obs_name':       'OBS Virtual Camera  (필수)',
         'drv_vbc_name':       'VB-Audio CABLE  (선택 — Zoom 마이크 연동)',
         'drv_vbc_optional':   '미설치 (선택 사항)',
@@ -66,10 +91,18 @@ _STRINGS: dict[str, dict[str, str]] = {
         'drv_obs_missing':    '✗ OBS를 설치하고 가상 카메라를 시작하세요.',
         'drv_obs_hint':       'OBS 실행 → 도구 → 가상 카메라 시작\n이후 OBS를 닫아도 가상 카메라는 유지됩니다.',
         'refresh':            '새로고침',
+        # 녹화
+        'record_start':       '녹화 시작',
+        'record_stop':        '녹화 중지',
+        'recording':          '녹화 중',
+        'record_saved':       '녹화 저장됨',
     },
     'en': {
         'server_start':       'Start Server',
         'server_stop':        'Stop Server',
+        'server_restart':     'Restart Server',
+        'restart_done':       'Restarted ({ms:.0f} ms)',
+        'restart_failed':     'Restart failed — the previous server did not stop in time',
         'status_stopped':     'Stopped',
         'status_running':     'Waiting for Vision Pro...',
         'status_connected':   'Connected',
@@ -79,6 +112,24 @@ _STRINGS: dict[str, dict[str, str]] = {
         'copy_url':           'Copy URL',
         'copied':             'Copied!',
         'settings':           'Settings',
+        'performance':        'Performance',
+        'perf_fps_in':        'Input fps',
+        'perf_fps_out':       'Output fps',
+        'perf_latency':       'Latency (est.)',
+        'perf_audio':         'Audio buffer',
+        'perf_loss':          'Packet loss',
+        'perf_cpu':           'CPU (process)',
+        'perf_stage':         'Stage CPU',
+        'perf_no_session':    'No session streaming',
+        'health_good':        'Good',
+        'path_lan':           'Direct',
+        'path_direct':        'Tailscale direct',
+        'path_derp':          'Tailscale relay (DERP)',
+        'path_relay':         'TURN relay',
+        'path_tailscale':     'Tailscale',
+        'path_low_bandwidth': 'Relayed path — switched to low-bandwidth mode (lower resolution and fps, audio first)',
+        'health_warn':        'Fair',
+        'health_bad':         'Poor',
         'language':           'Language / 언어',
         'cert_mode':          'Certificate Mode',
         'cert_tailscale':     'Tailscale (Recommended)',
@@ -90,6 +141,9 @@ _STRINGS: dict[str, dict[str, str]] = {
         'setup_in_progress':  'Setting up...',
         'setup_done':         '✓ Done. Please restart the server.',
         'setup_failed':       '✗ Failed. Please try again.',
+        'setup_timeout':      '✗ Timed out. Check the network and try again.',
+        'setup_cancelled':    'Cancelled. The existing certificate was kept.',
+        'tailscale_detecting':'Checking Tailscale...',
         'apply':              'Apply',
         'cancel':             'Cancel',
         'close':              'Close',
@@ -118,6 +172,7 @@ _STRINGS: dict[str, dict[str, str]] = {
         'drivers':            'OBS Status...',
         'drivers_title':      'OBS Virtual Camera Status',
         'drivers_desc':       'LNDIVC uses OBS Virtual Camera (no extra driver installation needed).',
+        'drv_checking':       'Checking...',
         'drv_obs_name':       'OBS Virtual Camera  (required)',
         'drv_vbc_name':       'VB-Audio CABLE  (optional — Zoom mic integration)',
         'drv_vbc_optional':   'Not installed (optional)',
@@ -128,6 +183,11 @@ _STRINGS: dict[str, dict[str, str]] = {
         'drv_obs_missing':    '✗ Please install OBS and start Virtual Camera.',
         'drv_obs_hint':       'In OBS: Tools → Start Virtual Camera\nOBS can be closed afterwards — virtual camera stays active.',
         'refresh':            'Refresh',
+        # recording
+        'record_start':       'Start Recording',
+        'record_stop':        'Stop Recording',
+        'recording':          'Recording',
+        'record_saved':       'Recording saved',
     },
 }
 
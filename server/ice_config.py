@@ -0,0 +1,263 @@
+"""
+LNDIVC ICE 설정
+---------------
+aiortc 는 RTCPeerConnection 마다 모든 인터페이스(Hyper-V/WSL vEthernet, VPN, 도커 브리지 …)
+에서 host 후보를 모으고 STUN 서버(기본 stun.l.google.com)에 질의한 뒤, 원격 후보와의 모든
+쌍을 검사한다.  다중 홈 Windows PC 에서는 쓸모없는 쌍 때문에 연결이 늦어지고 가끔 나쁜
+경로가 선택된다.  aiortc/aioice 에는 이를 조절하는 API 가 없으므로 install() 이 aioice 의
+host 주소 열거(와 포트 범위가 있으면 host 소켓 바인딩)를 교체한다.
+
+host 후보 정리 (prune): 시그널링 WebSocket 의 원격 주소와 같은 서브넷에 있는 인터페이스만
+남긴다 — 브라우저가 그 인터페이스로 페이지를 열었으니 ICE 도 거기서 된다.  원격이 Tailscale
+주소면 Tailscale 인터페이스만 남긴다.  맞는 인터페이스가 없으면(루프백 등) 정리하지 않는다.
+
+config:
+    "ice_port_range": [50000, 50100]     host 후보 UDP 포트 범위 (방화벽 규칙용)
+    "ice_interfaces": ["Ethernet*", "192.168.0.0/16"]   허용 인터페이스 (이름 glob / IP / CIDR)
+    "ice_exclude_interfaces": ["vEthernet*"]            제외 인터페이스 (같은 형식)
+    "ice_tailscale_only": false          Tailscale 인터페이스(100.x)에서만 후보 수집
+    "ice_prune": true                    시그널링 상대와 같은 서브넷의 인터페이스만 사용
+    "ice_ipv6": true
+    "ice_servers": ["stun:..."]          STUN/TURN URL (생략: aiortc 기본, []: 사용 안 함)
+"""
+
+import asyncio
+import contextvars
+import fnmatch
+import ipaddress
+import logging
+import random
+import socket
+
+import aioice.ice
+import aioice.turn
+from aioice.candidate import Candidate, candidate_foundation, candidate_priority
+from aiortc import RTCConfiguration, RTCIceServer
+
+import netinfo
+import rtc_internals
+from netinfo import is_tailscale_ip, unmap
+
+log = logging.getLogger(__name__)
+
+# 현재 시그널링 상대 주소 — handle_ws 태스크에서 설정, 같은 태스크의 setLocalDescription 이 읽음
+_peer: "contextvars.ContextVar[str | None]" = contextvars.ContextVar('ice_peer', default=None)
+
+_policy: "IcePolicy | None" = None   # install() 된 정책 (서버 재시작마다 교체)
+_orig_host_addresses = aioice.ice.get_host_addresses
+_orig_component_candidates = aioice.ice.Connection.get_component_candidates
+
+# _ranged_component_candidates 가 쓰는 aioice 내부 — 하나라도 없으면 포트 범위를 적용하지 않음
+_AIOICE_FUNCS = ('StunProtocol', 'TransportPolicy', 'server_reflexive_candidate',
+                 'relayed_candidate')
+_AIOICE_ATTRS = ('_transport_policy', '_protocols', 'stun_server', 'turn_server',
+                 'turn_username', 'turn_password', 'turn_ssl', 'turn_transport')
+
+
+def set_peer(remote: "str | None") -> None:
+    """현재 태스크(WebSocket 세션)의 시그널링 상대 주소 — host 후보 정리 기준"""
+    _peer.set(remote)
+
+
+def _ip(addr: "str | None"):
+    try:
+        return ipaddress.ip_address(unmap(addr) or '')
+    except ValueError:
+        return None
+
+
+def _matches(pattern: str, name: str, addr: str) -> bool:
+    """이름 glob (대소문자 무시), IP, CIDR 중 하나로 인터페이스 일치 여부"""
+    try:
+        return _ip(addr) in ipaddress.ip_network(pattern, strict=False)
+    except ValueError:
+        return fnmatch.fnmatch(name.lower(), pattern.lower())
+
+
+class IcePolicy:
+    """config 의 ice_* 항목 — 후보 수집 인터페이스·포트와 RTCConfiguration"""
+
+    def __init__(self, port_range: "tuple[int, int] | None" = None, allow=(), exclude=(),
+                 tailscale_only: bool = False, prune: bool = True, ipv6: bool = True,
+                 ice_servers: "list[str] | None" = None):
+        self.port_range     = port_range
+        self.allow          = list(allow)
+        self.exclude        = list(exclude)
+        self.tailscale_only = tailscale_only
+        self.prune          = prune
+        self.ipv6           = ipv6
+        self.ice_servers    = ice_servers
+        self.gathers        = 0
+        self.pruned         = 0   # 정리로 빠진 host 주소 수 (누적)
+        self.last: "list[str]" = []
+        self._warned        = False
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "IcePolicy":
+        ports = cfg.get('ice_port_range')
+        if ports:
+            lo, hi = int(ports[0]), int(ports[1])
+            ports = (lo, hi) if 0 < lo <= hi < 65536 else None
+            if ports is None:
+                log.warning(f"ice_port_range 무시 (잘못된 범위): {cfg.get('ice_port_range')}")
+        return cls(ports or None,
+                   cfg.get('ice_interfaces') or (), cfg.get('ice_exclude_interfaces') or (),
+                   bool(cfg.get('ice_tailscale_only', False)), bool(cfg.get('ice_prune', True)),
+                   bool(cfg.get('ice_ipv6', True)), cfg.get('ice_servers'))
+
+    def configuration(self) -> "RTCConfiguration | None":
+        """RTCPeerConnection 에 넘길 설정 (ice_servers 생략 시 None → aiortc 기본)"""
+        if self.ice_servers is None:
+            return None
+        return RTCConfiguration(iceServers=[RTCIceServer(url) for url in self.ice_servers])
+
+    # ── host 주소 선택 ────────────────────────────────────────────────
+    def host_addresses(self, use_ipv4: bool = True, use_ipv6: bool = True,
+                       peer: "str | None" = None) -> "list[str]":
+        use_ipv6 = use_ipv6 and self.ipv6
+        ifs = [a for a in netinfo.addresses()   # 캐시 — 연결마다 인터페이스를 열거하지 않음
+               if (use_ipv4 if a.version == 4 else use_ipv6)]
+        if self.allow:
+            ifs = [a for a in ifs if any(_matches(p, a.name, a.ip) for p in self.allow)]
+        ifs = [a for a in ifs if not any(_matches(p, a.name, a.ip) for p in self.exclude)]
+        if self.tailscale_only:
+            ifs = [a for a in ifs if a.kind == 'tailscale']
+            if not ifs and not self._warned:
+                self._warned = True
+                log.warning("ice_tailscale_only: Tailscale 인터페이스가 없어 ICE 후보가 없습니다")
+        elif self.prune and peer:
+            near = self._near(ifs, peer)
+            self.pruned += len(ifs) - len(near) if near else 0
+            ifs = near or ifs
+        self.gathers += 1
+        self.last = [a.ip for a in ifs]
+        return self.last
+
+    @staticmethod
+    def _near(ifs: "list[netinfo.Address]", peer: str) -> "list[netinfo.Address]":
+        """상대 주소와 같은 서브넷(상대가 Tailscale 이면 Tailscale) 인터페이스"""
+        remote = _ip(peer)
+        if remote is None or remote.is_loopback:
+            return []
+        if is_tailscale_ip(str(remote)):
+            return [a for a in ifs if a.kind == 'tailscale']
+        return [a for a in ifs if remote.version == a.version and
+                remote in ipaddress.ip_network(f"{a.ip}/{a.prefix}", strict=False)]
+
+    # ── 포트 범위 바인딩 ──────────────────────────────────────────────
+    def bind(self, address: str) -> "socket.socket | None":
+        """port_range 안의 빈 포트에 UDP 소켓 바인딩 (범위 안에서 무작위 시작). 실패 시 None"""
+        lo, hi = self.port_range
+        family = socket.AF_INET6 if ':' in address else socket.AF_INET
+        span = hi - lo + 1
+        start = random.randrange(span)
+        for i in range(span):
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            try:
+                sock.bind((address, lo + (start + i) % span))
+            except OSError:
+                sock.close()
+                continue
+            sock.setblocking(False)
+            return sock
+        return None
+
+    def stats(self) -> dict:
+        return {
+            'port_range':     list(self.port_range) if self.port_range else None,
+            'tailscale_only': self.tailscale_only,
+            'prune':          self.prune,
+            'gathers':        self.gathers,
+            'pruned':         self.pruned,
+            'addresses':      self.last,
+        }
+
+    def install(self) -> "IcePolicy":
+        """이후 수집되는 aioice 후보에 이 정책을 적용 (프로세스 전역, 마지막 install 이 유효)"""
+        global _policy
+        _policy = self
+        aioice.ice.get_host_addresses = _host_addresses
+        ranged = bool(self.port_range) and _ranged_supported()
+        aioice.ice.Connection.get_component_candidates = (
+            _ranged_component_candidates if ranged else _orig_component_candidates)
+        return self
+
+
+def _ranged_supported() -> bool:
+    """설치된 aioice 가 _ranged_component_candidates 가 따라 한 구현과 맞는지 (아니면 경고)"""
+    missing = [name for name in _AIOICE_FUNCS if not hasattr(aioice.ice, name)]
+    if not hasattr(getattr(aioice, 'turn', None), 'UDP_SOCKET_BUFFER_SIZE'):
+        missing.append('turn.UDP_SOCKET_BUFFER_SIZE')
+    if not missing:
+        conn = aioice.ice.Connection(ice_controlling=True)
+        missing = [name for name in _AIOICE_ATTRS if not hasattr(conn, name)]
+    if missing or not rtc_internals.supported('aioice'):
+        log.warning(f"aioice {aioice.__version__} 와 맞지 않아 ice_port_range 를 무시합니다"
+                    f"{' (없음: ' + ', '.join(missing) + ')' if missing else ''}")
+        return False
+    return True
+
+
+def _host_addresses(use_ipv4: bool, use_ipv6: bool) -> "list[str]":
+    if _policy is None:
+        return _orig_host_addresses(use_ipv4, use_ipv6)
+    return _policy.host_addresses(use_ipv4, use_ipv6, _peer.get())
+
+
+async def _ranged_component_candidates(self, component: int, addresses: "list[str]",
+                                       timeout: int = 5) -> "list[Candidate]":
+    """
+    aioice 0.10.2 Connection.get_component_candidates 와 같은 동작에 host 소켓만 port_range
+    로 바인딩한다 (aioice 는 포트 0 고정).  STUN/TURN 후보 수집은 aioice 함수를 그대로 쓴다.
+    aioice 를 올리면 원본과 비교해 맞출 것 — 맞지 않으면 install() 이 원본으로 되돌린다.
+    """
+    loop = asyncio.get_running_loop()
+    candidates, host_protocols = [], []
+    for address in addresses:
+        sock = _policy.bind(address)
+        if sock is None:
+            log.warning(f"ICE 포트 범위 {_policy.port_range} 에 빈 포트 없음: {address}")
+            continue
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                            aioice.turn.UDP_SOCKET_BUFFER_SIZE)
+            _, protocol = await loop.create_datagram_endpoint(
+                lambda: aioice.ice.StunProtocol(self), sock=sock)
+        except OSError as e:
+            sock.close()
+            log.info(f"ICE 소켓 생성 실패 {address}: {e}")
+            continue
+        host_protocols.append(protocol)
+        host, port = protocol.transport.get_extra_info('sockname')[:2]
+        protocol.local_candidate = Candidate(
+            foundation=candidate_foundation('host', 'udp', host),
+            component=component, transport='udp',
+            priority=candidate_priority(component, 'host'),
+            host=host, port=port, type='host')
+        if self._transport_policy == aioice.ice.TransportPolicy.ALL:
+            candidates.append(protocol.local_candidate)
+    self._protocols += host_protocols
+
+    tasks = []
+    if self.stun_server:
+        for protocol in host_protocols:
+            if ipaddress.ip_address(protocol.local_candidate.host).version == 4:
+                tasks.append(asyncio.ensure_future(
+                    aioice.ice.server_reflexive_candidate(protocol, self.stun_server)))
+    if self.turn_server:
+        tasks.append(asyncio.ensure_future(aioice.ice.relayed_candidate(
+            component=component, protocol_factory=lambda: aioice.ice.StunProtocol(self),
+            turn_server=self.turn_server, turn_username=self.turn_username,
+            turn_password=self.turn_password, turn_ssl=self.turn_ssl,
+            turn_transport=self.turn_transport)))
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in done:
+            if task.exception() is None:
+                candidate, protocol = task.result()
+                candidates.append(candidate)
+                if protocol is not None:
+                    self._protocols.append(protocol)
+        for task in pending:
+            task.cancel()
+    return candidates
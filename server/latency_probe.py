@@ -0,0 +1,357 @@
+"""
+LNDIVC 종단 간(glass-to-glass) 지연 측정
+----------------------------------------
+Vision Pro 없이 localhost 에서 실제 수신 경로 전체(WebRTC 인코딩·전송·디코딩 → 파이프라인
+→ 싱크)의 지연과 A/V 어긋남을 잰다.
+
+loopback 클라이언트 (하위 프로세스, synth_client.SyntheticClient 로 /ws v2 접속):
+    비디오  프레임 위쪽 띠에 64칸 바코드 — 생성 시각(perf_counter µs 하위 40비트) |
+            순번 16비트 | CRC 8비트.  위 줄은 비트, 아래 줄은 반전으로 그려 인코딩 후
+            밝기가 달라져도 칸마다 위/아래를 비교해 판독한다.
+    오디오  --period 초 경계(perf_counter 기준)마다 5 ms 길이 2 kHz 클릭, 나머지는 무음.
+            20 ms 블록은 보내는 시점 직전 20 ms 를 담은 것으로 본다 (실제 마이크와 같음).
+
+싱크 쪽 프로브 (출력 직전에서 판독):
+    기본      run_server 를 이 프로세스에서 null 싱크로 띄우고 g_cam.send /
+              g_audio_out.write 를 감싼다 → 비디오·오디오 지연과 A/V 어긋남.
+    --ring    shm 싱크(video_sink "shm")로 따로 실행 중인 서버의 프레임 링을 읽는다
+              (비디오만, --url 로 클라이언트가 접속할 서버 지정).
+
+같은 머신의 프로세스들은 perf_counter 시계(Linux CLOCK_MONOTONIC, Windows QPC)를
+공유하므로 시계 보정이 필요 없다.
+
+    python latency_probe.py [--duration 30] [--period 1.0] [--json result.json]
+                            [--max-video-ms 150] [--max-audio-ms 150] [--max-skew-ms 60]
+    python latency_probe.py --ring lndivc_frames --url https://127.0.0.1:8443
+
+--max-* 를 넘으면 종료 코드 1 (CI 용).  A/V 어긋남 = 오디오 지연 - 비디오 지연
+(각 클릭과 같은 시각에 생성된 프레임끼리 비교, 양수면 소리가 늦음).
+"""
+
+import argparse
+import asyncio
+import atexit
+import contextlib
+import io
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+import listeners
+
+log = logging.getLogger(__name__)
+
+BITS     = 64
+CELL_H   = 24            # 바코드 한 줄 높이 (px, 720p 기준)
+TS_MASK  = (1 << 40) - 1 # 타임스탬프 µs 하위 40비트 (약 12.7일 주기)
+CLICK_MS = 5.0
+CLICK_HZ = 2000.0
+CLICK_THRESHOLD = 0.25   # 클릭 검출 문턱 (최대 진폭 대비)
+AUDIO_RATE = 48000
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+# ── 바코드 ────────────────────────────────────────────────────────────
+def encode_barcode(img: np.ndarray, ts_us: int, seq: int) -> None:
+    """img (H×W×3 uint8) 위쪽 띠에 ts_us / seq 바코드를 그린다 (제자리 수정)"""
+    body = ((ts_us & TS_MASK) << 16 | (seq & 0xFFFF)).to_bytes(7, 'big')
+    word = int.from_bytes(body + bytes([zlib.crc32(body) & 0xFF]), 'big')
+    bits = np.array([(word >> (BITS - 1 - i)) & 1 for i in range(BITS)], np.uint8) * 255
+    h, w = img.shape[:2]
+    ch = max(4, round(CELL_H * h / 720))
+    cols = np.repeat(bits, w // BITS)
+    cols = np.pad(cols, (0, w - len(cols)), constant_values=0)
+    img[:ch]       = cols[None, :, None]
+    img[ch:2 * ch] = (255 - cols)[None, :, None]
+
+
+def decode_barcode(img: np.ndarray) -> "tuple[int, int] | None":
+    """(ts_us 하위 40비트, seq). 판독 실패(CRC 불일치)면 None"""
+    h, w = img.shape[:2]
+    ch = max(4, round(CELL_H * h / 720))
+    cw = w // BITS
+    m  = max(1, ch // 4)   # 칸 가장자리(인코딩 번짐)는 빼고 가운데만
+    mx = max(1, cw // 4)
+    band = img[:2 * ch, :cw * BITS].astype(np.int32)
+    if band.ndim == 3:
+        band = band.sum(axis=2)
+    top = band[m:ch - m].reshape(ch - 2 * m, BITS, cw)[:, :, mx:cw - mx].mean(axis=(0, 2))
+    bot = band[ch + m:2 * ch - m].reshape(ch - 2 * m, BITS, cw)[:, :, mx:cw - mx].mean(axis=(0, 2))
+    word = 0
+    for b in top > bot:
+        word = word << 1 | int(b)
+    raw = word.to_bytes(8, 'big')
+    if zlib.crc32(raw[:7]) & 0xFF != raw[7]:
+        return None
+    body = int.from_bytes(raw[:7], 'big')
+    return body >> 16, body & 0xFFFF
+
+
+# ── 클라이언트 트랙 ──────────────────────────────────────────────────
+def _client_tracks(width: int, height: int, period: float):
+    from synth_client import PatternVideoTrack, ToneAudioTrack
+
+    class BarcodeVideoTrack(PatternVideoTrack):
+        def render(self, index: int) -> np.ndarray:
+            img = super().render(index)
+            encode_barcode(img, _now_us(), index)
+            return img
+
+    class ClickAudioTrack(ToneAudioTrack):
+        """period 초 경계마다 클릭. 블록 = 보내는 시점 직전 20 ms"""
+
+        def __init__(self):
+            super().__init__(freq=CLICK_HZ, level=0.8)
+            n = int(AUDIO_RATE * CLICK_MS / 1000)
+            t = np.arange(n) / AUDIO_RATE
+            self._click = (np.sin(2 * np.pi * CLICK_HZ * t) * 0.8 * 32767).astype(np.int16)
+            self._carry = np.zeros(0, np.int16)   # 블록 끝을 넘은 클릭 나머지
+
+        def render(self, index: int) -> np.ndarray:
+            n = self._samples
+            out = np.zeros(n, np.int16)
+            k = min(len(self._carry), n)
+            out[:k], self._carry = self._carry[:k], self._carry[k:]
+            t_end = time.perf_counter()
+            t_start = t_end - n / AUDIO_RATE
+            boundary = np.ceil(t_start / period) * period
+            if boundary < t_end:
+                off = int((boundary - t_start) * AUDIO_RATE)
+                seg = self._click[:n - off]
+                out[off:off + len(seg)] = seg
+                self._carry = self._click[len(seg):]
+            return out
+
+    return BarcodeVideoTrack(width, height), ClickAudioTrack()
+
+
+async def run_client(url: str, duration: float, period: float,
+                     width: int, height: int) -> None:
+    from synth_client import SyntheticClient
+    video, audio = _client_tracks(width, height, period)
+    c = SyntheticClient(url, video, audio)
+    try:
+        await c.connect()
+        await asyncio.sleep(duration)
+    finally:
+        await c.close()
+
+
+# ── 싱크 쪽 프로브 ───────────────────────────────────────────────────
+class Probe:
+    """싱크 입력에서 바코드·클릭을 판독해 지연을 모은다 (싱크 스레드에서 호출)"""
+
+    def __init__(self, period: float, warmup: float = 2.0):
+        self.period = period
+        self.video: "list[tuple[float, float]]" = []   # (생성 시각 s, 지연 ms)
+        self.audio: "list[tuple[float, float]]" = []   # (클릭 경계 s, 지연 ms)
+        self.bad_frames = 0
+        self._t_start = time.perf_counter() + warmup
+        self._last_click = 0.0
+        self._lock = threading.Lock()
+
+    def on_video(self, img: np.ndarray) -> None:
+        now = _now_us()
+        if now / 1e6 < self._t_start:
+            return
+        res = decode_barcode(img)
+        if res is None:
+            self.bad_frames += 1
+            return
+        ts, _ = res
+        lat_us = (now - ts) & TS_MASK   # 하위 40비트끼리 뺄셈 (래핑 처리)
+        with self._lock:
+            self.video.append(((now - lat_us) / 1e6, lat_us / 1000))
+
+    def on_audio(self, chunk: np.ndarray, t_write: "float | None" = None) -> None:
+        t_write = time.perf_counter() if t_write is None else t_write
+        if t_write < self._t_start:
+            return
+        x = np.abs(chunk.reshape(-1).astype(np.int32))
+        hits = np.flatnonzero(x > CLICK_THRESHOLD * 32767)
+        if not len(hits):
+            return
+        t_hit = t_write + hits[0] / AUDIO_RATE
+        if t_hit - self._last_click < self.period / 2:
+            return   # 같은 클릭의 나머지
+        self._last_click = t_hit
+        boundary = np.floor(t_hit / self.period) * self.period
+        with self._lock:
+            self.audio.append((boundary, (t_hit - boundary) * 1000))
+
+    def result(self) -> dict:
+        def pct(vals):
+            if not vals:
+                return None
+            a = np.asarray(vals)
+            return {'n': len(a), 'p50': round(float(np.percentile(a, 50)), 1),
+                    'p95': round(float(np.percentile(a, 95)), 1),
+                    'max': round(float(a.max()), 1)}
+        with self._lock:
+            video, audio = list(self.video), list(self.audio)
+        skew = []
+        if video:
+            vt = np.array([t for t, _ in video])
+            vl = np.array([l for _, l in video])
+            for b, la in audio:
+                near = np.abs(vt - b) <= 0.05   # 클릭 ±50 ms 안에 생성된 프레임
+                if near.any():
+                    skew.append(la - float(vl[near].mean()))
+        return {'video_ms': pct([l for _, l in video]),
+                'audio_ms': pct([l for _, l in audio]),
+                'skew_ms':  pct(skew),
+                'bad_frames': self.bad_frames}
+
+
+class _VideoTap:
+    """비디오 싱크 대리자 — send 전에 프로브 호출"""
+
+    def __init__(self, sink, probe: Probe):
+        self._sink, self._probe = sink, probe
+
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        self._probe.on_video(img)
+        self._sink.send(img, pts_us)
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
+
+
+class _AudioTap:
+    """오디오 싱크 대리자 — write 직전 시각 기준으로 클릭 판독"""
+
+    def __init__(self, sink, probe: Probe):
+        self._sink, self._probe = sink, probe
+
+    def write(self, chunk: np.ndarray) -> None:
+        self._probe.on_audio(chunk)
+        self._sink.write(chunk)
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
+
+
+def _spawn_client(url: str, args, width: int, height: int):
+    return asyncio.create_subprocess_exec(
+        sys.executable, str(Path(__file__).resolve()), '--client', url,
+        '--duration', str(args.duration), '--period', str(args.period),
+        '--size', f"{width}x{height}",
+    )
+
+
+async def _probe_inprocess(args) -> dict:
+    """run_server(null 싱크) + 탭 + loopback 클라이언트"""
+    import generate_cert
+    import server as srv   # 가져올 때 로깅을 설정하므로 그 뒤에 수준을 낮춤
+    logging.getLogger().setLevel(logging.WARNING)
+    data = Path(tempfile.mkdtemp(prefix='lndivc-latency-'))
+    atexit.register(shutil.rmtree, data, True)   # 임시 인증서·키 정리
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_cert.generate(data, 'ecdsa')
+    (data / 'config.json').write_text(json.dumps({
+        'mode': 'self_signed', 'video_sink': 'null', 'audio_sink': 'null', 'standby': False,
+    }), encoding='utf-8')
+    srv.DATA_DIR = data
+    probe = Probe(args.period, args.warmup)
+
+    def _ready():
+        srv.g_cam       = _VideoTap(srv.g_cam, probe)
+        srv.g_audio_out = _AudioTap(srv.g_audio_out, probe)
+        ready.set()
+
+    stop, ready = asyncio.Event(), asyncio.Event()
+    server = asyncio.ensure_future(srv.run_server(stop_event=stop, on_ready=_ready))
+    try:
+        await asyncio.wait_for(ready.wait(), 30)
+        client = await _spawn_client(listeners.local_url(srv.g_listen), args,
+                                     srv.VIDEO_WIDTH, srv.VIDEO_HEIGHT)
+        await client.wait()
+    finally:
+        stop.set()
+        await server
+    return probe.result()
+
+
+def _probe_ring(args) -> dict:
+    """shm 싱크 프레임 링 판독 (비디오만) — 클라이언트는 --url 서버에 접속"""
+    import subprocess
+    from frame_ring import FrameRingReader
+    probe = Probe(args.period, args.warmup)
+    with FrameRingReader(args.ring) as ring:
+        client = subprocess.Popen([
+            sys.executable, str(Path(__file__).resolve()), '--client', args.url,
+            '--duration', str(args.duration), '--period', str(args.period), '--size', args.size,
+        ])
+        last = -1
+        while client.poll() is None:
+            res = ring.wait_next(last, timeout=0.5, poll=0.0005)
+            if res is not None:
+                info, img = res
+                last = info.seq
+                probe.on_video(img)
+    return probe.result()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description='LNDIVC 종단 간 지연 측정 (loopback)')
+    ap.add_argument('--duration', type=float, default=30.0, help='측정 시간 (초)')
+    ap.add_argument('--period', type=float, default=1.0, help='오디오 클릭 간격 (초)')
+    ap.add_argument('--warmup', type=float, default=2.0, help='측정에서 뺄 연결 직후 구간 (초)')
+    ap.add_argument('--ring', help='shm 싱크 프레임 링 이름 (별도 실행 중인 서버, 비디오만)')
+    ap.add_argument('--url', default='https://127.0.0.1:8443', help='--ring 일 때 접속할 서버')
+    ap.add_argument('--size', default='1280x720', help='--ring 일 때 보낼 해상도')
+    ap.add_argument('--json', help='결과를 JSON 으로 저장')
+    ap.add_argument('--max-video-ms', type=float, help='비디오 p95 상한 (넘으면 종료 코드 1)')
+    ap.add_argument('--max-audio-ms', type=float, help='오디오 p95 상한')
+    ap.add_argument('--max-skew-ms', type=float, help='|A/V 어긋남 p50| 상한')
+    ap.add_argument('--client', metavar='URL', help=argparse.SUPPRESS)   # 내부: 클라이언트 프로세스
+    args = ap.parse_args()
+
+    if args.client:
+        w, h = (int(v) for v in args.size.split('x'))
+        logging.basicConfig(level=logging.WARNING)
+        asyncio.run(run_client(args.client, args.duration, args.period, w, h))
+        return
+
+    if args.ring:
+        result = _probe_ring(args)
+    else:
+        result = asyncio.run(_probe_inprocess(args))
+
+    print()
+    for key, label in (('video_ms', '비디오 지연'), ('audio_ms', '오디오 지연'),
+                       ('skew_ms', 'A/V 어긋남')):
+        r = result[key]
+        print(f"  {label:10s} " + (f"p50 {r['p50']:7.1f}  p95 {r['p95']:7.1f}  "
+                                   f"max {r['max']:7.1f} ms  (n={r['n']})" if r else "측정 없음"))
+    print(f"  판독 실패 프레임 {result['bad_frames']}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2), encoding='utf-8')
+
+    failed = []
+    for key, limit, field in (('video_ms', args.max_video_ms, 'p95'),
+                              ('audio_ms', args.max_audio_ms, 'p95'),
+                              ('skew_ms',  args.max_skew_ms,  'p50')):
+        if limit is None:
+            continue
+        r = result[key]
+        if r is None or abs(r[field]) > limit:
+            failed.append(key)
+    if failed:
+        print(f"\n  실패: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+LNDIVC HTTPS 리스너
+-------------------
+aiohttp TCPSite 대신 리스닝 소켓을 직접 만들어 web.SockSite 로 넘긴다 — 주소 여러 개,
+IPv6 듀얼 스택 소켓, 재시작 사이 소켓 유지를 위해서.
+
+config:
+    "port": 8443            (DEFAULT_PORT)
+    "listen": ["0.0.0.0"]   (기본) 주소 목록 또는 문자열 하나.  IPv4/IPv6 주소 그대로
+                            ("::" 는 IPv6 전용), 또는
+        "dual"       IPv6 + IPv4 를 받는 듀얼 스택 소켓 1개 ('::', IPV6_V6ONLY 해제)
+                     — IPv6 가 없으면 0.0.0.0
+        "tailscale"  Tailscale 인터페이스 주소만 (100.x / fd7a:115c:a1e0::/48)
+    "fast_restart": false
+        true 면 서버를 재시작해도 리스닝 소켓을 닫지 않고 유지한다.  asyncio 서버에는
+        복제본(dup)을 넘기므로 서버가 멈춘 동안 들어온 연결은 백로그에서 기다렸다가 새
+        서버가 받는다 — 재바인딩·"address in use" 대기가 없다.  SO_REUSEPORT 가 있는
+        플랫폼(Linux/macOS)에서는 함께 설정해, 종료 중인 이전 프로세스가 포트를 잡고 있어도
+        새 프로세스가 바로 바인딩할 수 있다.
+"""
+
+import ipaddress
+import logging
+import os
+import socket
+import threading
+
+import netinfo
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT   = 8443
+DEFAULT_LISTEN = ('0.0.0.0',)
+WILDCARD       = ('0.0.0.0', '::')
+BACKLOG = 128
+
+
+def listen_addresses(cfg: dict) -> "list[tuple[str, bool]]":
+    """config 'listen' → [(바인딩 주소, 듀얼 스택 여부)] (중복 제거, 순서 유지)"""
+    spec = cfg.get('listen') or DEFAULT_LISTEN
+    if isinstance(spec, str):
+        spec = [spec]
+    out: "list[tuple[str, bool]]" = []
+    for item in spec:
+        item = str(item).strip()
+        if item == 'dual':
+            out.append(('::', True) if socket.has_dualstack_ipv6() else ('0.0.0.0', False))
+        elif item == 'tailscale':
+            found = [a.ip for a in netinfo.addresses() if a.kind == 'tailscale']
+            if not found:
+                log.warning("listen 'tailscale': Tailscale 인터페이스가 없습니다")
+            out += [(addr, False) for addr in found]
+        else:
+            try:
+                ipaddress.ip_address(item.split('%')[0])
+            except ValueError:
+                log.warning(f"listen 주소 무시 (IP 가 아님): {item}")
+                continue
+            out.append((item, False))
+    return list(dict.fromkeys(out))
+
+
+def access_url(cfg: dict, listen: "list[tuple[str, bool]] | None" = None) -> str:
+    """
+    접속 URL (콘솔 배너, 대기 화면, 트레이 QR) — Tailscale 호스트 이름, 특정 주소에만
+    리스닝하면 그 주소, 아니면 대표 주소.  listen 생략 시 config 'listen' 에서 계산
+    """
+    port = int(cfg.get('port', DEFAULT_PORT))
+    if cfg.get('mode') == 'tailscale' and cfg.get('hostname'):
+        return f"https://{cfg['hostname']}:{port}"
+    if listen is None:
+        listen = listen_addresses(cfg)
+    bound = [h for h, _ in listen if h not in WILDCARD]
+    return f"https://{netinfo.url_host(bound[0] if bound else netinfo.primary_ip())}:{port}"
+
+
+def local_url(listening: "list[str]") -> str:
+    """
+    리스닝 중인 주소 목록('host:port', server.g_listen) 중 이 PC 에서 접속할 URL —
+    와일드카드 주소면 루프백.  soak.py / latency_probe.py 가 쓴다
+    """
+    if not listening:
+        raise OSError("리스닝 중인 주소가 없습니다")
+    hosts = [item.rpartition(':') for item in listening]
+    host, _, port = next((h for h in hosts if h[0].strip('[]') in WILDCARD), hosts[0])
+    host = host.strip('[]')
+    host = {'0.0.0.0': '127.0.0.1', '::': '::1'}.get(host, host)
+    return f"https://{netinfo.url_host(host)}:{port}"
+
+
+def bind(host: str, port: int, dual: bool = False, reuse_port: bool = False) -> socket.socket:
+    """TCP 리스닝 소켓. dual=True 면 IPv6 소켓에서 IPv4 매핑 주소도 받음"""
+    if ':' in host:
+        family = socket.AF_INET6
+        addr = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)[0][4]
+    else:
+        family, addr = socket.AF_INET, (host, port)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if os.name == 'posix':   # asyncio.create_server 기본값과 같게
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if family == socket.AF_INET6:
+            sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0 if dual else 1)
+        sock.bind(addr)
+        sock.listen(BACKLOG)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class ListenerPool:
+    """
+    (주소, 포트, 듀얼 스택) → 리스닝 소켓.  acquire() 는 서버가 쓸 소켓을 돌려준다 —
+    keep=True 면 원본은 풀에 남기고 복제본을 주므로, 서버가 멈추며 복제본을 닫아도 포트는
+    계속 열려 있다.
+    """
+
+    def __init__(self):
+        self._socks: "dict[tuple[str, int, bool], socket.socket]" = {}
+        self._lock = threading.Lock()
+        self.reused = 0   # 재사용한 소켓 수 (누적)
+
+    def acquire(self, addrs: "list[tuple[str, bool]]", port: int,
+                keep: bool = False) -> "list[socket.socket]":
+        """
+        addrs: listen_addresses() 결과.  바인딩에 실패한 주소는 경고 후 건너뛰고,
+        하나도 열지 못하면 마지막 OSError 를 다시 던진다.
+        """
+        keys = [(host, port, dual) for host, dual in addrs]
+        out: "list[socket.socket]" = []
+        error: "OSError | None" = None
+        with self._lock:
+            for key in set(self._socks) - set(keys if keep else ()):   # 더는 안 쓰는 주소
+                self._socks.pop(key).close()
+            for key in keys:
+                master = self._socks.get(key)
+                if master is not None:
+                    self.reused += 1
+                else:
+                    try:
+                        master = bind(*key, reuse_port=keep)
+                    except OSError as e:
+                        log.warning(f"리스닝 실패 {key[0]}:{port} — {e}")
+                        error = e
+                        continue
+                    if keep:
+                        self._socks[key] = master
+                out.append(master.dup() if keep else master)
+        if not out:
+            raise error or OSError("리스닝할 주소가 없습니다 (config 'listen')")
+        return out
+
+    def close(self) -> None:
+        """유지 중인 소켓을 모두 닫음 (서버 중지 — 재시작이 아닌 경우)"""
+        with self._lock:
+            socks, self._socks = list(self._socks.values()), {}
+        for s in socks:
+            s.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            held = [f"[{h}]:{p}" if ':' in h else f"{h}:{p}" for h, p, _ in self._socks]
+        return {'held': held, 'reused': self.reused}
+
+
+pool = ListenerPool()
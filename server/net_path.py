@@ -0,0 +1,170 @@
+"""
+LNDIVC 연결 경로 감시
+---------------------
+Tailscale 이 직접 경로(UDP 홀 펀칭)를 만들지 못하면 트래픽은 DERP 릴레이를 거친다 —
+대역폭이 훨씬 작고 RTT 가 길어 720p30 스트림이 무너진다.  WebRTC 입장에서는 100.x
+주소끼리의 평범한 host 후보라 ICE 통계로는 구분되지 않으므로, `tailscale status --json`
+의 피어 정보(CurAddr 가 비어 있고 Relay 만 있으면 DERP 경유)로 판단한다.  선택된 ICE
+후보 쌍의 원격 후보가 TURN(type 'relay')인 경우도 같은 저대역 경로로 취급한다.
+
+경로 종류:
+    lan        Tailscale 주소가 아닌 직접 연결
+    direct     Tailscale 직접 경로
+    derp       Tailscale DERP 릴레이 경유
+    relay      TURN 릴레이 (ICE relay 후보)
+    tailscale  Tailscale 주소지만 상태 조회 실패 (직접/릴레이 불명)
+
+저대역 경로(derp / relay)가 되면 세션에 control 'quality' 로 LOW_BANDWIDTH 프로필
+(해상도 ½, 15 fps, 비트레이트 상한, 오디오 우선)을 보내고, 직접 경로로 돌아오면
+FULL 프로필로 되돌린다.  config:
+    "relay_mode": "auto" (기본) | "off" (프로필 전환 안 함) | "always" (항상 저대역)
+    "relay_profile": {"max_bitrate": 500000, ...}   LOW_BANDWIDTH 항목 덮어쓰기
+"""
+
+import asyncio
+import logging
+
+import rtc_internals
+from netinfo import is_tailscale_ip, unmap
+from setup_wizard import tailscale_status_async
+
+log = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 10.0   # 경로 재확인 간격 (초) — DERP → 직접 전환은 수십 초 뒤에도 일어남
+
+RELAYED = ('derp', 'relay')
+
+LOW_BANDWIDTH = {'max_bitrate': 500_000, 'max_framerate': 15, 'scale_down': 2.0,
+                 'audio_priority': 'high'}
+FULL          = {'max_bitrate': None, 'max_framerate': None, 'scale_down': 1.0,
+                 'audio_priority': None}
+
+
+def selected_pair(pc) -> "tuple[str, str] | None":
+    """선택된 ICE 후보 쌍의 (원격 주소, 원격 후보 type). 알 수 없으면 None"""
+    pair = rtc_internals.nominated_pair(pc)
+    if pair is None:
+        return None
+    return pair.remote_candidate.host, pair.remote_candidate.type
+
+
+def peer_paths(status: "dict | None") -> "dict[str, str]":
+    """tailscale status → {피어 Tailscale IP: 'direct' | 'derp'}"""
+    out = {}
+    for peer in ((status or {}).get('Peer') or {}).values():
+        path = 'direct' if peer.get('CurAddr') else 'derp' if peer.get('Relay') else None
+        if path is None:
+            continue
+        for ip in peer.get('TailscaleIPs') or ():
+            out[ip] = path
+    return out
+
+
+def classify(remote_ip: "str | None", cand_type: "str | None",
+             peers: "dict[str, str] | None") -> str:
+    if cand_type == 'relay':
+        return 'relay'
+    if not is_tailscale_ip(remote_ip):
+        return 'lan'
+    if peers is None:
+        return 'tailscale'
+    return peers.get(unmap(remote_ip), 'tailscale')
+
+
+class PathMonitor:
+    """세션별 연결 경로 추적과 저대역 프로필 전환 (서버 이벤트 루프에서 실행)"""
+
+    def __init__(self, sessions: dict, mode: str = 'auto', profile: "dict | None" = None,
+                 interval: float = CHECK_INTERVAL, on_change=None):
+        self.sessions  = sessions   # server.g_sessions (id → SignalingSession)
+        self.mode      = mode
+        self.profile   = {**LOW_BANDWIDTH, **(profile or {})}
+        self.interval  = interval
+        self.on_change = on_change  # on_change(대표 경로 | None) — 트레이 표시용
+        self.paths: "dict[str, str]" = {}
+        self.switches  = 0
+        self._shown: "str | None" = None
+        self._task: "asyncio.Task | None" = None
+        self._wake     = asyncio.Event()
+
+    def path(self) -> "str | None":
+        """대표 경로 — 세션 중 하나라도 저대역이면 그 경로"""
+        paths = list(self.paths.values())
+        for p in paths:
+            if p in RELAYED:
+                return p
+        return paths[0] if paths else None
+
+    async def check(self) -> None:
+        remotes = {}
+        for sid, sess in list(self.sessions.items()):
+            if sess.pc.connectionState != 'connected':
+                continue
+            pair = selected_pair(sess.pc)
+            remotes[sid] = (pair[0] if pair else sess.remote, pair[1] if pair else None)
+        peers = None
+        if any(is_tailscale_ip(ip) for ip, _ in remotes.values()):
+            peers = peer_paths(await tailscale_status_async())
+        for sid, (ip, ctype) in remotes.items():
+            path = classify(ip, ctype, peers)
+            if self.paths.get(sid) != path:
+                await self._apply(sid, path)
+        for sid in set(self.paths) - set(remotes):
+            del self.paths[sid]
+        shown = self.path()
+        if shown != self._shown:
+            self._shown = shown
+            if self.on_change is not None:
+                self.on_change(shown)
+
+    async def _apply(self, sid: str, path: str) -> None:
+        """경로를 기록하고 필요하면 프로필 전환.  전환이 실패하면 기록하지 않아 다음 확인 때 재시도"""
+        before = self.paths.get(sid)
+        log.info(f"연결 경로 ({sid}): {before or '-'} → {path}")
+        low  = self.mode == 'always' or path in RELAYED
+        was  = self.mode == 'always' or before in RELAYED
+        sess = self.sessions.get(sid)
+        if (self.mode == 'off' or (before is not None and low == was)
+                or (before is None and not low)      # 새 세션은 이미 FULL
+                or (sess is not None and sess.version < 2)):   # v1 — control 불가
+            self.paths[sid] = path
+            return
+        if sess is None or not await sess.control('quality', **(self.profile if low else FULL)):
+            return
+        self.paths[sid] = path
+        self.switches += 1
+        log.info(f"{'저대역' if low else '기본'} 프로필 적용 ({sid})")
+
+    # ── 백그라운드 태스크 ────────────────────────────────────────────
+    def start(self) -> "PathMonitor":
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def poke(self) -> None:
+        """즉시 확인 요청 (세션 연결 직후). 이벤트 루프 스레드에서 호출"""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()   # 확인 중에 온 poke() 는 남겨 둠 → 곧바로 다시 확인
+            try:
+                await self.check()
+            except Exception as e:
+                log.warning(f"연결 경로 확인 오류: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {'mode': self.mode, 'path': self.path(), 'sessions': dict(self.paths),
+                'profile_switches': self.switches}
@@ -0,0 +1,207 @@
+"""
+LNDIVC 네트워크 주소 탐색
+-------------------------
+`socket.gethostbyname(socket.gethostname())` 는 Windows 에서 가상 어댑터(Hyper-V, WSL …)
+주소를 돌려주거나 DNS 가 느리면 수 초 걸리고, 8.8.8.8 UDP connect 요령은 오프라인에서
+실패한다.  여기서는 인터페이스를 한 번 열거해(ifaddr — DNS 조회 없음) 순위를 매기고
+캐시한다.  접속 URL(QR, 콘솔 배너, 대기 화면), 자체 서명 인증서 SAN, ICE 후보 수집,
+리스너가 모두 이 결과를 쓴다.
+
+순위: Tailscale → 유선 LAN → Wi-Fi → 기타 → 가상 어댑터.  같은 순위에서는 IPv4 사설 주소,
+IPv4, IPv6 순.  루프백과 링크 로컬(169.254/16, fe80::/10)은 제외한다.
+
+캐시는 CACHE_TTL 초 동안 유효하다.  서버 실행 중에는 NetworkWatcher 가 WATCH_INTERVAL
+마다 다시 열거하고, 주소 구성이 바뀌면 on_change 콜백을 부른다.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+# ifaddr 는 aioice(aiortc) 의존성 — 가상환경 없이 트레이만 실행할 때는 없을 수 있음
+try:
+    import ifaddr
+    HAVE_IFADDR = True
+except ImportError:
+    HAVE_IFADDR = False
+
+log = logging.getLogger(__name__)
+
+CACHE_TTL      = 30.0   # 캐시 유효 시간 (초) — 감시 태스크가 없을 때(트레이, 설정 마법사)
+WATCH_INTERVAL = 5.0    # 서버 실행 중 재열거 간격 (초)
+
+TAILSCALE_NETS = (ipaddress.ip_network('100.64.0.0/10'),
+                  ipaddress.ip_network('fd7a:115c:a1e0::/48'))
+
+# 어댑터 이름/설명(소문자)에 포함된 단어로 종류 판단 — 가상을 먼저 본다
+# ("Hyper-V Virtual Ethernet Adapter" 는 ethernet 도 포함)
+_VIRTUAL = ('virtual', 'hyper-v', 'vethernet', 'wsl', 'vmware', 'vmnet', 'virtualbox',
+            'docker', 'veth', 'virbr', 'br-', 'tap-', 'loopback', 'bluetooth', 'npcap')
+_WIFI    = ('wi-fi', 'wifi', 'wireless', 'wlan', '802.11', 'wlp', 'wlx')
+_WIRED   = ('ethernet', 'gbe', 'gigabit', 'eth', 'enp', 'eno', 'ens', 'lan')
+KINDS    = ('tailscale', 'wired', 'wifi', 'other', 'virtual')   # 순위 순
+
+
+def unmap(ip: "str | None") -> "str | None":
+    """듀얼 스택 소켓의 IPv4 매핑 주소(::ffff:a.b.c.d)와 스코프(%eth0)를 벗긴 주소"""
+    try:
+        addr = ipaddress.ip_address((ip or '').split('%')[0])
+    except ValueError:
+        return ip
+    return str(addr.ipv4_mapped or addr) if addr.version == 6 else str(addr)
+
+
+def is_tailscale_ip(ip: "str | None") -> bool:
+    try:
+        addr = ipaddress.ip_address(unmap(ip) or '')
+    except ValueError:
+        return False
+    return any(addr in net for net in TAILSCALE_NETS)
+
+
+@dataclass(frozen=True)
+class Address:
+    ip:     str
+    prefix: int
+    name:   str    # 어댑터 이름 (Windows: 설명, 예 "Intel(R) Wi-Fi 6 AX201")
+    kind:   str    # KINDS 중 하나
+
+    @property
+    def version(self) -> int:
+        return 6 if ':' in self.ip else 4
+
+    @property
+    def rank(self) -> tuple:
+        addr = ipaddress.ip_address(self.ip)
+        return (KINDS.index(self.kind), self.version, not addr.is_private)
+
+
+def classify(name: str, ip: str) -> str:
+    if is_tailscale_ip(ip) or 'tailscale' in name.lower():
+        return 'tailscale'
+    lower = name.lower()
+    for kind, words in (('virtual', _VIRTUAL), ('wifi', _WIFI), ('wired', _WIRED)):
+        if any(w in lower for w in words):
+            return kind
+    return 'other'
+
+
+def _adapters() -> "list[tuple[str, str, int]]":
+    """(어댑터 이름, 주소, 프리픽스 길이). ifaddr 가 없으면 호스트 이름 조회로 대신함"""
+    if not HAVE_IFADDR:
+        try:
+            infos = socket.getaddrinfo(socket.gethostname(), None, proto=socket.IPPROTO_TCP)
+        except OSError:
+            return []
+        return [('', info[4][0], 32 if info[0] == socket.AF_INET else 64) for info in infos]
+    out = []
+    for adapter in ifaddr.get_adapters():
+        name = adapter.nice_name or adapter.name
+        for ip in adapter.ips:
+            out.append((name, ip.ip if isinstance(ip.ip, str) else ip.ip[0], ip.network_prefix))
+    return out
+
+
+def discover() -> "list[Address]":
+    """인터페이스 열거 → 순위순 주소 목록 (캐시 없음)"""
+    out = []
+    for name, raw, prefix in _adapters():
+        try:
+            addr = ipaddress.ip_address(raw.split('%')[0])
+        except ValueError:
+            continue
+        if addr.is_loopback or addr.is_link_local or addr.is_unspecified:
+            continue
+        out.append(Address(str(addr), prefix, name, classify(name, str(addr))))
+    out.sort(key=lambda a: a.rank)
+    return list(dict.fromkeys(out))
+
+
+# ── 캐시 ──────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_cached: "list[Address] | None" = None
+_cached_at = 0.0
+
+
+def refresh() -> bool:
+    """다시 열거해 캐시 갱신. 주소 구성이 바뀌었으면 True"""
+    global _cached, _cached_at
+    found = discover()
+    with _lock:
+        changed = _cached is not None and found != _cached
+        _cached, _cached_at = found, time.monotonic()
+    return changed
+
+
+def addresses(max_age: float = CACHE_TTL) -> "list[Address]":
+    """순위순 주소 목록 (캐시가 max_age 초보다 오래됐으면 다시 열거)"""
+    with _lock:
+        if _cached is not None and time.monotonic() - _cached_at < max_age:
+            return _cached
+    refresh()
+    return _cached
+
+
+def primary_ip(default: str = '127.0.0.1') -> str:
+    """접속 URL 에 쓸 주소 — 가상 어댑터가 아닌 최상위 IPv4 (없으면 default)"""
+    for a in addresses():
+        if a.version == 4 and a.kind != 'virtual':
+            return a.ip
+    return default
+
+
+def san_addresses() -> "list[str]":
+    """자체 서명 인증서 SAN 에 넣을 주소 — 가상 어댑터를 뺀 모든 주소와 루프백"""
+    ips = [a.ip for a in addresses(0) if a.kind != 'virtual']
+    return list(dict.fromkeys(ips + ['127.0.0.1', '::1']))
+
+
+def url_host(ip: str) -> str:
+    return f"[{ip}]" if ':' in ip else ip
+
+
+class NetworkWatcher:
+    """서버 이벤트 루프에서 주소 구성 변화를 감시 (열거는 executor 스레드에서)"""
+
+    def __init__(self, on_change=None, interval: float = WATCH_INTERVAL):
+        self.on_change = on_change   # on_change(addresses()) — 루프 스레드에서 호출
+        self.interval  = interval
+        self.changes   = 0
+        self._task: "asyncio.Task | None" = None
+
+    def start(self) -> "NetworkWatcher":
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                changed = await loop.run_in_executor(None, refresh)
+            except Exception as e:
+                log.warning(f"네트워크 주소 열거 오류: {e}")
+                continue
+            if changed:
+                self.changes += 1
+                log.info(f"네트워크 변경: {', '.join(a.ip for a in addresses())}")
+                if self.on_change is not None:
+                    self.on_change(addresses())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {'primary': primary_ip(), 'changes': self.changes,
+                'addresses': [{'ip': a.ip, 'kind': a.kind, 'name': a.name}
+                              for a in addresses()]}
@@ -0,0 +1,112 @@
+"""
+LNDIVC 성능 지표
+----------------
+server.get_stats() 스냅샷을 주기적으로 받아 초당 값으로 바꾸고 최근 history 개를 보관한다.
+트레이의 성능 창 그래프와 툴팁 한 줄 요약이 이 값을 쓴다.
+
+지표 (키 → 의미):
+    fps_in       수신 프레임/초 (recv 스테이지)
+    fps_out      출력 프레임/초 (sink 스테이지)
+    latency_ms   추정 지연 = 수신→출력 파이프라인 지연 + RTT/2
+                 (헤드셋 쪽 캡처·인코딩과 aiortc 지터 버퍼는 포함되지 않은 하한값)
+    audio_queue  오디오 버퍼 깊이 (청크 수)
+    loss_pct     RTP 패킷 손실률 (구간)
+    cpu_pct      프로세스 CPU (1코어 = 100)
+    stage.<이름>  스테이지별 CPU (구간 동안 처리에 쓴 시간 비율, %)
+
+누적 카운터의 차이로 계산하므로 세션이 바뀌어 카운터가 줄어든 구간은 0 으로 둔다.
+"""
+
+import time
+from collections import deque
+
+METRICS = ('fps_in', 'fps_out', 'latency_ms', 'audio_queue', 'loss_pct', 'cpu_pct')
+
+
+class PerfSampler:
+    """get_stats() 스냅샷 → 지표 시계열"""
+
+    def __init__(self, history: int = 120):
+        self.history = history
+        self.series: "dict[str, deque]" = {}
+        self.latest: "dict[str, float]" = {}
+        self.seq = 0               # 샘플 번호 — 그래프가 새 샘플만 그리도록
+        self._prev: "dict | None" = None
+        self._prev_t   = 0.0
+        self._prev_cpu = 0.0
+
+    def reset(self) -> None:
+        self.series.clear()
+        self.latest = {}
+        self._prev = None
+
+    @staticmethod
+    def _counters(stats: dict) -> dict:
+        c = {'frames_in': 0, 'frames_out': 0, 'rtp_received': 0, 'rtp_lost': 0}
+        for p in stats.get('pipelines', {}).values():
+            c['frames_out'] += p.get('frames_out', 0)
+            for name, st in p.get('stages', {}).items():
+                if name == 'recv':
+                    c['frames_in'] += st['items']
+                key = 'busy.' + name
+                c[key] = c.get(key, 0.0) + st['busy_ms'] * st['items'] / 1000
+        for sess in stats.get('sessions', {}).values():
+            for kind in (sess.get('rtp') or {}).values():
+                c['rtp_received'] += kind['received']
+                c['rtp_lost']     += kind['lost']
+        return c
+
+    def sample(self, stats: dict, now: "float | None" = None) -> dict:
+        """스냅샷 1개 반영. 이번 구간 지표 반환 (첫 호출은 누적값이 없어 일부만)"""
+        now = time.monotonic() if now is None else now
+        cpu = time.process_time()
+        cur = self._counters(stats)
+        m: "dict[str, float]" = {}
+
+        lat = [p.get('latency_ms', 0.0) for p in stats.get('pipelines', {}).values()]
+        rtt = [s['rtt_ms'] for s in stats.get('sessions', {}).values() if s.get('rtt_ms')]
+        if lat:
+            m['latency_ms'] = max(lat) + (min(rtt) / 2 if rtt else 0.0)
+        m['audio_queue'] = stats.get('audio_queue', 0)
+
+        prev, dt = self._prev, now - self._prev_t
+        if prev is not None and dt > 0:
+            def d(k):
+                return max(0.0, cur.get(k, 0) - prev.get(k, 0))
+            m['fps_in']  = d('frames_in') / dt
+            m['fps_out'] = d('frames_out') / dt
+            recv, lost = d('rtp_received'), d('rtp_lost')
+            m['loss_pct'] = 100 * lost / (recv + lost) if recv + lost else 0.0
+            m['cpu_pct']  = 100 * (cpu - self._prev_cpu) / dt
+            for k in cur:
+                if k.startswith('busy.'):
+                    m['stage.' + k[5:]] = 100 * d(k) / dt
+        self._prev, self._prev_t, self._prev_cpu = cur, now, cpu
+
+        for k, v in m.items():
+            s = self.series.get(k)
+            if s is None:
+                s = self.series[k] = deque(maxlen=self.history)
+            s.append(v)
+        self.latest = m
+        self.seq += 1
+        return m
+
+    def health(self, target_fps: float) -> "tuple[str, str] | None":
+        """
+        (등급, 요약) — 등급 'good' | 'warn' | 'bad'.  출력 중인 세션이 없으면 None.
+        요약 예: '30 fps · 85 ms · 0.1%'
+        """
+        m = self.latest
+        fps = m.get('fps_out')
+        if not fps or 'latency_ms' not in m:
+            return None
+        lat  = m['latency_ms']
+        loss = m.get('loss_pct', 0.0)
+        if fps < 0.5 * target_fps or loss > 5 or lat > 250:
+            level = 'bad'
+        elif fps < 0.8 * target_fps or loss > 1 or lat > 120:
+            level = 'warn'
+        else:
+            level = 'good'
+        return level, f"{fps:.0f} fps · {lat:.0f} ms · {loss:.1f}%"
@@ -0,0 +1,430 @@
+"""
+LNDIVC 파이프라인 스테이지 그래프
+---------------------------------
+스테이지를 유한 크기 단일 생산자/단일 소비자 큐(Edge)로 연결하는 작은 데이터플로 프레임워크.
+
+    p = Pipeline('video')
+    p.source('recv', track.recv)                       # 이벤트 루프에서 반복 호출
+    p.add('convert', to_rgb,  affinity='thread')
+    p.add('scale',   crop,    affinity='process', queue=2, policy='drop-oldest')
+    p.add('sink',    send,    affinity='thread',  queue=1, policy='drop-oldest')
+    await p.run()
+
+스테이지 함수는 item → item 을 반환하며, None 을 반환하면 해당 item 은 다음
+스테이지로 전달되지 않는다.  소스가 예외(트랙 종료 등)를 던지면 파이프라인은
+남은 item 을 흘려보낸 뒤 종료한다.
+
+affinity:
+    loop    — 이벤트 루프 태스크 (짧은 작업, 코루틴 함수 허용)
+    thread  — 전용 스레드
+    process — 전용 스레드가 단일 워커 프로세스에 위임 (함수와 item 이 pickle 가능해야 함)
+
+policy (스테이지 입력 큐가 가득 찼을 때 생산자 동작):
+    block       — 자리가 날 때까지 대기 (루프 생산자는 await)
+    drop-oldest — 가장 오래된 item 을 버리고 넣음 (실시간 영상 기본값)
+    drop-newest — 새 item 을 버림
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+BLOCK       = 'block'
+DROP_OLDEST = 'drop-oldest'
+DROP_NEWEST = 'drop-newest'
+POLICIES    = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+AFFINITIES  = ('loop', 'thread', 'process')
+
+
+class EdgeClosed(Exception):
+    """닫힌 Edge 에서 더 꺼낼 item 이 없음"""
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class Edge:
+    """
+    유한 크기 SPSC 큐.  생산자/소비자 각각 스레드(put/get) 또는
+    이벤트 루프(put_async/get_async) 어느 쪽에서도 사용할 수 있다.
+    """
+
+    def __init__(self, name: str, maxsize: int = 2, policy: str = DROP_OLDEST):
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 policy: {policy}")
+        self.name    = name
+        self.maxsize = max(1, maxsize)
+        self.policy  = policy
+        self.dropped = 0
+        self.closed  = False
+        self._dq: deque = deque()
+        self._lock      = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full  = threading.Condition(self._lock)
+        self._async_getter: "tuple | None" = None   # (loop, future)
+        self._async_putter: "tuple | None" = None
+
+    def __len__(self) -> int:
+        return len(self._dq)
+
+    # ── 내부 (lock 보유 상태에서 호출) ───────────────────────────────
+    @staticmethod
+    def _wake(waiter: "tuple | None") -> None:
+        if waiter is not None:
+            loop, fut = waiter
+            loop.call_soon_threadsafe(_resolve, fut)
+
+    def _item_added(self) -> None:
+        self._not_empty.notify()
+        waiter, self._async_getter = self._async_getter, None
+        self._wake(waiter)
+
+    def _item_removed(self) -> None:
+        self._not_full.notify()
+        waiter, self._async_putter = self._async_putter, None
+        self._wake(waiter)
+
+    def _offer(self, item) -> bool:
+        """정책에 따라 item 을 넣는다. BLOCK 에서 가득 찼으면 False"""
+        if self.closed:
+            return True   # 닫힌 뒤 들어온 item 은 조용히 버림
+        if len(self._dq) < self.maxsize:
+            self._dq.append(item)
+        elif self.policy == DROP_OLDEST:
+            self._dq.popleft()
+            self._dq.append(item)
+            self.dropped += 1
+        elif self.policy == DROP_NEWEST:
+            self.dropped += 1
+            return True
+        else:
+            return False
+        self._item_added()
+        return True
+
+    def _take(self):
+        item = self._dq.popleft()
+        self._item_removed()
+        return item
+
+    # ── 스레드 쪽 ─────────────────────────────────────────────────────
+    def put(self, item) -> None:
+        with self._lock:
+            while not self._offer(item):
+                self._not_full.wait()
+
+    def get(self):
+        with self._lock:
+            while not self._dq:
+                if self.closed:
+                    raise EdgeClosed(self.name)
+                self._not_empty.wait()
+            return self._take()
+
+    # ── 이벤트 루프 쪽 ───────────────────────────────────────────────
+    async def put_async(self, item) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._offer(item):
+                    return
+                fut = loop.create_future()
+                self._async_putter = (loop, fut)
+            await fut
+
+    async def get_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._dq:
+                    return self._take()
+                if self.closed:
+                    raise EdgeClosed(self.name)
+                fut = loop.create_future()
+                self._async_getter = (loop, fut)
+            await fut
+
+    def close(self) -> None:
+        """생산 종료. 소비자는 남은 item 을 모두 꺼낸 뒤 EdgeClosed 를 받는다"""
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            for attr in ('_async_getter', '_async_putter'):
+                waiter = getattr(self, attr)
+                setattr(self, attr, None)
+                self._wake(waiter)
+
+
+class LatestWorker:
+    """
+    프레임 경로 밖에서 무거운 분석(얼굴 검출, 세그멘테이션 등)을 돌리는 단일 워커 스레드.
+    작업은 한 번에 1개만 받는다 — 이전 작업이 진행 중이면 submit 이 거절(False)되고,
+    호출자는 그 프레임의 분석을 건너뛴 채 마지막 결과를 계속 사용한다.
+    """
+
+    def __init__(self, fn, name: str = 'worker'):
+        self.fn      = fn
+        self.name    = name
+        self.last_ms = 0.0   # 마지막 작업 소요 시간
+        self.runs    = 0
+        self._job    = None
+        self._result = None
+        self._busy   = False
+        self._stop   = False
+        self._cv     = threading.Condition()
+        self._thread: "threading.Thread | None" = threading.Thread(
+            target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def submit(self, job) -> bool:
+        with self._cv:
+            if self._busy or self._stop:
+                return False
+            self._busy = True
+            self._job  = job
+            self._cv.notify()
+        return True
+
+    def poll(self):
+        """새 결과가 있으면 꺼내 반환 (없으면 None). fn 이 None 을 반환한 작업은 결과 없음"""
+        with self._cv:
+            result, self._result = self._result, None
+        return result
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while self._job is None and not self._stop:
+                    self._cv.wait()
+                if self._stop:
+                    return
+                job, self._job = self._job, None
+            t0 = time.perf_counter()
+            try:
+                result = self.fn(job)
+            except Exception as e:
+                log.warning(f"{self.name} 오류: {e}")
+                result = None
+            dt = (time.perf_counter() - t0) * 1000
+            with self._cv:
+                self.last_ms = dt
+                self.runs   += 1
+                if result is not None:
+                    self._result = result
+                self._busy = False
+
+    def close(self) -> None:
+        with self._cv:
+            self._stop = True
+            self._cv.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class Stage:
+    """파이프라인 스테이지 1개와 그 통계"""
+
+    def __init__(self, name: str, fn, affinity: str = 'loop'):
+        if affinity not in AFFINITIES:
+            raise ValueError(f"알 수 없는 affinity: {affinity}")
+        self.name     = name
+        self.fn       = fn
+        self.affinity = affinity
+        self.inbox: "Edge | None"  = None
+        self.outbox: "Edge | None" = None
+        self.items    = 0
+        self.busy_s   = 0.0
+        self.last_ms  = 0.0
+
+    def _account(self, t0: float) -> None:
+        dt = time.perf_counter() - t0
+        self.items  += 1
+        self.busy_s += dt
+        self.last_ms = dt * 1000
+
+    def stats(self, elapsed: float) -> dict:
+        inbox = self.inbox
+        return {
+            'affinity':  self.affinity,
+            'items':     self.items,
+            'busy_ms':   round(self.busy_s * 1000 / self.items, 3) if self.items else 0.0,
+            'last_ms':   round(self.last_ms, 3),
+            'busy_pct':  round(100 * self.busy_s / elapsed, 1) if elapsed > 0 else 0.0,
+            'queue':     len(inbox) if inbox is not None else 0,
+            'queue_max': inbox.maxsize if inbox is not None else 0,
+            'policy':    inbox.policy if inbox is not None else None,
+            'dropped':   inbox.dropped if inbox is not None else 0,
+        }
+
+
+class Pipeline:
+    """소스 1개 + 선형으로 연결된 스테이지들"""
+
+    def __init__(self, name: str):
+        self.name    = name
+        self.stages: "list[Stage]" = []
+        self._t0     = 0.0
+        self._threads: "list[threading.Thread]" = []
+        self._pools:   "list[concurrent.futures.ProcessPoolExecutor]" = []
+        self._on_stop: list = []
+
+    def source(self, name: str, recv) -> "Pipeline":
+        """recv: 인자 없는 코루틴 함수. 예외를 던지면 소스 종료"""
+        if self.stages:
+            raise ValueError("source 는 첫 스테이지여야 합니다")
+        self.stages.append(Stage(name, recv, 'loop'))
+        return self
+
+    def add(self, name: str, fn, affinity: str = 'loop',
+            queue: int = 2, policy: str = DROP_OLDEST) -> "Pipeline":
+        return self.insert(len(self.stages), name, fn, affinity, queue, policy)
+
+    def insert(self, index: int, name: str, fn, affinity: str = 'loop',
+               queue: int = 2, policy: str = DROP_OLDEST) -> "Pipeline":
+        """index 위치에 스테이지 삽입 (0 은 소스 자리이므로 1 이상)"""
+        if not self.stages or index < 1:
+            raise ValueError("source 뒤에만 삽입할 수 있습니다")
+        stage = Stage(name, fn, affinity)
+        stage.inbox = Edge(f"{self.name}.{name}", queue, policy)
+        self.stages.insert(index, stage)
+        return self
+
+    def on_stop(self, fn) -> "Pipeline":
+        """파이프라인 종료 시 호출할 정리 함수 등록 (스테이지가 쓰던 워커 등)"""
+        self._on_stop.append(fn)
+        return self
+
+    def index(self, name: str) -> int:
+        for i, st in enumerate(self.stages):
+            if st.name == name:
+                return i
+        raise KeyError(name)
+
+    # ── 실행 ──────────────────────────────────────────────────────────
+    def _link(self) -> None:
+        for up, down in zip(self.stages, self.stages[1:]):
+            up.outbox = down.inbox
+
+    async def _run_source(self, st: Stage) -> None:
+        try:
+            while True:
+                try:
+                    item = await st.fn()
+                except Exception as e:
+                    log.info(f"{self.name} 소스 종료: {e}")
+                    return
+                st.items += 1
+                if st.outbox is not None:
+                    await st.outbox.put_async(item)
+        finally:
+            if st.outbox is not None:
+                st.outbox.close()
+
+    async def _run_loop_stage(self, st: Stage) -> None:
+        is_coro = asyncio.iscoroutinefunction(st.fn)
+        try:
+            while True:
+                try:
+                    item = await st.inbox.get_async()
+                except EdgeClosed:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    out = await st.fn(item) if is_coro else st.fn(item)
+                except Exception as e:
+                    log.warning(f"{self.name}.{st.name} 오류: {e}")
+                    continue
+                finally:
+                    st._account(t0)
+                if out is not None and st.outbox is not None:
+                    await st.outbox.put_async(out)
+        finally:
+            if st.outbox is not None:
+                st.outbox.close()
+
+    def _run_thread_stage(self, st: Stage, pool=None) -> None:
+        try:
+            while True:
+                try:
+                    item = st.inbox.get()
+                except EdgeClosed:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    out = pool.submit(st.fn, item).result() if pool else st.fn(item)
+                except Exception as e:
+                    log.warning(f"{self.name}.{st.name} 오류: {e}")
+                    continue
+                finally:
+                    st._account(t0)
+                if out is not None and st.outbox is not None:
+                    st.outbox.put(out)
+        finally:
+            if st.outbox is not None:
+                st.outbox.close()
+
+    async def run(self) -> None:
+        """소스가 끝나고 모든 스테이지가 남은 item 을 처리할 때까지 실행"""
+        self._link()
+        self._t0 = time.monotonic()
+        tasks   = []
+        done_fs = []
+        loop = asyncio.get_running_loop()
+        for st in self.stages:
+            if st is self.stages[0]:
+                tasks.append(asyncio.ensure_future(self._run_source(st)))
+            elif st.affinity == 'loop':
+                tasks.append(asyncio.ensure_future(self._run_loop_stage(st)))
+            else:
+                pool = None
+                if st.affinity == 'process':
+                    pool = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+                    self._pools.append(pool)
+                fut = loop.create_future()
+                th  = threading.Thread(
+                    target=self._thread_main, args=(st, pool, loop, fut),
+                    name=f"{self.name}.{st.name}", daemon=True,
+                )
+                self._threads.append(th)
+                done_fs.append(fut)
+                th.start()
+        try:
+            await asyncio.gather(*tasks, *done_fs)
+        finally:
+            for st in self.stages[1:]:
+                st.inbox.close()
+            for t in tasks:
+                t.cancel()
+            for pool in self._pools:
+                pool.shutdown(wait=False, cancel_futures=True)
+            for fn in self._on_stop:
+                try:
+                    fn()
+                except Exception as e:
+                    log.warning(f"{self.name} 정리 오류: {e}")
+
+    def _thread_main(self, st: Stage, pool, loop, fut) -> None:
+        try:
+            self._run_thread_stage(st, pool)
+        finally:
+            try:
+                loop.call_soon_threadsafe(_resolve, fut)
+            except RuntimeError:
+                pass   # 루프가 이미 닫힘
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self._t0 if self._t0 else 0.0
+        return {st.name: st.stats(elapsed) for st in self.stages}
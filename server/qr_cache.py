@@ -0,0 +1,96 @@
+"""
+LNDIVC QR 코드 캐시
+-------------------
+접속 URL 의 QR 코드를 URL 별로 한 번만 만든다.  대기 화면(standby.py)과 트레이 QR 창이
+같은 모듈 행렬을 공유하고, 이미지는 모듈 단위 정수 배율의 최근접 확대로 그려 경계가
+흐려지지 않는다 (임의 크기로 resize 하면 모듈 폭이 1픽셀씩 달라져 인식이 느려짐).
+
+서버가 시작하거나 접속 주소가 바뀌면 warm() 이 백그라운드 스레드에서 미리 만들어 두므로
+QR 창은 캐시에서 바로 열린다.
+"""
+
+import functools
+import logging
+import threading
+
+import numpy as np
+
+try:
+    import qrcode
+    HAVE_QR = True
+except Exception:
+    qrcode = None
+    HAVE_QR = False
+
+log = logging.getLogger(__name__)
+
+IMAGE_SIZE   = 240   # 트레이 QR 창 이미지 크기 (px)
+IMAGE_BORDER = 4     # QR 표준 여백 (모듈 수)
+
+
+@functools.lru_cache(maxsize=8)
+def _encode(url: str) -> "np.ndarray | None":
+    """QR 모듈 행렬 (True = 검정, 여백 없음, 읽기 전용). qrcode 없으면 None"""
+    if not HAVE_QR:
+        return None
+    qr = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    qr.add_data(url)
+    qr.make(fit=True)
+    m = np.array(qr.get_matrix(), dtype=bool)
+    m.setflags(write=False)
+    return m
+
+
+def matrix(url: str, border: int = 2) -> "np.ndarray | None":
+    """여백 border 모듈을 두른 QR 모듈 행렬 (True = 검정). qrcode 없으면 None"""
+    m = _encode(url)
+    if m is None:
+        return None
+    return np.pad(m, border, constant_values=False)
+
+
+def scaled(url: str, size: int, border: int = 2) -> "np.ndarray | None":
+    """
+    size 픽셀 안에 들어가는 가장 큰 정수 배율로 확대한 QR (uint8, 0 = 검정 / 255 = 흰색).
+    결과 한 변은 모듈 수 × 배율 — size 보다 조금 작을 수 있다.
+    """
+    m = matrix(url, border)
+    if m is None:
+        return None
+    unit = max(1, size // m.shape[0])
+    return np.where(np.repeat(np.repeat(m, unit, 0), unit, 1), 0, 255).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=8)
+def image(url: str, size: int = IMAGE_SIZE, border: int = IMAGE_BORDER):
+    """
+    size × size PIL 이미지 (L 모드) — 정수 배율 QR 을 흰 바탕 가운데에 놓는다.
+    qrcode 나 Pillow 가 없으면 None.  캐시된 객체이므로 수정하지 말 것.
+    """
+    qr = scaled(url, size, border)
+    if qr is None:
+        return None
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    canvas = Image.new('L', (size, size), 255)
+    off = (size - qr.shape[0]) // 2
+    canvas.paste(Image.fromarray(qr, 'L'), (off, off))
+    return canvas
+
+
+def warm(url: str, size: int = IMAGE_SIZE) -> "threading.Thread | None":
+    """url 의 QR 행렬과 창 이미지를 백그라운드 스레드에서 미리 만들어 둠"""
+    if not url or not HAVE_QR:
+        return None
+
+    def _run():
+        try:
+            image(url, size)
+        except Exception as e:
+            log.warning(f"QR 미리 만들기 실패: {e}")
+
+    th = threading.Thread(target=_run, name='qr-warm', daemon=True)
+    th.start()
+    return th
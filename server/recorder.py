@@ -0,0 +1,168 @@
+"""
+LNDIVC MP4 녹화기
+-----------------
+가상 카메라로 보내는 프레임과 오디오를 백그라운드 스레드에서 PyAV로 인코딩해
+MP4 로 저장한다.  라이브 경로(receive_video / receive_audio)는 큐에 참조를
+넣기만 하고, 큐가 가득 차면 녹화 프레임을 버린다 — 녹화가 가상 카메라를
+지연시키는 일은 없다.
+
+타임스탬프:
+    비디오 — 큐에 넣은 시각(monotonic) 기준 ms
+    오디오 — 샘플 수 기준, 수신 공백이 생기면 무음으로 채워 A/V 동기 유지
+"""
+
+import datetime
+import fractions
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+
+import av
+import numpy as np
+from av.audio.fifo import AudioFifo
+
+log = logging.getLogger(__name__)
+
+_MS = fractions.Fraction(1, 1000)
+
+# 오디오 공백이 이보다 길면 무음 삽입 (초)
+_AUDIO_GAP_S = 0.2
+
+
+def new_recording_path(out_dir: Path) -> Path:
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return Path(out_dir) / f"LNDIVC-{stamp}.mp4"
+
+
+class StreamRecorder:
+    """단일 MP4 녹화 세션. start() → add_video/add_audio → stop()"""
+
+    def __init__(self, path: Path, width: int, height: int, fps: int,
+                 sample_rate: int, channels: int, max_queue: int = 90):
+        self.path        = Path(path)
+        self.width       = width
+        self.height      = height
+        self.fps         = fps
+        self.sample_rate = sample_rate
+        self.channels    = channels
+        self.dropped     = 0
+        self.frames      = 0
+        self._q: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._t0 = 0.0
+        self._thread: "threading.Thread | None" = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "StreamRecorder":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._t0 = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='recorder', daemon=True)
+        self._thread.start()
+        log.info(f"녹화 시작: {self.path}")
+        return self
+
+    # ── 라이브 경로에서 호출 (절대 대기하지 않음) ──────────────────────
+    def _put(self, item) -> None:
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def add_video(self, img: np.ndarray) -> None:
+        """가상 카메라로 보낸 rgb24 프레임 (이후 수정하지 않아야 함)"""
+        self._put(('v', time.monotonic() - self._t0, img))
+
+    def add_audio(self, chunk: np.ndarray) -> None:
+        """s16 (samples, channels) 청크"""
+        self._put(('a', time.monotonic() - self._t0, chunk))
+
+    # ── 인코더 스레드 ─────────────────────────────────────────────────
+    def _open(self):
+        container = av.open(str(self.path), 'w')
+        for codec in ('libx264', 'h264', 'mpeg4'):
+            if codec in av.codecs_available:
+                break
+        vs = container.add_stream(codec, rate=self.fps)
+        vs.width, vs.height, vs.pix_fmt = self.width, self.height, 'yuv420p'
+        if codec == 'libx264':
+            vs.options = {'preset': 'veryfast', 'tune': 'zerolatency', 'crf': '23'}
+        vs.codec_context.time_base = _MS
+        layout = 'mono' if self.channels == 1 else 'stereo'
+        aus = container.add_stream('aac', rate=self.sample_rate)
+        aus.layout = layout
+        return container, vs, aus, layout
+
+    def _run(self) -> None:
+        try:
+            container, vs, aus, layout = self._open()
+        except Exception as e:
+            log.warning(f"녹화 파일 열기 실패: {e}")
+            self._drain()
+            return
+        fifo       = AudioFifo()
+        last_pts   = -1
+        a_samples  = None   # 지금까지 기록한 오디오 샘플 수 (첫 청크 도착 시 시작점 결정)
+        frame_size = aus.codec_context.frame_size or 1024
+
+        def _mux(packets):
+            for p in packets:
+                container.mux(p)
+
+        def _write_audio(pcm: np.ndarray):
+            nonlocal a_samples
+            af = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format='s16', layout=layout)
+            af.sample_rate = self.sample_rate
+            af.pts         = a_samples
+            af.time_base   = fractions.Fraction(1, self.sample_rate)
+            fifo.write(af)
+            a_samples += pcm.shape[0]
+            while fifo.samples >= frame_size:
+                _mux(aus.encode(fifo.read(frame_size)))
+
+        try:
+            while True:
+                item = self._q.get()
+                if item is None:
+                    break
+                kind, t, arr = item
+                try:
+                    if kind == 'v':
+                        pts = max(int(t * 1000), last_pts + 1)
+                        last_pts = pts
+                        vf = av.VideoFrame.from_ndarray(arr, format='rgb24')
+                        vf.pts, vf.time_base = pts, _MS
+                        _mux(vs.encode(vf))
+                        self.frames += 1
+                    else:
+                        expected = int(t * self.sample_rate) - arr.shape[0]
+                        if a_samples is None:
+                            a_samples = max(expected, 0)
+                        elif expected - a_samples > _AUDIO_GAP_S * self.sample_rate:
+                            gap = expected - a_samples
+                            _write_audio(np.zeros((gap, self.channels), np.int16))
+                        _write_audio(arr)
+                except Exception as e:
+                    log.warning(f"녹화 인코딩 오류: {e}")
+            _mux(vs.encode())
+            if fifo.samples:
+                _mux(aus.encode(fifo.read()))
+            _mux(aus.encode())
+        finally:
+            container.close()
+
+    def _drain(self) -> None:
+        while self._q.get() is not None:
+            pass
+
+    def stop(self) -> None:
+        """큐를 비우고 파일을 마무리 (인코딩 잔량만큼 대기)"""
+        if self._thread is None:
+            return
+        self._q.put(None)
+        self._thread.join()
+        self._thread = None
+        log.info(f"녹화 종료: {self.path} (프레임 {self.frames}, 드롭 {self.dropped})")
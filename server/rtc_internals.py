@@ -0,0 +1,78 @@
+"""
+LNDIVC aiortc/aioice 내부 상태 접근
+-----------------------------------
+공개 API 로 얻을 수 없는 값 — 수신 SSRC 별 RTP 통계, RTCP PLI 전송, 선택된 ICE 후보 쌍 —
+은 aiortc/aioice 의 비공개 속성에서 읽는다.  그런 접근을 모두 여기에 모으고, 확인된 버전
+범위(TESTED) 밖이면 한 번 경고한 뒤 빈 값을 돌려준다.  내부 구조가 바뀐 버전에서는
+키프레임 요청·손실 통계·경로 감시만 꺼지고 서버는 그대로 동작한다.
+"""
+
+import logging
+
+import aioice
+import aiortc
+
+log = logging.getLogger(__name__)
+
+# 패키지 → (최소 버전 포함, 최대 버전 미포함) — 이 범위에서 아래 비공개 속성을 확인함
+TESTED = {
+    'aiortc': ((1, 9), (1, 16)),
+    'aioice': ((0, 10, 2), (0, 10, 3)),   # ice_config 포트 범위 바인딩이 0.10.2 구현을 따름
+}
+_VERSIONS = {'aiortc': aiortc.__version__, 'aioice': aioice.__version__}
+_warned: "set[str]" = set()
+
+
+def _parse(version: str) -> "tuple[int, ...]":
+    out = []
+    for part in version.split('.'):
+        digits = ''.join(c for c in part if c.isdigit())
+        if not digits:
+            break
+        out.append(int(digits))
+    return tuple(out)
+
+
+def supported(package: str) -> bool:
+    """package 설치 버전이 TESTED 범위 안인지 (범위 밖이면 처음 한 번 경고)"""
+    lo, hi = TESTED[package]
+    version = _VERSIONS[package]
+    if lo <= _parse(version) < hi:
+        return True
+    if package not in _warned:
+        _warned.add(package)
+        log.warning(f"{package} {version} 은 확인되지 않은 버전입니다 "
+                    f"(확인: {'.'.join(map(str, lo))} ~ {'.'.join(map(str, hi))} 미만) "
+                    f"— 내부 상태를 쓰는 기능을 끕니다")
+    return False
+
+
+def remote_streams(receiver) -> dict:
+    """RTCRtpReceiver 의 수신 SSRC → aiortc StreamStatistics (packets_received, max_seq …)"""
+    if not supported('aiortc'):
+        return {}
+    return getattr(receiver, '_RTCRtpReceiver__remote_streams', None) or {}
+
+
+async def send_pli(receiver) -> int:
+    """수신 중인 모든 SSRC 에 RTCP PLI 전송. 보낸 수 반환"""
+    sent = 0
+    for ssrc in list(remote_streams(receiver)):
+        await receiver._send_rtcp_pli(ssrc)
+        sent += 1
+    return sent
+
+
+def nominated_pair(pc):
+    """RTCPeerConnection 에서 선택된 ICE 후보 쌍 (aioice CandidatePair, 컴포넌트 1) 또는 None"""
+    if not supported('aiortc') or not supported('aioice'):
+        return None
+    for tr in pc.getTransceivers():
+        try:
+            conn = tr.receiver.transport.transport.iceGatherer._connection
+            pair = conn._nominated.get(1)
+        except AttributeError:
+            continue
+        if pair is not None:
+            return pair
+    return None
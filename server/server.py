@@ -4,16 +4,20 @@ LNDIVC - Vision Pro → Windows Virtual Webcam Server
 Vision Pro Safari에서 WebRTC로 연결하면:
   - 비디오(페르소나/전면 카메라) → OBS Virtual Camera
   - 오디오(마이크) → 기본 스피커 또는 VB-Audio Virtual Cable
+(출력 대상은 config.json 의 video_sink / audio_sink 로 변경 가능 — sinks.py 참고)
 
 실행: python server.py
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
-import socket
-import ssl
+import multiprocessing
 import sys
+import threading
+import time
 from pathlib import Path
 
 # ── 경로 설정 (PyInstaller frozen / 일반 Python 공통) ──────────────────
@@ -28,22 +32,28 @@ else:
 import av
 import cv2
 import numpy as np
-from aiohttp import web
-from aiortc import RTCIceCandidate, RTCPeerConnection, RTCSessionDescription
-
-try:
-    import pyvirtualcam
-    HAVE_VIRTUALCAM = True
-except Exception:
-    pyvirtualcam = None
-    HAVE_VIRTUALCAM = False
-
-try:
-    import sounddevice as sd
-    HAVE_AUDIO = True
-except Exception:
-    sd = None
-    HAVE_AUDIO = False
+from aiohttp import WSCloseCode, web
+from aiortc import RTCPeerConnection
+
+import pipeline
+import sinks
+import status_bus
+from autoframe import AutoFramer
+from cert_manager import CertManager, cert_ips
+from effects import BackgroundEffect
+from session_capture import SessionRecorder, new_session_path
+from recorder import StreamRecorder, new_recording_path
+from frame_ring import DEFAULT_NAME as RING_NAME, FrameRingWriter
+import ice_config
+import listeners
+import netinfo
+import qr_cache
+from ice_config import IcePolicy
+from net_path import PathMonitor
+from signaling import SetupTimeline, SignalingSession, install_certificate_cache
+from standby import StandbyFeeder
+from static_assets import StaticAssets
+from tls import HandshakeStats, make_server_context
 
 # ── 설정 ──────────────────────────────────────────────────────────────
 VIDEO_WIDTH = 1280
@@ -51,27 +61,47 @@ VIDEO_HEIGHT = 720
 VIDEO_FPS = 30
 AUDIO_SAMPLE_RATE = 48000
 AUDIO_CHANNELS = 1
-PORT = 8443
+PORT = listeners.DEFAULT_PORT   # 기본 포트 (config 'port' 가 우선)
+SHUTDOWN_TIMEOUT = 3.0   # 서버 중지 전체 마감 시간 (초, config 'shutdown_timeout')
+SESSION_DRAIN    = 1.0   # 세션 종료 시 수신 태스크가 스스로 끝나길 기다리는 시간 (초)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)s  %(message)s")
 log = logging.getLogger(__name__)
 
 # ── 전역 상태 (단일 클라이언트 가정) ──────────────────────────────────
-g_cam: pyvirtualcam.Camera | None = None
-g_audio_out: sd.OutputStream | None = None
-g_audio_buf: asyncio.Queue = asyncio.Queue(maxsize=20)
-g_status_cb: "callable | None" = None   # GUI 상태 콜백 (tray_app 등이 주입)
+g_cam: "sinks.VideoSink | None" = None
+g_cam_lock = threading.Lock()             # 라이브 싱크 스테이지와 대기 화면 송출 직렬화
+g_standby: "StandbyFeeder | None" = None  # 세션이 없을 때 대기 화면 송출
+g_audio_out: "sinks.AudioSink | None" = None
+g_ring: "FrameRingWriter | None" = None    # 로컬 소비자용 공유 메모리 프레임 링
+g_audio_buf: asyncio.Queue = asyncio.Queue(maxsize=20)   # run_server 마다 새로 만듦 (루프에 묶임)
+g_status_cb: "callable | None" = None   # 상태 콜백 (임베딩용 — 트레이는 g_status_bus 를 소비)
+g_status_bus = status_bus.bus            # GUI 상태 이벤트 (연결 상태, 오류)
+g_config: dict = {}                      # run_server 시작 시 로드한 config.json
+g_recorder: "StreamRecorder | None" = None   # MP4 녹화 (트레이 메뉴에서 제어)
+_rec_lock = threading.Lock()
+g_pipelines: "dict[str, tuple[pipeline.Pipeline, dict]]" = {}   # 실행 중인 세션 파이프라인
+g_sessions: "dict[str, SignalingSession]" = {}                   # 연결된 시그널링 세션
+g_tls_stats = HandshakeStats()                                   # TLS 핸드셰이크 측정
+g_assets: "StaticAssets | None" = None                           # 메모리에 올린 static/
+g_certs: "CertManager | None" = None                             # TLS 인증서 만료 추적/갱신
+g_paths: "PathMonitor | None" = None                             # 세션 연결 경로 (DERP 감지)
+g_net: "netinfo.NetworkWatcher | None" = None                    # 주소 구성 변화 감시
+g_ice: "IcePolicy | None" = None                                 # ICE 후보 수집 정책 (ice_config.py)
+g_port: int = PORT                                               # 실제 리스닝 포트
+g_listen: "list[str]" = []                                       # 리스닝 주소 (host:port)
+g_last_shutdown: "dict | None" = None                            # 직전 서버 종료 단계별 소요 (ms)
 
 
 # ── 오디오 큐를 소비해 sounddevice에 전달 ─────────────────────────────
-async def audio_writer():
-    """별도 태스크: 오디오 큐 → sounddevice 출력"""
-    loop = asyncio.get_event_loop()
+async def audio_writer(pool: "concurrent.futures.Executor | None" = None):
+    """별도 태스크: 오디오 큐 → sounddevice 출력 (블로킹 write 는 pool, 없으면 기본 executor)"""
+    loop = asyncio.get_running_loop()
     while True:
         chunk = await g_audio_buf.get()
         if g_audio_out is not None:
             try:
-                await loop.run_in_executor(None, g_audio_out.write, chunk)
+                await loop.run_in_executor(pool, g_audio_out.write, chunk)
             except Exception as e:
                 log.warning(f"오디오 출력 오류: {e}")
 
@@ -88,39 +118,188 @@ def _crop_to_fill(img: np.ndarray, target_w: int, target_h: int) -> np.ndarray:
     return resized[y_off:y_off + target_h, x_off:x_off + target_w]
 
 
-# ── WebRTC 트랙 수신 ──────────────────────────────────────────────────
-async def receive_video(track):
-    log.info("비디오 트랙 수신 시작")
-    while True:
-        try:
-            frame: av.VideoFrame = await track.recv()
-            img = frame.to_ndarray(format="rgb24")
+def _pts_us(frame) -> int:
+    """프레임 PTS → 마이크로초 (없으면 0)"""
+    if frame.pts is None or not frame.time_base:
+        return 0
+    return int(frame.pts * frame.time_base * 1_000_000)
+
+
+# ── 비디오 파이프라인 ────────────────────────────────────────────────
+# recv(루프, aiortc 가 내부 스레드에서 디코딩) → convert → scale → [effects] → sink
+# 스테이지 배치: 이름 → (affinity, 입력 큐 크기, 정책).  config 'pipeline' 로 덮어쓰기:
+#   "pipeline": {"scale": {"affinity": "process", "queue": 2, "policy": "drop-oldest"}}
+VIDEO_STAGES = {
+    'convert': ('thread', 2, pipeline.DROP_OLDEST),
+    'scale':   ('thread', 2, pipeline.DROP_OLDEST),
+    'effects': ('thread', 1, pipeline.DROP_OLDEST),   # config 'background_effect' 일 때만
+    'sink':    ('thread', 1, pipeline.DROP_OLDEST),
+}
+# av.VideoFrame 이나 전역 싱크를 다루므로 별도 프로세스로 보낼 수 없는 스테이지
+_NO_PROCESS = ('convert', 'sink')
+
+
+class _VideoItem:
+    """비디오 파이프라인을 흐르는 프레임 1장"""
+    __slots__ = ('frame', 'img', 'pts_us', 't_recv_ns', 't_cap_ns')
+
+    def __init__(self, frame, t_cap_ns: int = 0):
+        self.frame     = frame
+        self.img       = None
+        self.pts_us    = _pts_us(frame)
+        self.t_recv_ns = time.monotonic_ns()
+        self.t_cap_ns  = t_cap_ns
+
+
+def _scale_stage(item: _VideoItem) -> _VideoItem:
+    # 해상도가 다르면 종횡비 유지하며 크롭 (얼굴이 크게 채워지도록)
+    h, w = item.img.shape[:2]
+    if w != VIDEO_WIDTH or h != VIDEO_HEIGHT:
+        item.img = _crop_to_fill(item.img, VIDEO_WIDTH, VIDEO_HEIGHT)
+    return item
+
+
+def _sink_stage(item: _VideoItem, meter: dict,
+                timeline: "SetupTimeline | None" = None) -> None:
+    img = item.img
+    # 로컬 소비자(레코더, 얼굴 추적 등)에게 게시 — 리더를 기다리지 않음
+    if g_ring is not None:
+        g_ring.write(img, item.pts_us)
+
+    rec = g_recorder
+    if rec is not None:
+        rec.add_video(img)   # 큐가 가득 차면 녹화 프레임만 드롭
+
+    if g_cam is not None:
+        with g_cam_lock:
+            g_cam.send(img, item.pts_us)
+        if g_standby is not None:
+            g_standby.mark_live()
+    meter['frames_out'] += 1
+    if timeline is not None and meter['frames_out'] == 1:
+        timeline.mark('first_frame_out')
+    lat = (time.monotonic_ns() - item.t_recv_ns) / 1e6
+    meter['latency_ms'] = lat if not meter['latency_ms'] else \
+        0.9 * meter['latency_ms'] + 0.1 * lat
+    if g_cam is not None:
+        g_cam.sleep_until_next_frame()
+
+
+def _build_video_pipeline(track, capture: "SessionRecorder | None", meter: dict,
+                          timeline: "SetupTimeline | None" = None) -> pipeline.Pipeline:
+    async def _recv():
+        frame = await track.recv()
+        return _VideoItem(frame, capture.now_ns() if capture is not None else 0)
+
+    def _convert(item: _VideoItem) -> _VideoItem:
+        item.img = item.frame.to_ndarray(format="rgb24")
+        item.frame = None
+        if timeline is not None:
+            timeline.mark('first_frame_decoded')
+        if capture is not None:
+            capture.add_video(item.t_cap_ns, item.img, item.pts_us)
+        return item
+
+    fns = {
+        'convert': _convert,
+        'scale':   _scale_stage,
+        'sink':    functools.partial(_sink_stage, meter=meter, timeline=timeline),
+    }
+    no_process = set(_NO_PROCESS)
+    p = pipeline.Pipeline('video').source('recv', _recv)
+
+    # 자동 프레이밍 (config 'autoframe': true) — 중앙 크롭 대신 얼굴 추적 크롭
+    if g_config.get('autoframe'):
+        framer = AutoFramer(
+            VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS,
+            detect_every=g_config.get('autoframe_every', 5),
+            zoom=g_config.get('autoframe_zoom', 1.2),
+            model=g_config.get('autoframe_model'),
+        )
 
-            # 해상도가 다르면 종횡비 유지하며 크롭 (얼굴이 크게 채워지도록)
-            h, w = img.shape[:2]
-            if w != VIDEO_WIDTH or h != VIDEO_HEIGHT:
-                img = _crop_to_fill(img, VIDEO_WIDTH, VIDEO_HEIGHT)
+        def _autoframe(item: _VideoItem) -> _VideoItem:
+            item.img = framer.crop(item.img)
+            return item
+        fns['scale'] = _autoframe
+        no_process.add('scale')   # 추적 상태를 유지해야 하므로 프로세스 분리 불가
+        meter['autoframe'] = framer.stats
+        p.on_stop(framer.close)
+
+    # 배경 효과 (config 'background_effect': "blur" | "replace")
+    if g_config.get('background_effect'):
+        image = g_config.get('background_image')
+        effect = BackgroundEffect(
+            VIDEO_FPS,
+            mode=g_config['background_effect'],
+            image=DATA_DIR / image if image else None,
+            model=g_config.get('background_model'),
+            seg_every=g_config.get('background_every', 3),
+            budget_ms=g_config.get('background_budget_ms'),
+        )
+        # 캡처가 켜져 있으면 img 가 캡처 큐와 공유될 수 있으므로 제자리 합성 금지
+        inplace = capture is None
+
+        def _effects(item: _VideoItem) -> _VideoItem:
+            item.img = effect.apply(item.img, inplace)
+            return item
+        fns['effects'] = _effects
+        no_process.add('effects')
+        meter['effects'] = effect.stats
+        p.on_stop(effect.close)
+
+    overrides = g_config.get('pipeline', {})
+    for name, (affinity, queue, policy) in VIDEO_STAGES.items():
+        if name not in fns:
+            continue
+        o = overrides.get(name, {})
+        affinity = o.get('affinity', affinity)
+        if affinity == 'process' and name in no_process:
+            log.warning(f"'{name}' 스테이지는 process 로 실행할 수 없음 → thread")
+            affinity = 'thread'
+        p.add(name, fns[name], affinity,
+              queue=o.get('queue', queue), policy=o.get('policy', policy))
+    return p
 
-            if g_cam is not None:
-                g_cam.send(img)
-                g_cam.sleep_until_next_frame()
-        except Exception as e:
-            log.info(f"비디오 트랙 종료: {e}")
-            break
+
+# ── WebRTC 트랙 수신 ──────────────────────────────────────────────────
+async def receive_video(track, capture: "SessionRecorder | None" = None,
+                        timeline: "SetupTimeline | None" = None):
+    log.info("비디오 트랙 수신 시작")
+    meter = {'frames_out': 0, 'latency_ms': 0.0}
+    p = _build_video_pipeline(track, capture, meter, timeline)
+    key = f"video-{id(p):x}"
+    g_pipelines[key] = (p, meter)
+    try:
+        await p.run()
+    finally:
+        g_pipelines.pop(key, None)
+        log.info("비디오 트랙 종료")
 
 
-async def receive_audio(track):
+async def receive_audio(track, capture: "SessionRecorder | None" = None):
     log.info("오디오 트랙 수신 시작")
     while True:
         try:
             frame: av.AudioFrame = await track.recv()
+            t_ns = capture.now_ns() if capture is not None else 0
             # Opus → s16 PCM 변환
             pcm = frame.to_ndarray()  # shape: (channels, samples) float32 or int16
+            if capture is not None:
+                capture.add_audio(t_ns, pcm, _pts_us(frame), frame.sample_rate,
+                                  frame.format.name, frame.layout.name)
             if pcm.dtype != np.int16:
                 pcm = np.clip(pcm, -1.0, 1.0)
                 pcm = (pcm * 32767).astype(np.int16)
             # sounddevice는 (samples, channels) 형태를 기대
-            chunk = pcm.T.reshape(-1, AUDIO_CHANNELS).copy()
+            # aiortc Opus 디코더 출력은 packed 스테레오 (1, samples×2) → 채널 분리 후 다운믹스
+            n_ch = len(frame.layout.channels)
+            pcm  = pcm.reshape(-1, n_ch) if frame.format.is_packed else pcm.T
+            if n_ch != AUDIO_CHANNELS:
+                pcm = pcm.mean(axis=1, keepdims=True, dtype=np.int32).astype(np.int16)
+            chunk = np.ascontiguousarray(pcm)
+            rec = g_recorder
+            if rec is not None:
+                rec.add_audio(chunk)
             try:
                 g_audio_buf.put_nowait(chunk)
             except asyncio.QueueFull:
@@ -130,9 +309,82 @@ async def receive_audio(track):
             break
 
 
+# ── 녹화 제어 (트레이 등 임의 스레드에서 호출 가능) ─────────────────
+def start_recording() -> Path:
+    """MP4 녹화 시작. 이미 녹화 중이면 현재 파일 경로 반환"""
+    global g_recorder
+    with _rec_lock:
+        if g_recorder is None:
+            g_recorder = StreamRecorder(
+                new_recording_path(DATA_DIR / 'recordings'),
+                VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS,
+                AUDIO_SAMPLE_RATE, AUDIO_CHANNELS,
+            ).start()
+        return g_recorder.path
+
+
+def stop_recording() -> "Path | None":
+    """녹화 중지 후 저장된 파일 경로 반환 (녹화 중이 아니면 None). 인코딩 잔량만큼 대기"""
+    global g_recorder
+    with _rec_lock:
+        rec, g_recorder = g_recorder, None
+    if rec is None:
+        return None
+    rec.stop()
+    return rec.path
+
+
+def is_recording() -> bool:
+    return g_recorder is not None
+
+
+# ── 서버 → 클라이언트 제어 (이벤트 루프에서 호출) ─────────────────────
+async def send_control(action: str, **params) -> int:
+    """연결된 v2 클라이언트 모두에 제어 메시지 전송 ('quality', 'stats'). 보낸 수 반환"""
+    sent = 0
+    for session in list(g_sessions.values()):
+        try:
+            sent += await session.control(action, **params)
+        except Exception as e:
+            log.warning(f"제어 메시지 전송 실패: {e}")
+    return sent
+
+
+async def request_keyframe() -> int:
+    """모든 세션의 비디오 송신자에게 키프레임 요청 (RTCP PLI)"""
+    sent = 0
+    for session in list(g_sessions.values()):
+        sent += await session.request_keyframe()
+    return sent
+
+
+# ── 통계 ──────────────────────────────────────────────────────────────
+def get_stats() -> dict:
+    """프로세스 내 통계 스냅샷 (스테이지별 처리 시간, 큐 깊이, 드롭 수 등)"""
+    return {
+        'pipelines': {
+            key: {**{k: v() if callable(v) else v for k, v in meter.items()},
+                  'stages': p.stats()}
+            for key, (p, meter) in list(g_pipelines.items())
+        },
+        'sessions':    {sid: sess.stats() for sid, sess in list(g_sessions.items())},
+        'tls':         g_tls_stats.stats(),
+        'static':      g_assets.stats() if g_assets is not None else None,
+        'cert':        g_certs.stats() if g_certs is not None else None,
+        'path':        g_paths.stats() if g_paths is not None else None,
+        'ice':         g_ice.stats() if g_ice is not None else None,
+        'listen':      {'addresses': g_listen, **listeners.pool.stats()},
+        'network':     g_net.stats() if g_net is not None else None,
+        'audio_queue': g_audio_buf.qsize(),
+        'recording':   is_recording(),
+        'standby':     g_standby.active if g_standby is not None else False,
+        'shutdown':    g_last_shutdown,
+    }
+
+
 # ── HTTP 라우터 ───────────────────────────────────────────────────────
-async def handle_index(request):
-    return web.FileResponse(BUNDLE_DIR / "static" / "index.html")
+async def handle_stats(request):
+    return web.json_response(get_stats())
 
 
 async def handle_ws(request):
@@ -140,61 +392,112 @@ async def handle_ws(request):
     ws = web.WebSocketResponse()
     await ws.prepare(request)
     log.info(f"클라이언트 연결: {request.remote}")
-
-    pc = RTCPeerConnection()
+    if g_standby is not None:
+        g_standby.set_status('connecting')
+
+    # 소켓이 열리자마자 피어 연결을 만들어 둔다 (DTLS 인증서는 캐시 — install_certificate_cache)
+    # host 후보는 시그널링 상대와 같은 서브넷의 인터페이스로 정리 (ice_config.py)
+    ice_config.set_peer(request.remote)
+    pc = RTCPeerConnection(g_ice.configuration() if g_ice is not None else None)
+    session = SignalingSession(ws, pc, g_config.get('signaling_ping', 5.0), remote=request.remote)
+    timeline = session.timeline
+
+    # 세션 캡처 (config 'capture': true) — 오프라인 성능 재현용
+    capture = None
+    if g_config.get('capture'):
+        capture = SessionRecorder(
+            new_session_path(DATA_DIR / 'captures'),
+            codec=g_config.get('capture_codec', 'jpeg'),
+            quality=g_config.get('capture_quality', 90),
+        ).start()
+
+    # 트랙 수신 태스크는 세션의 TaskGroup 에 묶는다 — 세션이 끝나면 함께 끝남
+    tg = asyncio.TaskGroup()
+    tasks: "list[asyncio.Task]" = []
 
     @pc.on("track")
     def on_track(track):
+        timeline.mark(f"track_{track.kind}")
         if track.kind == "video":
-            asyncio.ensure_future(receive_video(track))
+            coro = receive_video(track, capture, timeline)
         elif track.kind == "audio":
-            asyncio.ensure_future(receive_audio(track))
+            coro = receive_audio(track, capture)
+        else:
+            return
+        try:
+            tasks.append(tg.create_task(coro, name=f"{session.id}.{track.kind}"))
+        except RuntimeError:   # 세션 정리 중 늦게 도착한 트랙
+            coro.close()
+
+    @pc.on("iceconnectionstatechange")
+    def on_ice_state():
+        timeline.mark(f"ice_{pc.iceConnectionState}")
+        if pc.iceConnectionState == "completed":
+            ice = session.ice_stats()
+            log.info(f"ICE 완료: 후보 수집 {ice['gather_ms']} ms, 연결 검사 {ice['check_ms']} ms "
+                     f"(로컬 후보 {ice['local_candidates']}개)")
 
     @pc.on("connectionstatechange")
-    async def on_state():
+    def on_state():
         log.info(f"WebRTC 상태: {pc.connectionState}")
+        timeline.mark(f"pc_{pc.connectionState}")
+        g_status_bus.publish(status_bus.STATE, pc.connectionState)
         if g_status_cb:
             g_status_cb(pc.connectionState)
-        if pc.connectionState in ("failed", "closed", "disconnected"):
-            await pc.close()
+        if pc.connectionState == "connected" and g_paths is not None:
+            g_paths.poke()   # 선택된 ICE 쌍으로 경로 확인 → 필요하면 저대역 프로필
+        if pc.connectionState in ("failed", "disconnected"):
+            try:
+                tg.create_task(pc.close(), name=f"{session.id}.close")
+            except RuntimeError:
+                pass   # 세션 정리 중 — finally 에서 닫음
 
-    async for msg in ws:
-        if msg.type == web.WSMsgType.TEXT:
+    g_sessions[session.id] = session
+    try:
+        async with tg:
             try:
-                data = json.loads(msg.data)
-                msg_type = data.get("type")
-
-                if msg_type == "offer":
-                    await pc.setRemoteDescription(
-                        RTCSessionDescription(sdp=data["sdp"], type=data["type"])
-                    )
-                    answer = await pc.createAnswer()
-                    await pc.setLocalDescription(answer)
-                    await ws.send_json(
-                        {"type": answer.type, "sdp": pc.localDescription.sdp}
-                    )
-                    log.info("Answer 전송 완료")
-
-                elif msg_type == "ice":
-                    cand = data.get("candidate", {})
-                    raw = cand.get("candidate", "")
-                    if raw:
-                        # RTCIceCandidate 파싱
-                        ice = RTCIceCandidate(
-                            sdpMid=cand.get("sdpMid"),
-                            sdpMLineIndex=cand.get("sdpMLineIndex"),
-                            candidate=raw,
-                        )
-                        await pc.addIceCandidate(ice)
+                async for msg in ws:
+                    if msg.type in (web.WSMsgType.TEXT, web.WSMsgType.BINARY):
+                        try:
+                            await session.handle(msg)
+                        except Exception as e:
+                            log.error(f"시그널링 오류: {e}")
+                    elif msg.type == web.WSMsgType.ERROR:
+                        log.error(f"WebSocket 오류: {ws.exception()}")
+            finally:
+                session.close()
+                g_sessions.pop(session.id, None)
+                log.info("클라이언트 연결 종료")
+                # 피어 연결을 닫으면 트랙이 끝나 수신 태스크가 스스로 종료한다.
+                # 싱크 쓰기 등에서 멈춘 태스크는 SESSION_DRAIN 후 취소 (TaskGroup 이 대기)
+                await pc.close()
+                if tasks:
+                    _, pending = await asyncio.wait(tasks, timeout=SESSION_DRAIN)
+                    for t in pending:
+                        log.warning(f"수신 태스크 강제 취소: {t.get_name()}")
+                        t.cancel()
+    except* Exception as eg:
+        for e in eg.exceptions:
+            log.error(f"세션 태스크 오류: {e!r}")
+    finally:
+        if g_standby is not None:
+            g_standby.set_status('waiting')
+        if capture is not None:
+            await asyncio.get_running_loop().run_in_executor(None, capture.close)
+    return ws
 
-            except Exception as e:
-                log.error(f"시그널링 오류: {e}")
-        elif msg.type == web.WSMsgType.ERROR:
-            log.error(f"WebSocket 오류: {ws.exception()}")
 
-    log.info("클라이언트 연결 종료")
-    await pc.close()
-    return ws
+async def _close_sessions(app) -> None:
+    """aiohttp on_shutdown 훅 — 열린 WebSocket 을 병렬로 닫아 각 세션이 스스로 정리하게 함"""
+    sessions = list(g_sessions.values())
+    if not sessions:
+        return
+    closes = [asyncio.ensure_future(s.ws.close(code=WSCloseCode.GOING_AWAY,
+                                               message=b'server shutdown'))
+              for s in sessions]
+    _, pending = await asyncio.wait(closes, timeout=app['shutdown_timeout'] / 2)
+    for f in pending:
+        f.cancel()
 
 
 # ── 메인 ─────────────────────────────────────────────────────────────
@@ -209,8 +512,26 @@ def _load_config() -> dict:
     return {'mode': 'self_signed', 'hostname': '', 'port': PORT}
 
 
+def _on_network_change(cfg: dict, listen: "list[tuple[str, bool]]", cert: Path) -> None:
+    """주소가 바뀌면 대기 화면 URL 갱신, 자체 서명 인증서가 새 주소를 포함하지 않으면 경고"""
+    url = listeners.access_url(cfg, listen)
+    if g_standby is not None and g_standby.url != url:
+        qr_cache.warm(url)
+        g_standby.url = url
+        log.info(f"접속 주소 변경: {url}")
+    if cfg.get('mode') != 'tailscale':
+        try:
+            missing = {netinfo.primary_ip()} - cert_ips(cert)
+        except Exception:
+            return
+        if missing:
+            log.warning(f"cert.pem 이 새 주소 {', '.join(missing)} 를 포함하지 않습니다 — "
+                        f"설정 마법사로 인증서를 다시 만드세요")
+
+
 async def run_server(stop_event: "asyncio.Event | None" = None,
-                     on_status: "callable | None" = None):
+                     on_status: "callable | None" = None,
+                     on_ready: "callable | None" = None):
     # SSL 설정
     cert = DATA_DIR / "cert.pem"
     key  = DATA_DIR / "key.pem"
@@ -219,86 +540,102 @@ async def run_server(stop_event: "asyncio.Event | None" = None,
         print("  먼저 setup.bat 을 실행하세요.\n")
         return
 
-    ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-    ssl_ctx.load_cert_chain(cert, key)
-
-    # VB-Audio Virtual Cable 찾기 (없으면 기본 장치)
-    vbcable_idx = None
-    if HAVE_AUDIO:
-        for i, dev in enumerate(sd.query_devices()):
-            if "CABLE Input" in dev["name"] and dev["max_output_channels"] > 0:
-                vbcable_idx = i
-                log.info(f"VB-Audio CABLE Input 발견: index={i}")
-                break
-        if vbcable_idx is None:
-            log.warning("VB-Audio CABLE Input 없음 → 기본 스피커 출력 (Zoom 마이크 연동 불가)")
-    else:
-        log.warning("sounddevice 없음 → 오디오 출력 비활성화")
+    # TLS 1.3 + 세션 재개 + AEAD 암호군 (tls.py)
+    ssl_ctx = make_server_context(cert, key, stats=g_tls_stats)
 
-    # aiohttp 앱
-    app = web.Application()
-    app.router.add_get("/", handle_index)
+    cfg = _load_config()
+
+    # aiohttp 앱 — static/ 은 메모리에 올려 압축·ETag 와 함께 서빙 (static_assets.py)
+    global g_assets
+    g_assets = StaticAssets(BUNDLE_DIR / "static", cfg.get('service_worker', True))
+    app = web.Application(middlewares=[g_tls_stats.middleware])
+    # 종료 마감: 절반은 WebSocket 닫기(on_shutdown), 절반은 핸들러(피어 연결·수신 태스크) 정리
+    app['shutdown_timeout'] = float(cfg.get('shutdown_timeout', SHUTDOWN_TIMEOUT))
+    app.on_shutdown.append(_close_sessions)
+    g_assets.routes(app)
     app.router.add_get("/ws", handle_ws)
+    app.router.add_get("/stats", handle_stats)
 
-    # 접속 URL 결정 (Tailscale vs 로컬 IP)
-    cfg = _load_config()
+    # 리스닝 주소·포트 (config 'listen', 'port' — listeners.py)
+    global g_cam, g_audio_out, g_ring, g_status_cb, g_config, g_standby, g_certs, g_paths, g_ice
+    global g_audio_buf, g_port, g_listen, g_net
+    g_port = int(cfg.get('port', PORT))
+    listen = listeners.listen_addresses(cfg)
+
+    access_url = listeners.access_url(cfg, listen)
     if cfg.get('mode') == 'tailscale' and cfg.get('hostname'):
-        access_url = f"https://{cfg['hostname']}:{PORT}"
-        url_note   = "(Tailscale - 인증서 신뢰 불필요)"
+        url_note = "(Tailscale - 인증서 신뢰 불필요)"
     else:
-        local_ip   = socket.gethostbyname(socket.gethostname())
-        access_url = f"https://{local_ip}:{PORT}"
-        url_note   = "(자체 서명 - Vision Pro에서 cert.pem 신뢰 필요)"
+        url_note = "(자체 서명 - Vision Pro에서 cert.pem 신뢰 필요)"
 
-    global g_cam, g_audio_out, g_status_cb
+    g_config = cfg
+    g_audio_buf = asyncio.Queue(maxsize=20)   # 이전 실행의 루프에 묶인 큐를 재사용하지 않음
     if on_status is not None:
         g_status_cb = on_status
     if stop_event is None:
         stop_event = asyncio.Event()
 
-    # 가상 카메라 초기화 (OBS Virtual Camera 전용)
-    cam_ctx = None
-    if HAVE_VIRTUALCAM:
+    # 비디오 싱크 초기화 (기본: OBS Virtual Camera)
+    cam_ctx = sinks.make_video_sink(cfg, DATA_DIR, VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS)
+    if cam_ctx is not None:
         try:
-            cam_ctx = pyvirtualcam.Camera(
-                width=VIDEO_WIDTH, height=VIDEO_HEIGHT,
-                fps=VIDEO_FPS, print_fps=False, backend='obs',
-            )
             g_cam = cam_ctx.__enter__()
-            log.info(f"가상 카메라 활성화: {g_cam.device} (backend=obs)")
+            log.info(f"비디오 싱크 활성화: {g_cam.device}")
         except Exception as e:
-            log.warning(f"OBS Virtual Camera 초기화 실패: {e}")
-            log.warning("OBS를 설치하고 '도구 → 가상 카메라 시작'을 먼저 실행하세요.")
+            if isinstance(cam_ctx, sinks.VirtualCamSink):
+                log.warning(f"OBS Virtual Camera 초기화 실패: {e}")
+                log.warning("OBS를 설치하고 '도구 → 가상 카메라 시작'을 먼저 실행하세요.")
+            else:
+                log.warning(f"비디오 싱크 초기화 실패: {e}")
+            g_status_bus.publish(status_bus.ERROR, f"비디오 싱크 초기화 실패: {e}")
             cam_ctx = None
-    else:
-        log.warning("pyvirtualcam 없음 → 비디오 출력 비활성화")
 
-    # 오디오 출력 초기화
-    audio_ctx = None
-    if HAVE_AUDIO:
+    # 대기 화면 (config 'standby', 기본: 가상 카메라일 때만) — 회의 앱이 카메라를 놓지 않도록
+    if g_cam is not None and cfg.get('standby', isinstance(g_cam, sinks.VirtualCamSink)):
+        g_standby = StandbyFeeder(g_cam, g_cam_lock, access_url,
+                                  fps=cfg.get('standby_fps', 5)).start()
+
+    # 공유 메모리 프레임 링 (config 'frame_ring': true, shm 싱크 사용 시 중복 게시 안 함)
+    ring_ctx = None
+    if cfg.get('frame_ring') and not isinstance(g_cam, sinks.ShmVideoSink):
+        ring_ctx = FrameRingWriter(cfg.get('frame_ring_name', RING_NAME),
+                                   VIDEO_WIDTH, VIDEO_HEIGHT)
+        try:
+            g_ring = ring_ctx.__enter__()
+            log.info(f"프레임 링 게시: {ring_ctx.name}")
+        except Exception as e:
+            log.warning(f"프레임 링 초기화 실패: {e}")
+            ring_ctx = None
+
+    # 오디오 싱크 초기화 (기본: VB-Audio CABLE Input → 기본 스피커)
+    audio_ctx = sinks.make_audio_sink(cfg, DATA_DIR, AUDIO_SAMPLE_RATE, AUDIO_CHANNELS)
+    if audio_ctx is not None:
         try:
-            audio_ctx = sd.OutputStream(
-                samplerate=AUDIO_SAMPLE_RATE,
-                channels=AUDIO_CHANNELS,
-                dtype="int16",
-                blocksize=2048,
-                device=vbcable_idx,
-            )
             g_audio_out = audio_ctx.__enter__()
         except Exception as e:
             log.warning(f"오디오 출력 초기화 실패: {e}")
+            g_status_bus.publish(status_bus.ERROR, f"오디오 출력 초기화 실패: {e}")
             audio_ctx = None
 
+    install_certificate_cache()
+    g_ice = IcePolicy.from_config(cfg).install()
+    timings: dict = {}
+    audio_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio-out')
+
     try:
-        runner = web.AppRunner(app)
+        runner = web.AppRunner(app, shutdown_timeout=app['shutdown_timeout'] / 2)
         await runner.setup()
-        site = web.TCPSite(runner, "0.0.0.0", PORT, ssl_context=ssl_ctx)
-        await site.start()
+        # fast_restart: 리스닝 소켓을 재시작 사이에 유지 (close_listeners 전까지)
+        socks = listeners.pool.acquire(listen, g_port, keep=bool(cfg.get('fast_restart')))
+        g_listen = []
+        for sock in socks:
+            await web.SockSite(runner, sock, ssl_context=ssl_ctx).start()
+            host, port = sock.getsockname()[:2]
+            g_listen.append(f"[{host}]:{port}" if ':' in host else f"{host}:{port}")
+        log.info(f"리스닝: {', '.join(g_listen)}")
 
         cam_label = g_cam.device if g_cam else "비활성 (OBS 필요)"
-        audio_label = "VB-Audio CABLE Input" if vbcable_idx is not None else (
-            "기본 스피커" if HAVE_AUDIO and g_audio_out else "비활성"
-        )
+        audio_label = g_audio_out.device if g_audio_out else "비활성"
 
         print(f"\n{'='*55}")
         print(f"  LNDIVC 서버 실행 중")
@@ -308,7 +645,7 @@ async def run_server(stop_event: "asyncio.Event | None" = None,
         print(f"  가상 카메라: {cam_label}")
         print(f"  오디오 출력: {audio_label}")
         print(f"{'='*55}")
-        if g_cam is not None:
+        if isinstance(g_cam, sinks.VirtualCamSink):
             print()
             print("  [Zoom/Teams 등 다른 앱에서 사용하려면]")
             print("  1. OBS에서 '비디오 캡처 장치' 소스 추가")
@@ -317,21 +654,118 @@ async def run_server(stop_event: "asyncio.Event | None" = None,
             print("  3. 다른 앱에서 'OBS Virtual Camera' 선택")
         print()
 
+        # 인증서 만료 추적 — tailscale 모드면 만료 전 자동 갱신, 파일이 바뀌면 핫 리로드
+        g_certs = CertManager(
+            ssl_ctx, cert, key,
+            hostname=cfg.get('hostname') if cfg.get('mode') == 'tailscale' else None,
+            renew_days=cfg.get('cert_renew_days', 30),
+            check_interval=cfg.get('cert_check_hours', 12) * 3600,
+        ).start()
+
+        # 주소 구성 변화 감시 — 대기 화면 URL 갱신, ICE 후보 주소 캐시 갱신 (netinfo.py)
+        g_net = netinfo.NetworkWatcher(
+            on_change=lambda _: _on_network_change(cfg, listen, cert)).start()
+        _on_network_change(cfg, listen, cert)   # 시작 시에도 인증서 SAN 확인 (DHCP 주소 변경 등)
+
+        # 연결 경로 감시 — Tailscale DERP 릴레이면 저대역 프로필로 전환 (net_path.py)
+        g_paths = PathMonitor(
+            g_sessions, cfg.get('relay_mode', 'auto'), cfg.get('relay_profile'),
+            on_change=lambda path: g_status_bus.publish(status_bus.PATH, path),
+        ).start()
+
         # 오디오 큐 소비 태스크 시작
-        audio_task = asyncio.ensure_future(audio_writer())
+        audio_task = asyncio.ensure_future(audio_writer(audio_pool))
+        qr_cache.warm(access_url)   # 대기 화면·트레이 QR 창용 QR 을 미리 만들어 둠
+        if on_ready is not None:
+            on_ready()
         try:
             await stop_event.wait()   # GUI stop_event 또는 Ctrl+C 대기
         finally:
-            audio_task.cancel()
-            await runner.cleanup()
+            await _shutdown(runner, audio_task, audio_pool, timings)
     finally:
+        t0 = time.perf_counter()
+        if g_standby is not None:
+            g_standby.stop()
+            g_standby = None
         if cam_ctx is not None:
             cam_ctx.__exit__(None, None, None)
+            g_cam = None
+        if ring_ctx is not None:
+            g_ring = None
+            ring_ctx.__exit__(None, None, None)
         if audio_ctx is not None:
             audio_ctx.__exit__(None, None, None)
+            g_audio_out = None
+        audio_pool.shutdown(wait=False, cancel_futures=True)
+        timings['sinks_ms'] = (time.perf_counter() - t0) * 1000
+        _finish_shutdown(timings)
+
+
+async def _shutdown(runner: web.AppRunner, audio_task: asyncio.Task,
+                    audio_pool: concurrent.futures.ThreadPoolExecutor, timings: dict) -> None:
+    """
+    서버 중지 순서 (각 단계 소요를 timings 에 ms 로 기록):
+      1) 리스너 닫기 → WebSocket 병렬 닫기 → 세션 핸들러(피어 연결·수신 태스크) 정리
+         — runner.cleanup, 마감 shutdown_timeout
+      2) 오디오 태스크 취소, 출력 스레드에서 진행 중인 write 완료 대기 (남은 시간 안에서)
+      3) 인증서 관리 태스크 중지, 녹화 마무리
+    싱크 닫기는 run_server 의 finally 가 이어서 수행한다.
+    """
+    loop = asyncio.get_running_loop()
+    timings['t0'] = time.perf_counter()
+    deadline = loop.time() + float(g_config.get('shutdown_timeout', SHUTDOWN_TIMEOUT))
+
+    def _mark(key: str, t: float) -> float:
+        now = time.perf_counter()
+        timings[key] = (now - t) * 1000
+        return now
+
+    t = timings['t0']
+    try:
+        await runner.cleanup()
+    except Exception as e:
+        log.warning(f"HTTP 서버 정리 오류: {e}")
+    t = _mark('sessions_ms', t)
+
+    audio_task.cancel()
+    await asyncio.wait([audio_task])
+    drain = loop.run_in_executor(None, functools.partial(audio_pool.shutdown, wait=True,
+                                                         cancel_futures=True))
+    try:
+        await asyncio.wait_for(drain, max(0.1, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        log.warning("오디오 출력 스레드가 마감 안에 끝나지 않음 — 싱크를 그대로 닫습니다")
+    t = _mark('audio_ms', t)
+
+    if g_certs is not None:
+        await g_certs.stop()
+    if g_paths is not None:
+        await g_paths.stop()
+    if g_net is not None:
+        await g_net.stop()
+    await loop.run_in_executor(None, stop_recording)
+    _mark('recording_ms', t)
+
+
+def close_listeners() -> None:
+    """fast_restart 로 유지 중인 리스닝 소켓을 닫음 (재시작이 아니라 서버를 멈출 때)"""
+    listeners.pool.close()
+
+
+def _finish_shutdown(timings: dict) -> None:
+    global g_last_shutdown
+    t0 = timings.pop('t0', None)
+    if t0 is not None:
+        timings['total_ms'] = (time.perf_counter() - t0) * 1000
+    g_last_shutdown = {k: round(v, 1) for k, v in timings.items()}
+    log.info("서버 종료 완료 (" + ", ".join(f"{k[:-3]} {v:.0f}ms"
+                                        for k, v in g_last_shutdown.items()) + ")")
 
 
 def main():
+    # ProcessPoolExecutor(pipeline 'process' 스테이지) 자식이 PyInstaller exe 를 다시 실행할 때
+    # 서버를 또 띄우지 않고 워커로 동작하도록 (비동결 실행에서는 아무 일도 안 함)
+    multiprocessing.freeze_support()
     if '--setup' in sys.argv:
         # 설정 마법사 실행 (LNDIVC.exe --setup)
         from setup_wizard import main as setup_main
@@ -0,0 +1,284 @@
+"""
+LNDIVC 세션 캡처 / 재생
+-----------------------
+수신한 디코딩 프레임을 도착 시각과 함께 .lndrec 컨테이너에 기록하고,
+기록을 원래 타이밍(또는 최대 속도)으로 receive_video / receive_audio 에 다시
+흘려 보내 실제 Vision Pro 트래픽 기반의 재현 가능한 성능/회귀 테스트를 만든다.
+
+캡처 켜기 (config.json):
+    "capture": true                  → DATA_DIR/captures/session-*.lndrec
+    "capture_codec": "jpeg" | "raw"   (기본 jpeg, 품질 "capture_quality": 90)
+
+재생:
+    python session_capture.py captures/session-....lndrec [--fast] [--sink null]
+
+.lndrec 형식 (리틀 엔디언):
+    파일 헤더 : b'LNDREC' | version u16
+    레코드    : kind u8 | t_ns u64 (세션 시작 기준 도착 시각) | pts_us i64 | size u32
+                + kind 별 메타 + payload
+      video   : width u16 | height u16 | codec u8 (0 raw rgb24, 1 jpeg)
+      audio   : rate u32 | format 8s | layout 16s | dtype 4s | rows u16 | cols u32
+                (payload = AudioFrame.to_ndarray() 원본)
+"""
+
+import argparse
+import asyncio
+import datetime
+import fractions
+import logging
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+MAGIC   = b'LNDREC'
+VERSION = 1
+
+KIND_VIDEO = 1
+KIND_AUDIO = 2
+
+CODEC_RAW  = 0
+CODEC_JPEG = 1
+
+_FILE_HDR  = struct.Struct('<6sH')
+_REC_HDR   = struct.Struct('<BQqI')
+_VIDEO_HDR = struct.Struct('<HHB')
+_AUDIO_HDR = struct.Struct('<I8s16s4sHI')
+
+
+class SessionRecorder:
+    """
+    세션 캡처 작성기.  add_video / add_audio 는 큐에 참조만 넣고 즉시 반환하며,
+    인코딩과 파일 쓰기는 전용 스레드가 맡는다.  큐가 가득 차면 캡처 프레임을 드롭.
+    """
+
+    def __init__(self, path: Path, codec: str = 'jpeg', quality: int = 90,
+                 max_queue: int = 120):
+        self.path    = Path(path)
+        self.codec   = CODEC_JPEG if codec == 'jpeg' else CODEC_RAW
+        self.quality = quality
+        self.dropped = 0
+        self.written = 0
+        self._q: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._t0     = time.monotonic_ns()
+        self._thread: "threading.Thread | None" = None
+
+    def start(self) -> "SessionRecorder":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, 'wb')
+        self._fh.write(_FILE_HDR.pack(MAGIC, VERSION))
+        self._t0 = time.monotonic_ns()
+        self._thread = threading.Thread(target=self._run, name='capture', daemon=True)
+        self._thread.start()
+        log.info(f"세션 캡처 시작: {self.path}")
+        return self
+
+    def now_ns(self) -> int:
+        return time.monotonic_ns() - self._t0
+
+    def _put(self, item) -> None:
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def add_video(self, t_ns: int, img: np.ndarray, pts_us: int = 0) -> None:
+        """디코딩된 rgb24 프레임 (호출 후 img 를 수정하지 않아야 함)"""
+        self._put((KIND_VIDEO, t_ns, pts_us, img, None))
+
+    def add_audio(self, t_ns: int, pcm: np.ndarray, pts_us: int,
+                  rate: int, fmt: str, layout: str) -> None:
+        """AudioFrame.to_ndarray() 결과 그대로 + 재구성용 메타"""
+        self._put((KIND_AUDIO, t_ns, pts_us, pcm, (rate, fmt, layout)))
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+                self.written += 1
+            except Exception as e:
+                log.warning(f"캡처 기록 오류: {e}")
+
+    def _write(self, kind: int, t_ns: int, pts_us: int, arr: np.ndarray, meta) -> None:
+        if kind == KIND_VIDEO:
+            h, w = arr.shape[:2]
+            if self.codec == CODEC_JPEG:
+                ok, enc = cv2.imencode('.jpg', cv2.cvtColor(arr, cv2.COLOR_RGB2BGR),
+                                       [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+                if not ok:
+                    return
+                payload = enc.tobytes()
+            else:
+                payload = np.ascontiguousarray(arr).tobytes()
+            sub = _VIDEO_HDR.pack(w, h, self.codec)
+        else:
+            rate, fmt, layout = meta
+            rows, cols = arr.shape if arr.ndim == 2 else (1, arr.shape[0])
+            sub = _AUDIO_HDR.pack(rate, fmt.encode('ascii'), layout.encode('ascii'),
+                                  arr.dtype.str.encode('ascii'), rows, cols)
+            payload = np.ascontiguousarray(arr).tobytes()
+        self._fh.write(_REC_HDR.pack(kind, t_ns, pts_us, len(payload)))
+        self._fh.write(sub)
+        self._fh.write(payload)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._q.put(None)
+        self._thread.join()
+        self._thread = None
+        self._fh.close()
+        log.info(f"세션 캡처 종료: {self.path} (기록 {self.written}, 드롭 {self.dropped})")
+
+
+def new_session_path(capture_dir: Path) -> Path:
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return Path(capture_dir) / f"session-{stamp}.lndrec"
+
+
+# ── 읽기 ──────────────────────────────────────────────────────────────
+def read_records(path: Path, kind: "int | None" = None):
+    """(kind, t_ns, pts_us, meta, payload) 순회. kind 지정 시 해당 종류만 (나머지는 건너뜀)"""
+    with open(path, 'rb') as fh:
+        magic, version = _FILE_HDR.unpack(fh.read(_FILE_HDR.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"지원하지 않는 캡처 파일: {path}")
+        while True:
+            hdr = fh.read(_REC_HDR.size)
+            if len(hdr) < _REC_HDR.size:
+                return
+            k, t_ns, pts_us, size = _REC_HDR.unpack(hdr)
+            sub = _VIDEO_HDR if k == KIND_VIDEO else _AUDIO_HDR
+            meta = sub.unpack(fh.read(sub.size))
+            if kind is not None and k != kind:
+                fh.seek(size, 1)
+                continue
+            yield k, t_ns, pts_us, meta, fh.read(size)
+
+
+def _decode_video(meta, payload: bytes) -> np.ndarray:
+    w, h, codec = meta
+    if codec == CODEC_JPEG:
+        bgr = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_COLOR)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    return np.frombuffer(payload, np.uint8).reshape(h, w, 3)
+
+
+def _decode_audio(meta, payload: bytes):
+    rate, fmt, layout, dtype, rows, cols = meta
+    pcm = np.frombuffer(payload, np.dtype(dtype.rstrip(b'\0').decode('ascii')))
+    return (rate, fmt.rstrip(b'\0').decode('ascii'),
+            layout.rstrip(b'\0').decode('ascii'), pcm.reshape(rows, cols))
+
+
+# ── 재생 ──────────────────────────────────────────────────────────────
+class ReplayTrack:
+    """
+    aiortc MediaStreamTrack 과 같은 recv() 인터페이스로 기록을 재생.
+    realtime=True 면 기록된 도착 시각을 따르고, False 면 최대 속도로 내보낸다.
+    """
+
+    def __init__(self, path: Path, kind: str, t0: float, realtime: bool = True):
+        self.kind     = kind
+        self.realtime = realtime
+        self._t0      = t0
+        self._it      = read_records(path, KIND_VIDEO if kind == 'video' else KIND_AUDIO)
+        self.count    = 0
+
+    async def recv(self):
+        import av
+        from aiortc.mediastreams import MediaStreamError
+        try:
+            _, t_ns, pts_us, meta, payload = next(self._it)
+        except StopIteration:
+            raise MediaStreamError('재생 종료')
+        if self.realtime:
+            delay = self._t0 + t_ns / 1e9 - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+        self.count += 1
+        if self.kind == 'video':
+            frame = av.VideoFrame.from_ndarray(_decode_video(meta, payload), format='rgb24')
+        else:
+            rate, fmt, layout, pcm = _decode_audio(meta, payload)
+            frame = av.AudioFrame.from_ndarray(pcm, format=fmt, layout=layout)
+            frame.sample_rate = rate
+        frame.pts       = pts_us
+        frame.time_base = fractions.Fraction(1, 1_000_000)
+        return frame
+
+
+async def replay(path: Path, realtime: bool = True) -> dict:
+    """기록을 server.receive_video / receive_audio 파이프라인에 다시 흘려보낸다"""
+    import server as srv
+    t0 = time.monotonic()
+    video = ReplayTrack(path, 'video', t0, realtime)
+    audio = ReplayTrack(path, 'audio', t0, realtime)
+    await asyncio.gather(srv.receive_video(video), srv.receive_audio(audio))
+    elapsed = time.monotonic() - t0
+    return {
+        'video_frames': video.count,
+        'audio_frames': audio.count,
+        'elapsed_s':    round(elapsed, 3),
+        'video_fps':    round(video.count / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+async def _replay_main(args) -> None:
+    import pipeline
+    import server as srv
+    import sinks
+    cfg = srv._load_config()
+    if args.sink:
+        cfg['video_sink'] = args.sink
+        cfg['audio_sink'] = 'null' if args.sink == 'shm' else args.sink
+    if args.fast:
+        # 최대 속도 재생은 큐가 가득 차기 마련 — 드롭 정책이면 실행마다 결과가 달라지므로
+        # 모든 스테이지 입력을 block 으로, 오디오 큐는 무제한으로 (실시간 재생은 config 그대로)
+        overrides = cfg.get('pipeline', {})
+        cfg['pipeline'] = {name: {**overrides.get(name, {}), 'policy': pipeline.BLOCK}
+                           for name in srv.VIDEO_STAGES}
+        srv.g_audio_buf = asyncio.Queue()
+    srv.g_config = cfg   # autoframe / effects / pipeline 설정을 서버와 같게
+    cam_ctx   = sinks.make_video_sink(cfg, srv.DATA_DIR, srv.VIDEO_WIDTH,
+                                      srv.VIDEO_HEIGHT, srv.VIDEO_FPS)
+    audio_ctx = sinks.make_audio_sink(cfg, srv.DATA_DIR, srv.AUDIO_SAMPLE_RATE,
+                                      srv.AUDIO_CHANNELS)
+    srv.g_cam       = cam_ctx.__enter__() if cam_ctx else None
+    srv.g_audio_out = audio_ctx.__enter__() if audio_ctx else None
+    writer = asyncio.ensure_future(srv.audio_writer())
+    try:
+        stats = await replay(Path(args.path), realtime=not args.fast)
+    finally:
+        writer.cancel()
+        if cam_ctx:
+            cam_ctx.__exit__(None, None, None)
+        if audio_ctx:
+            audio_ctx.__exit__(None, None, None)
+    print()
+    for k, v in stats.items():
+        print(f"  {k:14s} {v}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description='LNDIVC 세션 캡처 재생')
+    ap.add_argument('path', help='.lndrec 파일')
+    ap.add_argument('--fast', action='store_true', help='원래 타이밍 무시, 최대 속도 (큐 드롭 없음 — 결정적)')
+    ap.add_argument('--sink', choices=('null', 'file', 'shm'),
+                    help='config 의 싱크 대신 사용할 싱크')
+    asyncio.run(_replay_main(ap.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
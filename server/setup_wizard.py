@@ -7,7 +7,9 @@ LNDIVC Setup Wizard
     python setup_wizard.py
 """
 
+import asyncio
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -15,6 +17,8 @@ from pathlib import Path
 # CREATE_NO_WINDOW: 콘솔 창 없이 subprocess 실행 (Windows 전용)
 _CF = 0x08000000 if sys.platform == 'win32' else 0
 
+TAILSCALE_CERT_TIMEOUT = 90   # `tailscale cert` 최대 대기 (초, ACME 발급 포함)
+
 
 def _base_dir() -> Path:
     """실행 파일 기준 디렉터리 (frozen/non-frozen 공통)"""
@@ -23,6 +27,11 @@ def _base_dir() -> Path:
     return Path(__file__).parent
 
 
+def _hostname_from_status(data: dict) -> "str | None":
+    dns = data.get('Self', {}).get('DNSName', '')
+    return dns.rstrip('.') if dns else None
+
+
 def get_tailscale_hostname() -> "str | None":
     """Tailscale 설치 및 연결 여부 확인, 호스트명 반환"""
     try:
@@ -32,15 +41,21 @@ def get_tailscale_hostname() -> "str | None":
             creationflags=_CF,
         )
         if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            dns = data.get('Self', {}).get('DNSName', '')
-            return dns.rstrip('.') if dns else None
+            return _hostname_from_status(json.loads(result.stdout))
     except (FileNotFoundError, subprocess.TimeoutExpired, json.JSONDecodeError,
             KeyError, UnicodeDecodeError):
         pass
     return None
 
 
+def tailscale_cert_cmd(hostname: str, cert_path: Path, key_path: Path) -> "list[str]":
+    """`tailscale cert` 명령줄 (setup 과 cert_manager 자동 갱신 공용)"""
+    return ['tailscale', 'cert',
+            '--cert-file', str(cert_path),
+            '--key-file',  str(key_path),
+            hostname]
+
+
 def setup_tailscale(hostname: str, base_dir: Path) -> bool:
     """Tailscale HTTPS 인증서 발급 (Let's Encrypt 기반, 브라우저 자동 신뢰)"""
     cert_path = base_dir / 'cert.pem'
@@ -49,14 +64,15 @@ def setup_tailscale(hostname: str, base_dir: Path) -> bool:
     print(f"\n  Tailscale 호스트명: {hostname}")
     print("  인증서 발급 중... (약 10초 소요)")
 
-    result = subprocess.run(
-        ['tailscale', 'cert',
-         '--cert-file', str(cert_path),
-         '--key-file',  str(key_path),
-         hostname],
-        capture_output=True, text=True, encoding='utf-8',
-        creationflags=_CF,
-    )
+    try:
+        result = subprocess.run(
+            tailscale_cert_cmd(hostname, cert_path, key_path),
+            capture_output=True, text=True, encoding='utf-8',
+            timeout=TAILSCALE_CERT_TIMEOUT, creationflags=_CF,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        print(f"\n[오류] 인증서 발급 실패: {e}")
+        return False
 
     if result.returncode != 0:
         print(f"\n[오류] 인증서 발급 실패:")
@@ -73,19 +89,129 @@ def setup_tailscale(hostname: str, base_dir: Path) -> bool:
     return True
 
 
-def setup_self_signed(base_dir: Path) -> bool:
-    """자체 서명 인증서 생성"""
+def setup_self_signed(base_dir: Path, key_type: "str | None" = None) -> bool:
+    """자체 서명 인증서 생성 (key_type 미지정 시 config.json 'cert_key', 기본 rsa)"""
     try:
         from generate_cert import generate
-        generate(base_dir)
+        if key_type is None:
+            try:
+                cfg = json.loads((base_dir / 'config.json').read_text(encoding='utf-8'))
+                key_type = cfg.get('cert_key', 'rsa')
+            except Exception:
+                key_type = 'rsa'
+        generate(base_dir, key_type)
         return True
     except Exception as e:
         print(f"[오류] 인증서 생성 실패: {e}")
         return False
 
 
+# ── 비동기 버전 (GUI — task_runner 에서 실행, 취소/시간 제한/진행 표시) ────────
+async def _run_streamed(cmd: "list[str]", progress) -> "tuple[int, list[str]]":
+    """subprocess 실행, stdout/stderr 를 줄 단위로 progress 에 전달. 취소되면 프로세스 종료"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        creationflags=_CF,
+    )
+    lines = []
+    try:
+        async for raw in proc.stdout:
+            line = raw.decode('utf-8', 'replace').strip()
+            if line:
+                lines.append(line)
+                progress(line)
+        return await proc.wait(), lines
+    finally:
+        if proc.returncode is None:   # 취소 / 시간 초과
+            proc.kill()
+            await proc.wait()
+
+
+async def tailscale_status_async(timeout: float = 5) -> "dict | None":
+    """`tailscale status --json` 결과 (설치 안 됨 / 실패 / 시간 초과면 None)"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            'tailscale', 'status', '--json',
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            creationflags=_CF,
+        )
+    except FileNotFoundError:
+        return None
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0 or not out:
+        return None
+    try:
+        return json.loads(out.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+async def get_tailscale_hostname_async(progress=None, timeout: float = 5) -> "str | None":
+    """
+    get_tailscale_hostname 의 비동기 버전.  progress: TaskRunner 진행 콜백 (직접 호출 시
+    생략) — 실행하는 명령과 조회 결과를 알린다.
+    """
+    if progress is not None:
+        progress("tailscale status --json")
+    status = await tailscale_status_async(timeout)
+    host = _hostname_from_status(status) if status is not None else None
+    if progress is not None:
+        progress(f"tailscale: {host or '-'}")
+    return host
+
+
+async def setup_tailscale_async(progress, hostname: str, base_dir: Path) -> bool:
+    """
+    setup_tailscale 의 비동기 버전.  임시 파일에 받은 뒤 교체하므로 중간에 취소되어도
+    기존 cert.pem / key.pem 은 그대로 남는다 (시간 제한은 호출 측 TaskRunner timeout).
+    """
+    cert_path = base_dir / 'cert.pem'
+    key_path  = base_dir / 'key.pem'
+    new_cert  = base_dir / 'cert.pem.new'
+    new_key   = base_dir / 'key.pem.new'
+    progress(f"tailscale cert {hostname}")
+    try:
+        code, lines = await _run_streamed(
+            tailscale_cert_cmd(hostname, new_cert, new_key), progress)
+        if code != 0:
+            progress(lines[-1] if lines else f"exit {code}")
+            return False
+        os.replace(new_key, key_path)
+        os.replace(new_cert, cert_path)
+        return True
+    except FileNotFoundError as e:
+        progress(str(e))
+        return False
+    finally:
+        for p in (new_cert, new_key):
+            p.unlink(missing_ok=True)
+
+
+async def setup_self_signed_async(progress, base_dir: Path,
+                                  key_type: "str | None" = None) -> bool:
+    """setup_self_signed 를 executor 스레드에서 실행 (RSA 키 생성이 수 초 걸릴 수 있음)"""
+    progress(f"generate_cert ({key_type or 'config'})")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, setup_self_signed, base_dir, key_type)
+
+
+def _load_config(base_dir: Path) -> dict:
+    try:
+        return json.loads((base_dir / 'config.json').read_text(encoding='utf-8'))
+    except Exception:
+        return {}
+
+
 def save_config(mode: str, hostname: str, base_dir: Path) -> None:
-    config = {'mode': mode, 'hostname': hostname, 'port': 8443}
+    """인증서 방식 저장 — 기존 설정(port, listen, lang 등)은 유지"""
+    config = _load_config(base_dir)
+    config.update({'mode': mode, 'hostname': hostname})
+    config.setdefault('port', 8443)
     (base_dir / 'config.json').write_text(
         json.dumps(config, ensure_ascii=False, indent=2), encoding='utf-8'
     )
@@ -133,7 +259,7 @@ def main(base_dir: "Path | None" = None) -> None:
         print("  Vision Pro에서 인증서 신뢰 설정이 필요 없습니다.")
         print()
         print("  start.bat 실행 후 Vision Pro Safari에서:")
-        print(f"    https://{ts_hostname}:8443")
+        print(f"    https://{ts_hostname}:{_load_config(base_dir).get('port', 8443)}")
         print()
         print("  (Vision Pro에 Tailscale 앱이 설치되어 있어야 합니다)")
         print()
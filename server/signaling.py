@@ -0,0 +1,320 @@
+"""
+LNDIVC 시그널링 프로토콜
+------------------------
+/ws WebSocket 위의 메시지 처리.  기존 클라이언트(v1)와 호환되며, hello 를 보내는
+클라이언트와는 v2 로 동작한다.
+
+v1 (hello 없음):
+    C→S  {"type": "offer", "sdp"}            S→C  {"type": "answer", "sdp"}
+    C→S  {"type": "ice", "candidate": {...}}  (후보 1개씩)
+
+v2 (C→S hello 후 — 클라이언트는 welcome 을 기다리지 않고 offer 를 바로 이어 보낸다):
+    C→S  {"type": "hello", "v": 2, "features": [...]}
+    S→C  {"type": "welcome", "v": 2, "session", "features", "ping_interval"}
+    C→S  {"type": "candidates", "candidates": [{...}, ...], "done": bool}
+         (여러 후보를 한 메시지로, done=true 는 end-of-candidates)
+    S→C  {"type": "control", "action": "quality" | "stats", ...}   서버 주도 제어
+         quality: max_bitrate / max_framerate / scale_down (비디오), audio_priority —
+                  null 은 제한 해제, 생략은 그대로
+    C→S  {"type": "stats", "report": {...}}                          stats 요청 응답
+    양방향 binary  opcode u8 | t_us u64   — 1 ping / 2 pong (같은 t_us 를 되돌림)
+
+offer 보다 먼저 도착한 후보는 remote description 이 설정될 때까지 보관했다가 적용한다.
+키프레임 요청은 브라우저에 JS API 가 없으므로 서버가 RTCP PLI 로 직접 보낸다.
+
+연결 설정 타임라인: 서버는 WebSocket 수락 시각 기준으로 각 단계를 기록하고,
+클라이언트는 연결 완료 후 {"type": "timeline", "marks": {...}, "net": {...}} 를 보낸다
+(marks 는 Start 탭 기준 ms, net 은 페이지 로드 TLS/연결 시간과 WSS 연결 시간).  두 타임라인은 ws_open 을 기준으로 맞춰 /stats 의 sessions.*.setup 에 합쳐진다.
+ICE 후보 수집·연결 검사 시간은 sessions.*.ice 에 따로 요약한다 (ice_config.py).
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import secrets
+import struct
+import time
+
+from aiohttp import web
+import aiortc.rtcpeerconnection
+from aiortc import RTCIceCandidate, RTCSessionDescription
+from aiortc.rtcdtlstransport import RTCCertificate
+from aiortc.sdp import candidate_from_sdp
+
+import rtc_internals
+
+log = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 2
+FEATURES = ('candidates', 'end-of-candidates', 'ping', 'control', 'binary')
+
+OP_PING = 1
+OP_PONG = 2
+_PING = struct.Struct('<BQ')
+
+
+class _CachedCertificate(RTCCertificate):
+    """
+    서버 수명 동안 DTLS 인증서 1개를 재사용.  aiortc 는 RTCPeerConnection 마다 새 ECDSA 키와
+    인증서를 만들고 offer/answer 마다 fingerprint 를 다시 계산하는데, 둘 다 연결 설정 경로에
+    있으므로 캐시해 둔다.  만료 하루 전에 새로 만든다.
+    """
+
+    _cached: "RTCCertificate | None" = None
+
+    @classmethod
+    def generateCertificate(cls):
+        cert = cls._cached
+        now  = datetime.datetime.now(tz=datetime.timezone.utc)
+        if cert is None or cert.expires - now < datetime.timedelta(days=1):
+            cert = cls._cached = super().generateCertificate()
+        return cert
+
+    def getFingerprints(self):
+        fps = getattr(self, '_fingerprints', None)
+        if fps is None:
+            fps = self._fingerprints = super().getFingerprints()
+        return fps
+
+
+def install_certificate_cache() -> None:
+    """이후 생성되는 RTCPeerConnection 이 캐시된 DTLS 인증서를 쓰도록 설정하고 미리 만들어 둔다"""
+    aiortc.rtcpeerconnection.RTCCertificate = _CachedCertificate
+    _CachedCertificate.generateCertificate().getFingerprints()
+
+
+class SetupTimeline:
+    """연결 설정 단계별 시각 (WebSocket 수락 기준 ms). 같은 단계는 처음 한 번만 기록"""
+
+    def __init__(self):
+        self._t0    = time.monotonic_ns()
+        self.marks  = {'ws_open': 0.0}
+        self.client: "dict | None" = None   # 클라이언트 보고 (Start 탭 기준 ms)
+        self.net:    "dict | None" = None   # 클라이언트 측 연결/TLS 시간 (Navigation Timing)
+
+    def mark(self, name: str) -> None:
+        if name not in self.marks:
+            self.marks[name] = round((time.monotonic_ns() - self._t0) / 1e6, 1)
+
+    def to_dict(self) -> dict:
+        out = {'server': dict(self.marks)}
+        if self.net:
+            out['net'] = self.net
+        if self.client:
+            out['client'] = self.client
+            # 서버 시각을 클라이언트 ws_open 에 맞춰 하나의 타임라인으로 병합
+            off = self.client.get('ws_open')
+            if off is not None:
+                merged = [(v, 'client', k) for k, v in self.client.items()] + \
+                         [(round(off + v, 1), 'server', k) for k, v in self.marks.items()]
+                out['merged'] = [{'t_ms': t, 'side': side, 'phase': k}
+                                 for t, side, k in sorted(merged)]
+                if 'first_frame_out' in self.marks:
+                    out['total_ms'] = round(off + self.marks['first_frame_out'], 1)
+        return out
+
+
+def parse_candidate(c: dict) -> "RTCIceCandidate | None":
+    """브라우저 RTCIceCandidate.toJSON() → aiortc 후보. 빈 문자열(end-of-candidates)은 None"""
+    raw = (c or {}).get('candidate', '')
+    if not raw:
+        return None
+    ice = candidate_from_sdp(raw.split(':', 1)[1] if raw.startswith('candidate:') else raw)
+    ice.sdpMid        = c.get('sdpMid')
+    ice.sdpMLineIndex = c.get('sdpMLineIndex')
+    return ice
+
+
+class SignalingSession:
+    """WebSocket 1개 ↔ RTCPeerConnection 1개 사이의 시그널링 상태"""
+
+    def __init__(self, ws: web.WebSocketResponse, pc, ping_interval: float = 5.0,
+                 remote: "str | None" = None):
+        self.ws            = ws
+        self.pc            = pc
+        self.remote        = remote   # WebSocket 원격 주소 (ICE 쌍이 없을 때 경로 판단용)
+        self.id            = secrets.token_hex(4)
+        self.version       = 1
+        self.ping_interval = ping_interval
+        self.rtt_ms: "float | None" = None
+        self.candidates    = 0        # 적용한 원격 후보 수
+        self.messages      = 0
+        self.client_stats: "dict | None" = None
+        self.timeline      = SetupTimeline()
+        self._pending: "list[RTCIceCandidate | None]" = []
+        self._ping_task: "asyncio.Task | None" = None
+        self._handlers = {
+            'hello':      self._on_hello,
+            'offer':      self._on_offer,
+            'ice':        self._on_ice,
+            'candidates': self._on_candidates,
+            'stats':      self._on_stats,
+            'timeline':   self._on_timeline,
+        }
+
+    # ── 송신 ─────────────────────────────────────────────────────────
+    async def send(self, msg: dict) -> None:
+        if not self.ws.closed:
+            await self.ws.send_str(json.dumps(msg, separators=(',', ':')))
+
+    async def control(self, action: str, **params) -> bool:
+        """서버 → 클라이언트 제어 메시지. v1 클라이언트면 False"""
+        if self.version < 2 or self.ws.closed:
+            return False
+        await self.send({'type': 'control', 'action': action, **params})
+        return True
+
+    async def request_keyframe(self) -> int:
+        """수신 중인 비디오 트랙에 RTCP PLI 전송. 보낸 수 반환"""
+        sent = 0
+        for tr in self.pc.getTransceivers():
+            rx = tr.receiver
+            if tr.kind != 'video' or rx.track is None:
+                continue
+            sent += await rtc_internals.send_pli(rx)
+        return sent
+
+    def rtp_stats(self) -> dict:
+        """수신 RTP 패킷 수 / 손실 수 (kind 별). aiortc 수신 통계를 직접 읽어 동기적으로 반환"""
+        out = {}
+        for tr in self.pc.getTransceivers():
+            for st in list(rtc_internals.remote_streams(tr.receiver).values()):
+                if st.max_seq is None:   # 아직 패킷 없음
+                    continue
+                d = out.setdefault(tr.kind, {'received': 0, 'lost': 0})
+                d['received'] += st.packets_received
+                d['lost']     += max(0, st.packets_lost)
+        return out
+
+    # ── 수신 ─────────────────────────────────────────────────────────
+    async def handle(self, msg) -> None:
+        """aiohttp WSMessage 1개 처리"""
+        self.messages += 1
+        if msg.type == web.WSMsgType.BINARY:
+            await self._on_binary(msg.data)
+            return
+        data = json.loads(msg.data)
+        handler = self._handlers.get(data.get('type'))
+        if handler is None:
+            log.debug(f"알 수 없는 시그널링 메시지: {data.get('type')}")
+            return
+        await handler(data)
+
+    async def _on_hello(self, data: dict) -> None:
+        self.timeline.mark('hello')
+        self.version = min(int(data.get('v', 1)), PROTOCOL_VERSION)
+        if self.version < 2:
+            return
+        await self.send({
+            'type': 'welcome', 'v': self.version, 'session': self.id,
+            'features': list(FEATURES), 'ping_interval': self.ping_interval,
+        })
+        if self.ping_interval and self._ping_task is None:
+            self._ping_task = asyncio.ensure_future(self._ping_loop())
+        log.info(f"시그널링 v{self.version} (세션 {self.id})")
+
+    async def _on_offer(self, data: dict) -> None:
+        self.timeline.mark('offer')
+        await self.pc.setRemoteDescription(RTCSessionDescription(sdp=data["sdp"], type="offer"))
+        answer = await self.pc.createAnswer()
+        self.timeline.mark('gather_start')
+        await self.pc.setLocalDescription(answer)   # aiortc: 후보 수집이 끝나야 반환
+        self.timeline.mark('gathered')
+        await self.send({"type": answer.type, "sdp": self.pc.localDescription.sdp})
+        self.timeline.mark('answer_sent')
+        log.info("Answer 전송 완료")
+        pending, self._pending = self._pending, []
+        for ice in pending:
+            await self._add(ice)
+
+    async def _on_ice(self, data: dict) -> None:
+        ice = parse_candidate(data.get("candidate"))
+        if ice is not None:   # v1 클라이언트의 빈 후보는 무시 (기존 동작 유지)
+            await self._add(ice)
+
+    async def _on_candidates(self, data: dict) -> None:
+        for c in data.get('candidates', []):
+            ice = parse_candidate(c)
+            if ice is not None:
+                await self._add(ice)
+        if data.get('done'):
+            await self._add(None)
+
+    async def _on_stats(self, data: dict) -> None:
+        self.client_stats = data.get('report')
+
+    async def _on_timeline(self, data: dict) -> None:
+        marks = data.get('marks') or {}
+        self.timeline.client = {str(k): round(float(v), 1) for k, v in marks.items()
+                                if isinstance(v, (int, float))}
+        net = data.get('net') or {}
+        self.timeline.net = {str(k): round(float(v), 1) for k, v in net.items()
+                             if isinstance(v, (int, float))}
+
+    async def _add(self, ice: "RTCIceCandidate | None") -> None:
+        if self.pc.remoteDescription is None:
+            self._pending.append(ice)   # offer 전에 도착 → 나중에 적용
+            return
+        await self.pc.addIceCandidate(ice)
+        if ice is not None:
+            self.candidates += 1
+
+    async def _on_binary(self, data: bytes) -> None:
+        if len(data) < _PING.size:
+            return
+        op, t_us = _PING.unpack_from(data)
+        if op == OP_PING:
+            # 수신 루프에서 바로 보냄 — 세션과 함께 끝나고 예외가 떠돌지 않음
+            try:
+                await self._send_binary(OP_PONG, t_us)
+            except (ConnectionError, RuntimeError):
+                pass
+        elif op == OP_PONG:
+            rtt = (time.monotonic_ns() // 1000 - t_us) / 1000
+            self.rtt_ms = rtt if self.rtt_ms is None else 0.8 * self.rtt_ms + 0.2 * rtt
+
+    async def _send_binary(self, op: int, t_us: int) -> None:
+        if not self.ws.closed:
+            await self.ws.send_bytes(_PING.pack(op, t_us))
+
+    async def _ping_loop(self) -> None:
+        try:
+            while not self.ws.closed:
+                await self._send_binary(OP_PING, time.monotonic_ns() // 1000)
+                await asyncio.sleep(self.ping_interval)
+        except (ConnectionError, RuntimeError):
+            pass
+
+    # ── 정리 / 통계 ──────────────────────────────────────────────────
+    def close(self) -> None:
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+
+    def stats(self) -> dict:
+        return {
+            'version':      self.version,
+            'rtt_ms':       round(self.rtt_ms, 2) if self.rtt_ms is not None else None,
+            'candidates':   self.candidates,
+            'messages':     self.messages,
+            'rtp':          self.rtp_stats(),
+            'client_stats': self.client_stats,
+            'setup':        self.timeline.to_dict(),
+            'ice':          self.ice_stats(),
+        }
+
+    def ice_stats(self) -> dict:
+        """후보 수집 시간, 연결 검사(checking → completed) 시간, 로컬 후보 수"""
+        m = self.timeline.marks
+
+        def span(a: str, b: str) -> "float | None":
+            return round(m[b] - m[a], 1) if a in m and b in m else None
+
+        desc = self.pc.localDescription
+        local = {line for line in (desc.sdp if desc else '').splitlines()
+                 if line.startswith('a=candidate:')}
+        return {'gather_ms': span('gather_start', 'gathered'),
+                'check_ms':  span('ice_checking', 'ice_completed'),
+                'local_candidates': len(local),
+                'remote_candidates': self.candidates}
@@ -0,0 +1,360 @@
+"""
+LNDIVC 출력 싱크
+----------------
+비디오/오디오 출력 대상을 추상화.  config.json 으로 선택:
+
+    "video_sink": "virtualcam" | "shm" | "file" | "null"   (기본 virtualcam)
+    "audio_sink": "sounddevice" | "file" | "null"          (기본 sounddevice)
+    "video_file": "lndivc.y4m"   (.y4m → YUV4MPEG2, 그 외 → raw rgb24)
+    "audio_file": "lndivc.wav"
+    "shm_name":   "lndivc_frames"   (frame_ring.FrameRingReader 로 읽기)
+
+비디오 싱크는 pyvirtualcam.Camera, 오디오 싱크는 sounddevice.OutputStream 과
+같은 인터페이스(컨텍스트 매니저 + send/write)를 따르므로 server.py 는
+어떤 싱크가 선택되었는지 알 필요가 없다.
+"""
+
+import abc
+import logging
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from frame_ring import DEFAULT_NAME as RING_NAME, FrameRingWriter
+
+try:
+    import pyvirtualcam
+    HAVE_VIRTUALCAM = True
+except Exception:
+    pyvirtualcam = None
+    HAVE_VIRTUALCAM = False
+
+try:
+    import sounddevice as sd
+    HAVE_AUDIO = True
+except Exception:
+    sd = None
+    HAVE_AUDIO = False
+
+log = logging.getLogger(__name__)
+
+VIDEO_SINKS = ('virtualcam', 'shm', 'file', 'null')
+AUDIO_SINKS = ('sounddevice', 'file', 'null')
+
+
+# ── 비디오 싱크 ───────────────────────────────────────────────────────
+class VideoSink(abc.ABC):
+    """비디오 싱크 기본 클래스 (pyvirtualcam.Camera 호환 인터페이스)"""
+
+    pace = True   # False 면 sleep_until_next_frame 이 즉시 반환 (벤치마크용)
+
+    def __init__(self, width: int, height: int, fps: int):
+        self.width  = width
+        self.height = height
+        self.fps    = fps
+        self._next_t = 0.0
+
+    @property
+    def device(self) -> str:
+        return type(self).__name__
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        """img: RGB 프레임.  pts_us: 원본 프레임 PTS (µs) — 대기 화면처럼 없으면 None"""
+
+    def sleep_until_next_frame(self) -> None:
+        """fps 간격에 맞춰 대기 (pyvirtualcam 과 동일한 페이싱)"""
+        if not self.pace:
+            return
+        interval = 1.0 / self.fps
+        now = time.perf_counter()
+        if self._next_t <= now:
+            self._next_t = now + interval
+            return
+        time.sleep(self._next_t - now)
+        self._next_t += interval
+
+    def __enter__(self) -> "VideoSink":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class NullVideoSink(VideoSink):
+    """프레임을 버리는 싱크 (벤치마크 / 테스트용)"""
+
+    pace = False
+
+    def __init__(self, width: int, height: int, fps: int):
+        super().__init__(width, height, fps)
+        self.frames = 0
+
+    @property
+    def device(self) -> str:
+        return 'null'
+
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        self.frames += 1
+
+
+class FileVideoSink(VideoSink):
+    """프레임을 파일로 기록 (.y4m → YUV4MPEG2 I420, 그 외 → raw rgb24)"""
+
+    pace = False
+
+    def __init__(self, path: Path, width: int, height: int, fps: int):
+        super().__init__(width, height, fps)
+        self.path = Path(path)
+        self._y4m = self.path.suffix.lower() == '.y4m'
+        self._fh  = None
+
+    @property
+    def device(self) -> str:
+        return str(self.path)
+
+    def open(self) -> None:
+        self._fh = open(self.path, 'wb')
+        if self._y4m:
+            self._fh.write(
+                f"YUV4MPEG2 W{self.width} H{self.height} F{self.fps}:1 "
+                f"Ip A1:1 C420jpeg\n".encode('ascii')
+            )
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        if self._fh is None:
+            return
+        if self._y4m:
+            import cv2
+            self._fh.write(b"FRAME\n")
+            self._fh.write(cv2.cvtColor(img, cv2.COLOR_RGB2YUV_I420).tobytes())
+        else:
+            self._fh.write(np.ascontiguousarray(img).tobytes())
+
+
+class ShmVideoSink(VideoSink):
+    """공유 메모리 프레임 링 싱크 (frame_ring.py). 로컬 프로세스가 복사 없이 읽는다."""
+
+    pace = False
+
+    def __init__(self, name: str, width: int, height: int, fps: int):
+        super().__init__(width, height, fps)
+        self.name  = name
+        self._ring = FrameRingWriter(name, width, height)
+
+    @property
+    def device(self) -> str:
+        return f"shm:{self.name}"
+
+    def open(self) -> None:
+        self._ring.open()
+
+    def close(self) -> None:
+        self._ring.close()
+
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        self._ring.write(img, time.monotonic_ns() // 1000 if pts_us is None else pts_us)
+
+
+class VirtualCamSink(VideoSink):
+    """OBS Virtual Camera (pyvirtualcam backend='obs')"""
+
+    def __init__(self, width: int, height: int, fps: int):
+        super().__init__(width, height, fps)
+        self._cam = None
+
+    @property
+    def device(self) -> str:
+        return self._cam.device if self._cam is not None else 'obs'
+
+    def open(self) -> None:
+        if not HAVE_VIRTUALCAM:
+            raise RuntimeError("pyvirtualcam 없음")
+        self._cam = pyvirtualcam.Camera(
+            width=self.width, height=self.height,
+            fps=self.fps, print_fps=False, backend='obs',
+        )
+        self._cam.__enter__()
+
+    def close(self) -> None:
+        if self._cam is not None:
+            self._cam.__exit__(None, None, None)
+            self._cam = None
+
+    def send(self, img: np.ndarray, pts_us: "int | None" = None) -> None:
+        self._cam.send(img)
+
+    def sleep_until_next_frame(self) -> None:
+        self._cam.sleep_until_next_frame()
+
+
+# ── 오디오 싱크 ───────────────────────────────────────────────────────
+class AudioSink(abc.ABC):
+    """오디오 싱크 기본 클래스 (sounddevice.OutputStream 호환 인터페이스)"""
+
+    def __init__(self, samplerate: int, channels: int):
+        self.samplerate = samplerate
+        self.channels   = channels
+
+    @property
+    def device(self) -> str:
+        return type(self).__name__
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write(self, chunk: np.ndarray) -> None:
+        ...
+
+    def __enter__(self) -> "AudioSink":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class NullAudioSink(AudioSink):
+    """오디오를 버리는 싱크 (벤치마크 / 테스트용)"""
+
+    def __init__(self, samplerate: int, channels: int):
+        super().__init__(samplerate, channels)
+        self.samples = 0
+
+    @property
+    def device(self) -> str:
+        return 'null'
+
+    def write(self, chunk: np.ndarray) -> None:
+        self.samples += len(chunk)
+
+
+class WavFileSink(AudioSink):
+    """s16 PCM 을 WAV 파일로 기록"""
+
+    def __init__(self, path: Path, samplerate: int, channels: int):
+        super().__init__(samplerate, channels)
+        self.path = Path(path)
+        self._wav: "wave.Wave_write | None" = None
+
+    @property
+    def device(self) -> str:
+        return str(self.path)
+
+    def open(self) -> None:
+        self._wav = wave.open(str(self.path), 'wb')
+        self._wav.setnchannels(self.channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self.samplerate)
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def write(self, chunk: np.ndarray) -> None:
+        if self._wav is not None:
+            self._wav.writeframes(np.ascontiguousarray(chunk, dtype=np.int16).tobytes())
+
+
+def find_vbcable() -> "int | None":
+    """VB-Audio CABLE Input 장치 인덱스 (없으면 None)"""
+    if not HAVE_AUDIO:
+        return None
+    for i, dev in enumerate(sd.query_devices()):
+        if "CABLE Input" in dev["name"] and dev["max_output_channels"] > 0:
+            return i
+    return None
+
+
+class SoundDeviceSink(AudioSink):
+    """sounddevice 출력 (VB-Audio CABLE Input 우선, 없으면 기본 스피커)"""
+
+    def __init__(self, samplerate: int, channels: int):
+        super().__init__(samplerate, channels)
+        self._stream = None
+        self.vbcable_idx: "int | None" = None
+
+    @property
+    def device(self) -> str:
+        return "VB-Audio CABLE Input" if self.vbcable_idx is not None else "기본 스피커"
+
+    def open(self) -> None:
+        if not HAVE_AUDIO:
+            raise RuntimeError("sounddevice 없음")
+        self.vbcable_idx = find_vbcable()
+        if self.vbcable_idx is not None:
+            log.info(f"VB-Audio CABLE Input 발견: index={self.vbcable_idx}")
+        else:
+            log.warning("VB-Audio CABLE Input 없음 → 기본 스피커 출력 (Zoom 마이크 연동 불가)")
+        self._stream = sd.OutputStream(
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype="int16",
+            blocksize=2048,
+            device=self.vbcable_idx,
+        )
+        self._stream.__enter__()
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.__exit__(None, None, None)
+            self._stream = None
+
+    def write(self, chunk: np.ndarray) -> None:
+        self._stream.write(chunk)
+
+
+# ── 팩토리 ────────────────────────────────────────────────────────────
+def make_video_sink(cfg: dict, data_dir: Path,
+                    width: int, height: int, fps: int) -> "VideoSink | None":
+    """config 에 따라 비디오 싱크 생성 (열기 전 상태). 사용 불가하면 None"""
+    kind = cfg.get('video_sink', 'virtualcam')
+    if kind == 'null':
+        return NullVideoSink(width, height, fps)
+    if kind == 'file':
+        return FileVideoSink(data_dir / cfg.get('video_file', 'lndivc.y4m'),
+                             width, height, fps)
+    if kind == 'shm':
+        return ShmVideoSink(cfg.get('shm_name', RING_NAME), width, height, fps)
+    if kind != 'virtualcam':
+        log.warning(f"알 수 없는 video_sink '{kind}' → virtualcam 사용")
+    if not HAVE_VIRTUALCAM:
+        log.warning("pyvirtualcam 없음 → 비디오 출력 비활성화")
+        return None
+    return VirtualCamSink(width, height, fps)
+
+
+def make_audio_sink(cfg: dict, data_dir: Path,
+                    samplerate: int, channels: int) -> "AudioSink | None":
+    """config 에 따라 오디오 싱크 생성 (열기 전 상태). 사용 불가하면 None"""
+    kind = cfg.get('audio_sink', 'sounddevice')
+    if kind == 'null':
+        return NullAudioSink(samplerate, channels)
+    if kind == 'file':
+        return WavFileSink(data_dir / cfg.get('audio_file', 'lndivc.wav'),
+                           samplerate, channels)
+    if kind != 'sounddevice':
+        log.warning(f"알 수 없는 audio_sink '{kind}' → sounddevice 사용")
+    if not HAVE_AUDIO:
+        log.warning("sounddevice 없음 → 오디오 출력 비활성화")
+        return None
+    return SoundDeviceSink(samplerate, channels)
@@ -0,0 +1,308 @@
+"""
+LNDIVC 장시간 안정성(soak) 테스트
+---------------------------------
+run_server 를 이 프로세스 안에서 띄우고, synth_client.py 를 하위 프로세스로 실행해
+합성 WebRTC 클라이언트가 주기적으로 재접속하게 한 뒤 서버 프로세스의 자원 추이를 본다.
+클라이언트를 별도 프로세스로 두는 것은 클라이언트 쪽 할당이 측정에 섞이지 않게 하려는 것.
+
+    python soak.py --hours 8 [--session 60] [--clients 1] [--abrupt-every 3]
+                   [--interval 10] [--warmup 300] [--csv soak.csv]
+
+표본 (interval 초마다):
+    rss_mb      프로세스 상주 메모리
+    heap_mb     tracemalloc 으로 추적한 Python 할당량 (--no-tracemalloc 이면 없음)
+    handles     열린 파일 디스크립터 (Windows: 핸들 수)
+    threads     Python 스레드 수
+    tasks       이벤트 루프의 미완료 asyncio 태스크 수 (추적 안 되는 ensure_future 누수)
+    sessions    연결된 시그널링 세션 수
+    latency_ms  수신→싱크 파이프라인 지연 (세션 중일 때만)
+
+판정: warmup 이후, 모든 클라이언트가 연결돼 있던 표본끼리만 비교한다 (재접속 중인
+표본은 스레드·태스크 수가 달라 추세를 왜곡하므로 제외).  앞 1/3 과 뒤 1/3 의 중앙값
+차이가 LIMITS 의 허용치를 넘으면 실패 — 종료 코드 1.  tracemalloc 이 켜져 있으면
+warmup 직후와 종료 시점 스냅샷의 차이로 증가량 상위 할당 위치를 함께 출력한다.
+
+기본은 임시 디렉터리에 자체 서명 인증서와 null 싱크 config 를 만들어 쓴다.
+--data-dir 를 주면 그 디렉터리의 cert.pem / key.pem / config.json 을 그대로 쓴다
+(실제 OBS 가상 카메라·오디오 장치로 돌릴 때).
+"""
+
+import argparse
+import asyncio
+import atexit
+import contextlib
+import csv
+import gc
+import io
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import listeners
+
+try:
+    import psutil
+    HAVE_PSUTIL = True
+except ImportError:
+    HAVE_PSUTIL = False
+
+log = logging.getLogger(__name__)
+
+# 지표: (허용 증가 절대값, 허용 증가 비율) — 둘 중 큰 쪽을 넘으면 실패
+LIMITS = {
+    'rss_mb':     (32.0, 0.10),
+    'heap_mb':    (16.0, 0.10),
+    'handles':    (8,    0.0),
+    'threads':    (4,    0.0),
+    'tasks':      (10,   0.0),
+    'latency_ms': (20.0, 0.5),
+}
+FIELDS = ('t', 'rss_mb', 'heap_mb', 'handles', 'threads', 'tasks', 'sessions', 'latency_ms')
+
+
+# ── 프로세스 자원 ─────────────────────────────────────────────────────
+def _rss_mb() -> "float | None":
+    if HAVE_PSUTIL:
+        return psutil.Process().memory_info().rss / 2**20
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class _PMC(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + \
+                       [(n, ctypes.c_size_t) for n in (
+                           'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                           'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                           'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+        pmc = _PMC()
+        pmc.cb = ctypes.sizeof(pmc)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb)
+        return pmc.WorkingSetSize / 2**20
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return None
+
+
+def _handles() -> "int | None":
+    if HAVE_PSUTIL:
+        p = psutil.Process()
+        return p.num_handles() if sys.platform == 'win32' else p.num_fds()
+    if sys.platform == 'win32':
+        import ctypes
+        n = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetProcessHandleCount(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(n))
+        return n.value
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def sample(srv, t0: float) -> dict:
+    """서버 프로세스 상태 표본 1개 (이벤트 루프 스레드에서 호출)"""
+    stats = srv.get_stats()
+    lat = [p['latency_ms'] for p in stats['pipelines'].values() if p.get('frames_out')]
+    return {
+        't':          round(time.monotonic() - t0, 1),
+        'rss_mb':     _rss_mb(),
+        'heap_mb':    tracemalloc.get_traced_memory()[0] / 2**20 if tracemalloc.is_tracing() else None,
+        'handles':    _handles(),
+        'threads':    threading.active_count(),
+        'tasks':      len(asyncio.all_tasks()),
+        'sessions':   len(stats['sessions']),
+        'latency_ms': max(lat) if lat else None,
+    }
+
+
+# ── 추세 판정 ─────────────────────────────────────────────────────────
+def _slope_per_hour(ts: "list[float]", vs: "list[float]") -> float:
+    """최소제곱 기울기 (단위/시간)"""
+    mt, mv = statistics.fmean(ts), statistics.fmean(vs)
+    den = sum((t - mt) ** 2 for t in ts)
+    return 3600 * sum((t - mt) * (v - mv) for t, v in zip(ts, vs)) / den if den else 0.0
+
+
+def analyse(samples: "list[dict]", warmup: float, clients: int) -> "list[dict]":
+    """
+    지표별 추세. 각 항목: metric, n, measured, first, last, growth, slope_h, limit, ok
+    (ok None = 정상 구간 표본 부족, measured False = 이 플랫폼/설정에서 측정 안 되는 지표)
+    """
+    steady = [s for s in samples if s['t'] >= warmup and s['sessions'] == clients]
+    out = []
+    for metric, (abs_tol, rel_tol) in LIMITS.items():
+        pts = [(s['t'], s[metric]) for s in steady if s[metric] is not None]
+        if len(pts) < 6:
+            measured = any(s[metric] is not None for s in samples)
+            out.append({'metric': metric, 'n': len(pts), 'measured': measured, 'ok': None})
+            continue
+        k = len(pts) // 3
+        first = statistics.median(v for _, v in pts[:k])
+        last  = statistics.median(v for _, v in pts[-k:])
+        limit = max(abs_tol, rel_tol * abs(first))
+        out.append({
+            'metric':  metric,
+            'n':       len(pts),
+            'first':   first,
+            'last':    last,
+            'growth':  last - first,
+            'slope_h': _slope_per_hour(*zip(*pts)),
+            'limit':   limit,
+            'ok':      last - first <= limit,
+        })
+    return out
+
+
+def _top_allocators(base: "tracemalloc.Snapshot", end: "tracemalloc.Snapshot",
+                    limit: int = 10) -> "list[str]":
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, __file__),   # 표본 목록 자체
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')]
+    diff = end.filter_traces(filters).compare_to(base.filter_traces(filters), 'lineno')
+    grown = [d for d in diff if d.size_diff > 0]   # compare_to 는 |size_diff| 순 — 감소 먼저 제외
+    return [f"{d.size_diff / 1024:+9.1f} KiB {d.count_diff:+7d}  {d.traceback}"
+            for d in grown[:limit]]
+
+
+# ── 실행 ─────────────────────────────────────────────────────────────
+def _prepare_data_dir(path: "str | None") -> Path:
+    """--data-dir 없으면 임시 디렉터리에 인증서 + null 싱크 config 생성"""
+    if path:
+        return Path(path)
+    import generate_cert
+    d = Path(tempfile.mkdtemp(prefix='lndivc-soak-'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_cert.generate(d, 'ecdsa')
+    (d / 'config.json').write_text(json.dumps({
+        'mode': 'self_signed', 'video_sink': 'null', 'audio_sink': 'null',
+        'signaling_ping': 1,
+    }), encoding='utf-8')
+    return d
+
+
+async def _soak(args, srv) -> "tuple[list[dict], list[str], dict]":
+    stop  = asyncio.Event()
+    ready = asyncio.Event()
+    server = asyncio.ensure_future(srv.run_server(stop_event=stop, on_ready=ready.set))
+    await asyncio.wait_for(ready.wait(), 30)
+
+    duration = args.hours * 3600 if args.hours else args.duration
+    client = await asyncio.create_subprocess_exec(
+        sys.executable, str(Path(__file__).with_name('synth_client.py')),
+        listeners.local_url(srv.g_listen), '--duration', str(duration),
+        '--session', str(args.session), '--clients', str(args.clients),
+        '--abrupt-every', str(args.abrupt_every),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    samples: "list[dict]" = []
+    base = end = None
+    t0 = time.monotonic()
+    writer = None
+    csv_file = open(args.csv, 'w', newline='') if args.csv else None
+    if csv_file is not None:
+        writer = csv.DictWriter(csv_file, FIELDS)
+        writer.writeheader()
+    try:
+        while client.returncode is None:
+            try:
+                await asyncio.wait_for(client.wait(), args.interval)
+            except asyncio.TimeoutError:
+                pass
+            s = sample(srv, t0)
+            samples.append(s)
+            if writer is not None:
+                writer.writerow(s)
+                csv_file.flush()
+            print("  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                            for k, v in s.items()), flush=True)
+            if base is None and tracemalloc.is_tracing() and s['t'] >= args.warmup:
+                gc.collect()
+                base = tracemalloc.take_snapshot()
+        out, _ = await client.communicate()
+        print(f"클라이언트: {out.decode().strip()}")
+        try:
+            totals = json.loads(out.decode().strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            totals = {}   # 클라이언트 비정상 종료 — 요약 없음
+        if base is not None:
+            gc.collect()
+            end = tracemalloc.take_snapshot()
+    finally:
+        if client.returncode is None:
+            client.kill()
+            await client.wait()
+        if csv_file is not None:
+            csv_file.close()
+        stop.set()
+        await server
+    totals['returncode'] = client.returncode
+    return samples, (_top_allocators(base, end) if end is not None else []), totals
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description='LNDIVC 장시간 안정성 테스트')
+    ap.add_argument('--hours', type=float, default=0.0, help='실행 시간 (시간)')
+    ap.add_argument('--duration', type=float, default=600.0, help='실행 시간 (초, --hours 가 우선)')
+    ap.add_argument('--session', type=float, default=60.0, help='재접속 간격 (초)')
+    ap.add_argument('--clients', type=int, default=1, help='동시 합성 클라이언트 수')
+    ap.add_argument('--abrupt-every', type=int, default=3,
+                    help='N 번째 재접속마다 WebSocket 을 비정상 종료 (0: 안 함)')
+    ap.add_argument('--interval', type=float, default=10.0, help='표본 간격 (초)')
+    ap.add_argument('--warmup', type=float, default=120.0, help='판정에서 제외할 초기 구간 (초)')
+    ap.add_argument('--data-dir', help='cert.pem / key.pem / config.json 위치 (기본: 임시 + null 싱크)')
+    ap.add_argument('--csv', help='표본을 CSV 로 저장')
+    ap.add_argument('--no-tracemalloc', action='store_true',
+                    help='tracemalloc 끄기 (할당 추적 오버헤드 없이 실행)')
+    ap.add_argument('-v', '--verbose', action='store_true', help='서버 INFO 로그 표시')
+    args = ap.parse_args()
+
+    import server as srv
+    srv.DATA_DIR = _prepare_data_dir(args.data_dir)
+    if not args.data_dir:
+        atexit.register(shutil.rmtree, srv.DATA_DIR, True)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    if not args.no_tracemalloc:
+        tracemalloc.start(1)
+
+    samples, top, totals = asyncio.run(_soak(args, srv))
+
+    print()
+    print(f"  {'지표':12s} {'표본':>5s} {'처음':>9s} {'마지막':>9s} {'증가':>9s} {'/시간':>9s} {'허용':>8s}")
+    failed = False
+    for r in analyse(samples, args.warmup, args.clients):
+        if r['ok'] is None:
+            # 측정되는 지표인데 정상 구간 표본이 없으면 판정 불가 = 실패 (거짓 PASS 방지)
+            failed |= r['measured']
+            print(f"  {r['metric']:12s} {r['n']:5d}  "
+                  f"{'(표본 부족 — FAIL)' if r['measured'] else '(측정 안 됨)'}")
+            continue
+        failed |= not r['ok']
+        print(f"  {r['metric']:12s} {r['n']:5d} {r['first']:9.1f} {r['last']:9.1f} "
+              f"{r['growth']:+9.1f} {r['slope_h']:+9.1f} {r['limit']:8.1f}  "
+              f"{'OK' if r['ok'] else 'FAIL'}")
+    if top:
+        print("\n  증가량 상위 할당 위치 (warmup 이후):")
+        for line in top:
+            print("   ", line)
+    if totals.get('returncode') != 0 or not totals.get('connects') or totals.get('failures'):
+        failed = True
+        print(f"\n  합성 클라이언트 실패: 종료 코드 {totals.get('returncode')}, "
+              f"연결 {totals.get('connects', '?')}, 실패 {totals.get('failures', '?')}")
+    print(f"\n  결과: {'FAIL' if failed else 'PASS'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
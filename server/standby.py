@@ -0,0 +1,129 @@
+"""
+LNDIVC 대기 화면
+----------------
+연결된 세션이 없을 때 가상 카메라에 아무것도 보내지 않으면 회의 앱이 마지막 프레임에
+멈추거나 카메라가 죽었다고 판단해 장치를 놓아 버린다 (사용자가 'OBS Virtual Camera'
+를 다시 선택해야 함).  StandbyFeeder 는 라이브 프레임이 끊기면 낮은 주기(기본 5 fps)로
+미리 그려 둔 대기 화면을 계속 보낸다.
+
+  - 대기 화면(상태 문구 + 접속 URL + QR)은 (크기, URL, 상태) 별로 한 번만 렌더링해 캐시.
+    이후에는 같은 버퍼를 다시 보내기만 하므로 CPU 사용이 거의 없다.
+  - 라이브 싱크가 프레임을 보낼 때마다 mark_live() 를 호출하면, 대기 송출은 즉시 멈추고
+    라이브 프레임이 idle_after 초 동안 끊겼을 때만 재개한다.
+  - 송출은 라이브 싱크와 같은 lock 으로 직렬화한다 (싱크 send 는 스레드 안전하지 않음).
+
+cv2 Hershey 폰트는 ASCII 만 지원하므로 화면 문구는 영문.
+"""
+
+import functools
+import logging
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import qr_cache
+
+log = logging.getLogger(__name__)
+
+# 상태 키 → 화면 문구
+STATUS_TEXT = {
+    'waiting':    'Waiting for Vision Pro',
+    'connecting': 'Connecting...',
+}
+
+_BG      = (24, 24, 28)
+_FG      = (235, 235, 240)
+_DIM     = (150, 150, 160)
+_ACCENT  = (255, 165, 0)
+_FONT    = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@functools.lru_cache(maxsize=8)
+def render_standby(width: int, height: int, url: str, status: str = 'waiting') -> np.ndarray:
+    """대기 화면 rgb24 (읽기 전용, 캐시됨)"""
+    img = np.empty((height, width, 3), np.uint8)
+    img[:] = _BG
+    s = height / 720   # 720p 기준 배율
+
+    # 오른쪽: QR (모듈 단위 정수 배율로 최근접 확대 — 흐림 없음, 행렬은 qr_cache 공유)
+    text_right = width
+    qr = qr_cache.scaled(url, int(height * 0.6)) if url else None
+    if qr is not None:
+        qh   = qr.shape[0]
+        x0   = width - qh - int(80 * s)
+        y0   = (height - qh) // 2
+        img[y0:y0 + qh, x0:x0 + qh] = qr[..., None]
+        text_right = x0
+
+    # 왼쪽: 제목 / 상태 / URL
+    x = int(80 * s)
+    cv2.putText(img, 'LNDIVC', (x, int(250 * s)), _FONT, 2.4 * s, _FG, max(1, int(5 * s)),
+                cv2.LINE_AA)
+    cv2.putText(img, STATUS_TEXT.get(status, status), (x, int(330 * s)), _FONT, 1.1 * s,
+                _ACCENT, max(1, int(2 * s)), cv2.LINE_AA)
+    if url:
+        cv2.putText(img, 'Open in Safari on Vision Pro:', (x, int(430 * s)), _FONT, 0.8 * s,
+                    _DIM, max(1, int(2 * s)), cv2.LINE_AA)
+        # URL 이 QR 과 겹치지 않도록 글자 크기 축소
+        scale = 0.9 * s
+        while scale > 0.4 * s and \
+                cv2.getTextSize(url, _FONT, scale, 2)[0][0] > text_right - x - 40 * s:
+            scale *= 0.9
+        cv2.putText(img, url, (x, int(480 * s)), _FONT, scale, _FG, max(1, int(2 * s)),
+                    cv2.LINE_AA)
+    img.setflags(write=False)
+    return img
+
+
+class StandbyFeeder:
+    """라이브 프레임이 없을 때 대기 화면을 가상 카메라에 보내는 스레드"""
+
+    def __init__(self, cam, lock: threading.Lock, url: str,
+                 fps: float = 5.0, idle_after: float = 1.0):
+        self.cam        = cam
+        self.lock       = lock
+        self.url        = url
+        self.interval   = 1.0 / fps
+        self.idle_after = idle_after
+        self.frames     = 0
+        self._status    = 'waiting'
+        self._last_live = 0.0
+        self._stop      = threading.Event()
+        self._thread: "threading.Thread | None" = None
+
+    def mark_live(self) -> None:
+        """라이브 싱크가 프레임을 보낼 때마다 호출"""
+        self._last_live = time.monotonic()
+
+    def set_status(self, status: str) -> None:
+        self._status = status
+
+    @property
+    def active(self) -> bool:
+        """지금 대기 화면을 송출 중인지"""
+        return time.monotonic() - self._last_live > self.idle_after
+
+    def start(self) -> "StandbyFeeder":
+        self._thread = threading.Thread(target=self._run, name='standby', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.active:
+                continue
+            img = render_standby(self.cam.width, self.cam.height, self.url, self._status)
+            try:
+                with self.lock:
+                    self.cam.send(img)
+                self.frames += 1
+            except Exception as e:
+                log.warning(f"대기 화면 송출 오류: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -0,0 +1,43 @@
+// LNDIVC service worker — serves the UI from cache so the page opens instantly
+// on reconnect (or while the server is restarting), then refreshes the cache
+// in the background. Signaling (/ws) and /stats are never intercepted.
+'use strict';
+
+const VERSION = '__ASSETS_VERSION__';   // replaced by the server with a hash of static/
+const CACHE   = `lndivc-${VERSION}`;
+const SHELL   = ['/', '/index.html'];
+
+self.addEventListener('install', event => {
+  event.waitUntil(
+    caches.open(CACHE).then(cache => cache.addAll(SHELL)).then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys.filter(k => k !== CACHE).map(k => caches.delete(k))))
+      .then(() => self.clients.claim())
+  );
+});
+
+// stale-while-revalidate for same-origin GETs of static assets
+self.addEventListener('fetch', event => {
+  const req = event.request;
+  const url = new URL(req.url);
+  if (req.method !== 'GET' || url.origin !== location.origin) return;
+  if (url.pathname === '/ws' || url.pathname === '/stats') return;
+
+  event.respondWith(caches.open(CACHE).then(async cache => {
+    const cached  = await cache.match(req);
+    const network = fetch(req).then(resp => {
+      if (resp.ok) cache.put(req, resp.clone());
+      return resp;
+    });
+    if (cached) {
+      event.waitUntil(network.catch(() => {}));
+      return cached;
+    }
+    return network;
+  }));
+});
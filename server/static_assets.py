@@ -0,0 +1,146 @@
+"""
+LNDIVC 정적 자산 서버
+---------------------
+static/ 폴더를 시작 시 메모리에 올리고 gzip / brotli 로 미리 압축해 둔다.
+요청마다 파일 stat/read 가 없고, ETag 조건부 요청(If-None-Match → 304)을 지원해
+Tailscale 너머 재접속 시 전송량을 줄인다.
+
+Cache-Control:
+    index.html, sw.js — no-cache (항상 재검증, 변경 없으면 304 로 끝남)
+    그 외             — max-age 1일
+
+sw.js 안의 '__ASSETS_VERSION__' 은 나머지 자산 전체의 해시로 치환된다.  자산이 바뀌면
+sw.js 도 바뀌므로 브라우저가 새 서비스 워커를 설치하고 오래된 캐시를 정리한다.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+
+from aiohttp import web
+
+try:
+    import brotli
+    HAVE_BROTLI = True
+except Exception:
+    brotli = None
+    HAVE_BROTLI = False
+
+log = logging.getLogger(__name__)
+
+SW_NAME        = 'sw.js'
+VERSION_TOKEN  = b'__ASSETS_VERSION__'
+_REVALIDATE    = ('index.html', SW_NAME)
+_MAX_AGE       = 86400
+_COMPRESSIBLE  = ('text/', 'application/javascript', 'application/json',
+                  'image/svg+xml', 'application/manifest+json')
+
+
+class _Asset:
+    __slots__ = ('name', 'content_type', 'etag', 'cache_control', 'bodies')
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self.content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.etag = '"' + hashlib.sha256(data).hexdigest()[:20] + '"'
+        self.cache_control = 'no-cache' if name in _REVALIDATE else f'public, max-age={_MAX_AGE}'
+        # 인코딩 → 본문 (압축 결과가 더 작을 때만 보관)
+        self.bodies = {'identity': data}
+        if self.content_type.startswith(_COMPRESSIBLE):
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                self.bodies['gzip'] = gz
+            if HAVE_BROTLI:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(data):
+                    self.bodies['br'] = br
+
+
+def _accepted(header: str) -> "set[str]":
+    """Accept-Encoding → q>0 인 인코딩 집합"""
+    out = set()
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                pass
+        if token and q > 0:
+            out.add(token.strip().lower())
+    return out
+
+
+class StaticAssets:
+    """static/ 전체를 메모리에서 서빙. routes(app) 로 파일별 GET 경로 등록"""
+
+    def __init__(self, root: Path, service_worker: bool = True):
+        self.root = Path(root)
+        self.assets: "dict[str, _Asset]" = {}
+        self.requests     = 0
+        self.not_modified = 0
+        self.bytes_sent   = 0
+        self._load(service_worker)
+
+    def _load(self, service_worker: bool) -> None:
+        raw = {p.name: p.read_bytes() for p in sorted(self.root.iterdir()) if p.is_file()}
+        if not service_worker:
+            raw.pop(SW_NAME, None)
+        if SW_NAME in raw:
+            h = hashlib.sha256()
+            for name, data in raw.items():
+                if name != SW_NAME:
+                    h.update(name.encode() + b'\0' + data)
+            raw[SW_NAME] = raw[SW_NAME].replace(VERSION_TOKEN, h.hexdigest()[:12].encode())
+        for name, data in raw.items():
+            self.assets[name] = _Asset(name, data)
+        total = sum(len(a.bodies['identity']) for a in self.assets.values())
+        log.info(f"정적 자산 {len(self.assets)}개 로드 ({total} bytes, brotli={HAVE_BROTLI})")
+
+    def routes(self, app: web.Application) -> None:
+        for name in self.assets:
+            app.router.add_get(f'/{name}', self.handle)
+        if 'index.html' in self.assets:
+            app.router.add_get('/', self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        name  = request.path.lstrip('/') or 'index.html'
+        asset = self.assets.get(name)
+        if asset is None:
+            raise web.HTTPNotFound()
+        self.requests += 1
+        headers = {
+            'ETag':          asset.etag,
+            'Cache-Control': asset.cache_control,
+            'Vary':          'Accept-Encoding',
+        }
+        inm = request.headers.get('If-None-Match', '')
+        if inm and (inm.strip() == '*' or asset.etag in
+                    (t.strip().removeprefix('W/') for t in inm.split(','))):
+            self.not_modified += 1
+            return web.Response(status=304, headers=headers)
+
+        accepted = _accepted(request.headers.get('Accept-Encoding', ''))
+        for enc in ('br', 'gzip'):
+            if enc in asset.bodies and enc in accepted:
+                headers['Content-Encoding'] = enc
+                body = asset.bodies[enc]
+                break
+        else:
+            body = asset.bodies['identity']
+        self.bytes_sent += len(body)
+        charset = 'utf-8' if asset.content_type.startswith(_COMPRESSIBLE) else None
+        return web.Response(body=body, content_type=asset.content_type, charset=charset,
+                            headers=headers)
+
+    def stats(self) -> dict:
+        return {
+            'requests':     self.requests,
+            'not_modified': self.not_modified,
+            'bytes_sent':   self.bytes_sent,
+            'assets': {n: {k: len(v) for k, v in a.bodies.items()}
+                       for n, a in self.assets.items()},
+        }
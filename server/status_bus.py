@@ -0,0 +1,64 @@
+"""
+LNDIVC 상태 버스
+----------------
+서버 루프·작업 스레드 → 트레이 아이콘 방향의 상태 이벤트 전달.
+
+발행 측(asyncio 루프, 녹화/샘플링 스레드 등)은 publish() 로 (종류, 값) 을 deque 에
+넣기만 한다.  deque.append / popleft 는 GIL 하에서 원자적이므로 큐 자체에 락이 없고,
+발행 비용은 append 1회 + 대기 중인 소비자 깨우기뿐이다.
+
+소비 측(트레이 상태 스레드 1개)은 wait() 로 깨어나 잠깐(coalesce) 모은 뒤 drain() 으로
+한꺼번에 꺼내 순서대로 접어서(fold) 아이콘/메뉴를 한 번만 갱신한다.  ICE 상태가
+짧은 간격으로 여러 번 바뀌어도 아이콘 갱신은 1회로 합쳐진다.
+
+이벤트 종류:
+    STATE    WebRTC 연결 상태 문자열 (connected / disconnected / failed / closed ...)
+    SERVER   서버 스레드 상태 (running / stopped / error)
+    HEALTH   성능 요약 (perf.PerfSampler.health() 결과 또는 None)
+    ERROR    사용자에게 알릴 오류 문구
+    NOTIFY   (제목, 본문) 알림
+    PATH     연결 경로 (net_path: lan / direct / derp / relay / tailscale, 세션 없으면 None)
+    REFRESH  'icon' | 'menu' — 표시만 다시 계산 (언어 변경, 녹화 토글 등)
+"""
+
+import threading
+from collections import deque
+
+STATE   = 'state'
+SERVER  = 'server'
+HEALTH  = 'health'
+ERROR   = 'error'
+NOTIFY  = 'notify'
+PATH    = 'path'
+REFRESH = 'refresh'
+
+
+class StatusBus:
+    """다중 발행 / 단일 소비 이벤트 큐"""
+
+    def __init__(self, maxlen: int = 1024):
+        self._q: deque = deque(maxlen=maxlen)   # 소비가 멈추면 가장 오래된 이벤트부터 버림
+        self._ready = threading.Event()
+
+    def publish(self, kind: str, value=None) -> None:
+        """아무 스레드에서나 호출. 블록하지 않음"""
+        self._q.append((kind, value))
+        self._ready.set()
+
+    def wait(self, timeout: "float | None" = None) -> bool:
+        """이벤트가 생길 때까지 대기 (소비자 전용). 깨어났으면 True"""
+        ok = self._ready.wait(timeout)
+        self._ready.clear()   # drain 전에 지워야 그 사이 발행된 이벤트의 깨우기를 잃지 않음
+        return ok
+
+    def drain(self) -> "list[tuple[str, object]]":
+        """쌓인 이벤트를 발행 순서대로 모두 꺼냄 (소비자 전용)"""
+        out = []
+        q = self._q
+        while q:
+            out.append(q.popleft())
+        return out
+
+
+# 프로세스 공용 버스 — server.py 가 발행하고 tray_app.py 가 소비
+bus = StatusBus()
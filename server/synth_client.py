@@ -0,0 +1,251 @@
+"""
+LNDIVC 합성 클라이언트
+----------------------
+Vision Pro 없이 서버를 구동하기 위한 aiortc 클라이언트.  static/index.html 과 같은 /ws
+프로토콜(v2)을 쓴다: hello 와 offer 를 한 번에 보내고(offer SDP 에 수집된 후보 포함),
+binary ping 에 pong 으로 답하고, control 'stats' 요청에 보고서를 보내며, 연결되면
+timeline 을 보낸다.  비디오는 움직이는 그라디언트, 오디오는 440 Hz 사인파를 생성한다.
+
+    python synth_client.py https://127.0.0.1:8443 [--duration 600] [--session 60]
+                           [--clients 2] [--abrupt-every 3]
+
+--session 초마다 연결을 끊고 다시 접속한다.  --abrupt-every N 이면 N 번째 끊기마다
+WebSocket 닫기 핸드셰이크 없이 소켓을 버린다 (Safari 탭이 죽은 경우처럼 handle_ws 가
+비정상 종료하는 경로).  soak.py 가 이 스크립트를 하위 프로세스로 실행한다.
+"""
+
+import argparse
+import asyncio
+import fractions
+import json
+import logging
+import ssl
+import struct
+import time
+
+import aiohttp
+import av
+import numpy as np
+from aiortc import (AudioStreamTrack, RTCPeerConnection, RTCSessionDescription,
+                    VideoStreamTrack)
+
+log = logging.getLogger(__name__)
+
+PROTOCOL = 2
+OP_PING  = 1
+OP_PONG  = 2
+_PING    = struct.Struct('<BQ')
+
+AUDIO_RATE  = 48000
+AUDIO_PTIME = 0.020   # aiortc 기본 오디오 프레임 길이 (20 ms)
+
+
+class PatternVideoTrack(VideoStreamTrack):
+    """가로로 흐르는 그라디언트 (프레임마다 내용이 달라 인코더가 실제로 일을 함)"""
+
+    def __init__(self, width: int = 1280, height: int = 720):
+        super().__init__()
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        self._base = np.stack([np.broadcast_to(x, (height, width)),
+                               np.broadcast_to(y, (height, width)),
+                               (x + y) / 2 % 256], axis=-1).astype(np.uint8)
+        self.count = 0
+
+    def render(self, index: int) -> np.ndarray:
+        """index 번째 프레임 (rgb24). 하위 클래스가 내용을 덧그린다"""
+        return np.roll(self._base, index * 8, axis=1)
+
+    async def recv(self) -> av.VideoFrame:
+        pts, time_base = await self.next_timestamp()
+        frame = av.VideoFrame.from_ndarray(self.render(self.count), format='rgb24')
+        frame.pts, frame.time_base = pts, time_base
+        self.count += 1
+        return frame
+
+
+class ToneAudioTrack(AudioStreamTrack):
+    """20 ms 단위 모노 s16 사인파"""
+
+    def __init__(self, freq: float = 440.0, level: float = 0.1):
+        super().__init__()
+        self.freq  = freq
+        self.level = level
+        self.count = 0
+        self._samples = int(AUDIO_RATE * AUDIO_PTIME)
+        self._start: "float | None" = None
+
+    def render(self, index: int) -> np.ndarray:
+        """index 번째 20 ms 블록 (int16, 길이 samples)"""
+        n = self._samples
+        t = (np.arange(n) + index * n) / AUDIO_RATE
+        return (np.sin(2 * np.pi * self.freq * t) * self.level * 32767).astype(np.int16)
+
+    async def recv(self) -> av.AudioFrame:
+        # AudioStreamTrack.recv 와 같은 실시간 페이싱 (pts = 누적 샘플 수)
+        if self._start is None:
+            self._start = time.monotonic()
+        else:
+            wait = self._start + self.count * AUDIO_PTIME - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        frame = av.AudioFrame.from_ndarray(self.render(self.count)[None, :],
+                                           format='s16', layout='mono')
+        frame.sample_rate = AUDIO_RATE
+        frame.pts         = self.count * self._samples
+        frame.time_base   = fractions.Fraction(1, AUDIO_RATE)
+        self.count += 1
+        return frame
+
+
+class SyntheticClient:
+    """생성 트랙을 보내는 /ws 클라이언트 1개 (연결 1회 = connect → close)"""
+
+    def __init__(self, url: str, video: "VideoStreamTrack | None" = None,
+                 audio: "AudioStreamTrack | None" = None, verify: bool = False):
+        self.url   = url.rstrip('/')
+        self.video = video
+        self.audio = audio
+        self.ssl: "ssl.SSLContext | bool" = True
+        if not verify:   # 자체 서명 인증서
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            self.ssl = ctx
+        self.pc: "RTCPeerConnection | None" = None
+        self.session_id: "str | None" = None
+        self.controls: "list[dict]" = []   # 서버가 보낸 control 메시지
+        self._http: "aiohttp.ClientSession | None" = None
+        self._ws = None
+        self._reader: "asyncio.Task | None" = None
+        self._connected = asyncio.Event()
+        self._t0 = 0.0
+        self._marks: "dict[str, float]" = {}
+
+    def _mark(self, name: str) -> None:
+        self._marks.setdefault(name, round((time.perf_counter() - self._t0) * 1000, 1))
+
+    async def connect(self, timeout: float = 15.0) -> None:
+        """시그널링 후 피어 연결이 connected 가 될 때까지 대기"""
+        self._t0 = time.perf_counter()
+        self._mark('click')
+        self.pc = pc = RTCPeerConnection()
+        if self.video is not None:
+            pc.addTrack(self.video)
+        if self.audio is not None:
+            pc.addTrack(self.audio)
+
+        @pc.on('connectionstatechange')
+        def _on_state():
+            self._mark('pc_' + pc.connectionState)
+            if pc.connectionState == 'connected':
+                self._connected.set()
+                asyncio.ensure_future(self._send({'type': 'timeline', 'marks': self._marks}))
+
+        self._http = aiohttp.ClientSession()
+        ws_url = 'wss' + self.url[len('https'):] if self.url.startswith('https') else self.url
+        self._ws = await self._http.ws_connect(ws_url + '/ws', ssl=self.ssl)
+        self._mark('ws_open')
+        self._reader = asyncio.ensure_future(self._read())
+        await pc.setLocalDescription(await pc.createOffer())   # aiortc: 후보 수집 완료 후 반환
+        self._mark('offer_created')
+        await self._send({'type': 'hello', 'v': PROTOCOL,
+                          'features': ['candidates', 'ping', 'control', 'binary']})
+        await self._send({'type': 'offer', 'sdp': pc.localDescription.sdp})
+        self._mark('offer_sent')
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def _send(self, msg: dict) -> None:
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_str(json.dumps(msg, separators=(',', ':')))
+
+    async def _read(self) -> None:
+        ws = self._ws
+        async for m in ws:
+            if m.type == aiohttp.WSMsgType.BINARY:
+                if len(m.data) >= _PING.size and m.data[0] == OP_PING:
+                    _, t_us = _PING.unpack_from(m.data)
+                    await ws.send_bytes(_PING.pack(OP_PONG, t_us))
+                continue
+            if m.type != aiohttp.WSMsgType.TEXT:
+                break
+            msg = json.loads(m.data)
+            kind = msg.get('type')
+            if kind == 'welcome':
+                self._mark('welcome')
+                self.session_id = msg.get('session')
+            elif kind == 'answer':
+                self._mark('answer')
+                await self.pc.setRemoteDescription(RTCSessionDescription(sdp=msg['sdp'],
+                                                                         type='answer'))
+            elif kind == 'control':
+                self.controls.append(msg)
+                if msg.get('action') == 'stats':
+                    await self._send({'type': 'stats', 'id': msg.get('id'),
+                                      'report': {'synthetic': True}})
+
+    async def close(self, abrupt: bool = False) -> None:
+        """
+        abrupt=False: 페이지의 Stop 처럼 WebSocket 을 정상적으로 닫고 피어 연결 종료.
+        abrupt=True : 닫기 핸드셰이크 없이 소켓을 버린 뒤 피어 연결 종료.
+        """
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None and not abrupt:
+            await self._ws.close()
+        if self._http is not None:
+            conn = getattr(getattr(self._ws, '_response', None), 'connection', None)
+            if abrupt and conn is not None and conn.transport is not None:
+                conn.transport.abort()   # TCP 를 바로 끊음 (close 프레임 없음)
+            await self._http.close()
+        if self.pc is not None:
+            await self.pc.close()
+        self._ws = self._http = self._reader = None
+        self._connected.clear()
+
+
+async def run_clients(url: str, duration: float, session: float = 60.0,
+                      clients: int = 1, abrupt_every: int = 0) -> dict:
+    """clients 개의 클라이언트가 duration 초 동안 session 초마다 재접속. 집계 반환"""
+    totals = {'connects': 0, 'failures': 0, 'abrupt': 0}
+    end = time.monotonic() + duration
+
+    async def _one(n: int) -> None:
+        i = 0
+        while time.monotonic() < end:
+            c = SyntheticClient(url, PatternVideoTrack(), ToneAudioTrack())
+            abrupt = abrupt_every > 0 and (i + 1) % abrupt_every == 0
+            try:
+                await c.connect()
+                totals['connects'] += 1
+                await asyncio.sleep(max(0.0, min(session, end - time.monotonic())))
+            except Exception as e:
+                totals['failures'] += 1
+                log.warning(f"클라이언트 {n} 연결 실패: {e!r}")
+                await asyncio.sleep(1.0)   # 서버 재시작 중일 수 있음
+            finally:
+                await c.close(abrupt=abrupt)
+                totals['abrupt'] += abrupt
+            i += 1
+
+    await asyncio.gather(*(_one(n) for n in range(clients)))
+    return totals
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description='LNDIVC 합성 WebRTC 클라이언트')
+    ap.add_argument('url', nargs='?', default='https://127.0.0.1:8443')
+    ap.add_argument('--duration', type=float, default=60.0, help='전체 실행 시간 (초)')
+    ap.add_argument('--session', type=float, default=60.0, help='연결 1회 유지 시간 (초)')
+    ap.add_argument('--clients', type=int, default=1, help='동시 클라이언트 수')
+    ap.add_argument('--abrupt-every', type=int, default=0,
+                    help='N 번째 끊기마다 닫기 핸드셰이크 없이 소켓을 버림 (0: 안 함)')
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s  %(levelname)s  %(message)s")
+    totals = asyncio.run(run_clients(args.url, args.duration, args.session,
+                                     args.clients, args.abrupt_every))
+    print(json.dumps(totals))
+
+
+if __name__ == '__main__':
+    main()
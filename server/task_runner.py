@@ -0,0 +1,157 @@
+"""
+LNDIVC 백그라운드 작업 실행기
+-----------------------------
+GUI 에서 오래 걸리는 작업(인증서 발급, Tailscale 조회 등)을 전용 asyncio 루프 스레드에서
+실행한다.  GUI 스레드는 절대 블록되지 않는다.
+
+    handle = runner().submit(setup_tailscale_async, host, base_dir, timeout=90)
+    handle.pump(root, on_progress=log_var.set, on_done=_done)   # Tk 스레드에서 폴링
+    ...
+    handle.cancel()                                            # 창 닫기 / 취소 버튼
+
+작업 코루틴은 첫 인자로 progress(str) 콜백을 받는다.  진행 문구와 결과는 스레드 안전한
+큐로 전달되고, pump() 가 root.after 로 Tk 스레드에서 꺼내 콜백을 호출한다 (Tk 는
+스레드 안전하지 않으므로 다른 스레드에서 위젯을 직접 만지지 않는다).
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+# 이벤트 종류
+PROGRESS  = 'progress'
+DONE      = 'done'
+ERROR     = 'error'
+CANCELLED = 'cancelled'
+TIMEOUT   = 'timeout'
+
+
+class TaskHandle:
+    """실행 중인 작업 1개. 진행/완료 이벤트는 events 큐로 전달"""
+
+    def __init__(self, name: str):
+        self.name   = name
+        self.events: "queue.SimpleQueue[tuple[str, object]]" = queue.SimpleQueue()
+        self.state  = 'pending'   # pending | running | done | error | cancelled | timeout
+        self.result = None
+        self._future: "concurrent.futures.Future | None" = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state not in ('pending', 'running')
+
+    def progress(self, line: str) -> None:
+        """작업 코루틴에서 호출 — 진행 문구 1줄"""
+        self.events.put((PROGRESS, line))
+
+    def cancel(self) -> None:
+        """어느 스레드에서든 호출 가능. 작업 코루틴에 CancelledError 전달"""
+        if self._future is not None and not self.finished:
+            self._future.cancel()
+            if self.state == 'pending':   # 시작 전에 취소되면 _wrap 이 이벤트를 못 남김
+                self.state = CANCELLED
+                self.events.put((CANCELLED, None))
+
+    def pump(self, root, on_progress=None, on_done=None, interval_ms: int = 50) -> None:
+        """
+        Tk 스레드에서 이벤트를 꺼내 콜백 호출.
+        on_done(state, result) 는 완료 시 1번 호출된다 (state: done / error / cancelled / timeout).
+        창이 먼저 닫히면 작업을 취소하고 폴링을 멈춘다.
+        """
+        def _tick():
+            try:
+                if not root.winfo_exists():
+                    self.cancel()
+                    return
+            except Exception:
+                self.cancel()
+                return
+            while True:
+                try:
+                    kind, value = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == PROGRESS:
+                    if on_progress is not None:
+                        on_progress(value)
+                else:
+                    if on_done is not None:
+                        on_done(kind, value)
+                    return
+            root.after(interval_ms, _tick)
+        root.after(0, _tick)
+
+
+class TaskRunner:
+    """전용 스레드의 asyncio 루프에서 작업 코루틴 실행"""
+
+    def __init__(self):
+        self._loop: "asyncio.AbstractEventLoop | None" = None
+        self._thread: "threading.Thread | None" = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+
+                def _run():
+                    self._loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(self._loop)
+                    ready.set()
+                    self._loop.run_forever()
+
+                self._thread = threading.Thread(target=_run, name='tasks', daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def submit(self, fn, *args, timeout: "float | None" = None,
+               name: "str | None" = None) -> TaskHandle:
+        """fn(progress, *args) 코루틴을 실행하고 핸들 반환. timeout 초과 시 취소"""
+        handle = TaskHandle(name or getattr(fn, '__name__', 'task'))
+
+        async def _wrap():
+            handle.state = 'running'
+            try:
+                result = await asyncio.wait_for(fn(handle.progress, *args), timeout)
+            except asyncio.TimeoutError:
+                handle.state = TIMEOUT
+                handle.events.put((TIMEOUT, None))
+                log.warning(f"작업 시간 초과: {handle.name} ({timeout}초)")
+            except asyncio.CancelledError:
+                handle.state = CANCELLED
+                handle.events.put((CANCELLED, None))
+                raise
+            except Exception as e:
+                handle.state = ERROR
+                handle.events.put((ERROR, str(e)))
+                log.warning(f"작업 오류: {handle.name}: {e}")
+            else:
+                handle.state  = DONE
+                handle.result = result
+                handle.events.put((DONE, result))
+
+        handle._future = asyncio.run_coroutine_threadsafe(_wrap(), self._ensure_loop())
+        return handle
+
+    def shutdown(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2.0)
+            self._loop = self._thread = None
+
+
+_runner: "TaskRunner | None" = None
+
+
+def runner() -> TaskRunner:
+    """프로세스 공용 TaskRunner"""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
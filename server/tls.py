@@ -0,0 +1,102 @@
+"""
+LNDIVC TLS 설정
+---------------
+aiohttp 사이트용 서버 SSLContext 와 핸드셰이크 통계.
+
+  - TLS 1.2 이상만 허용, TLS 1.3 우선 (1-RTT 핸드셰이크)
+  - TLS 1.2 암호군: ECDHE + AES-128-GCM → ChaCha20 → AES-256-GCM 순, 서버 선호 적용
+    (Vision Pro 는 AES 하드웨어 가속이 있으므로 AES-GCM 우선)
+  - 세션 재개: TLS 1.3 세션 티켓 (num_tickets), TLS 1.2 세션 캐시/티켓 (OpenSSL 기본 활성)
+    → 페이지 로드 후 WSS 연결과 재접속은 전체 핸드셰이크를 건너뛴다
+  - ECDSA P-256 인증서(generate_cert.py --ecdsa)면 RSA-2048 보다 서명 비용이 훨씬 작다
+
+핸드셰이크 통계: ClientHello 수신 시각(sni_callback)부터 그 연결의 첫 HTTP 요청까지를
+연결별로 측정하고, 재개 여부·프로토콜 버전을 집계한다.  (첫 요청까지의 시간이므로
+클라이언트 → 서버 0.5 RTT 가 포함된 근사치)
+"""
+
+import logging
+import ssl
+import time
+import weakref
+from collections import Counter, deque
+from pathlib import Path
+
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# TLS 1.2 암호군 (TLS 1.3 암호군은 OpenSSL 기본값 사용 — 모두 AEAD)
+CIPHERS = ':'.join((
+    'ECDHE-ECDSA-AES128-GCM-SHA256', 'ECDHE-RSA-AES128-GCM-SHA256',
+    'ECDHE-ECDSA-CHACHA20-POLY1305', 'ECDHE-RSA-CHACHA20-POLY1305',
+    'ECDHE-ECDSA-AES256-GCM-SHA384', 'ECDHE-RSA-AES256-GCM-SHA384',
+))
+
+
+class HandshakeStats:
+    """연결별 TLS 핸드셰이크 측정 및 집계"""
+
+    def __init__(self, history: int = 50):
+        self.handshakes = 0
+        self.resumed    = 0
+        self.versions: Counter = Counter()
+        self.recent: deque = deque(maxlen=history)
+        self._started: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def on_client_hello(self, ssl_obj, server_name, ctx) -> None:
+        """SSLContext.sni_callback — SNI 유무와 관계없이 ClientHello 처리 중 호출된다"""
+        self._started[ssl_obj] = time.perf_counter()
+        return None
+
+    def on_request(self, request: web.Request) -> None:
+        """연결의 첫 요청에서 핸드셰이크 결과 기록"""
+        ssl_obj = request.transport.get_extra_info('ssl_object') if request.transport else None
+        if ssl_obj is None:
+            return
+        t0 = self._started.pop(ssl_obj, None)
+        if t0 is None:
+            return   # 이미 기록한 연결 (keep-alive)
+        reused  = ssl_obj.session_reused
+        version = ssl_obj.version()
+        self.handshakes += 1
+        self.resumed    += bool(reused)
+        self.versions[version] += 1
+        self.recent.append({
+            'path':    request.path,
+            'ms':      round((time.perf_counter() - t0) * 1000, 2),
+            'resumed': bool(reused),
+            'version': version,
+            'cipher':  (ssl_obj.cipher() or ('',))[0],
+        })
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        self.on_request(request)
+        return await handler(request)
+
+    def stats(self) -> dict:
+        full    = [r['ms'] for r in self.recent if not r['resumed']]
+        resumed = [r['ms'] for r in self.recent if r['resumed']]
+        return {
+            'handshakes':      self.handshakes,
+            'resumed':         self.resumed,
+            'versions':        dict(self.versions),
+            'full_ms_avg':     round(sum(full) / len(full), 2) if full else None,
+            'resumed_ms_avg':  round(sum(resumed) / len(resumed), 2) if resumed else None,
+            'recent':          list(self.recent)[-10:],
+        }
+
+
+def make_server_context(cert: Path, key: Path, tickets: int = 2,
+                        stats: "HandshakeStats | None" = None) -> ssl.SSLContext:
+    """튜닝된 서버 SSLContext. stats 를 주면 핸드셰이크 측정 콜백을 건다"""
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.options |= ssl.OP_CIPHER_SERVER_PREFERENCE | ssl.OP_NO_COMPRESSION
+    ctx.set_ciphers(CIPHERS)
+    ctx.num_tickets = tickets
+    ctx.load_cert_chain(cert, key)
+    if stats is not None:
+        ctx.sni_callback = stats.on_client_hello
+    return ctx
@@ -7,11 +7,15 @@ LNDIVC Tray Application
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
+import multiprocessing
 import queue as _queue
-import socket
 import sys
 import threading
+import time
+from collections import deque
 from pathlib import Path
 
 # ── 경로 설정 ─────────────────────────────────────────────────────────
@@ -37,13 +41,12 @@ except ImportError:
     import tkinter as ctk   # type: ignore
     HAVE_CTK = False
 
-try:
-    import qrcode
-    HAVE_QR = True
-except ImportError:
-    HAVE_QR = False
-
+import listeners
+import qr_cache
 from i18n import t, set_lang, get_lang, LANG_OPTIONS
+from perf import PerfSampler
+from status_bus import bus as _bus, STATE, SERVER, HEALTH, ERROR, NOTIFY, PATH, REFRESH
+from task_runner import runner as _runner
 
 # server.py는 av / cv2 등 무거운 패키지에 의존하므로 지연 임포트
 # (가상환경 없이 실행 시 트레이 GUI는 뜨되, 서버 시작 시 오류 안내)
@@ -67,14 +70,10 @@ def _show_import_error(err: str) -> None:
         "LNDIVC 파일이 손상되었거나 백신에 의해 차단되었을 수 있습니다.\n"
         "다시 다운로드해 보세요."
     )
-    try:
+    def _show():
         import tkinter.messagebox as mb
-        import tkinter as tk
-        _r = tk.Tk(); _r.withdraw()
-        mb.showerror("LNDIVC – 오류", msg)
-        _r.destroy()
-    except Exception:
-        pass
+        mb.showerror("LNDIVC – 오류", msg, parent=_gui_root)
+    _gui_call(_show)   # 공용 GUI 루트에서 표시
 
 
 # ── 전역 상태 ─────────────────────────────────────────────────────────
@@ -82,24 +81,51 @@ _icon: "pystray.Icon | None" = None
 _server_thread: "threading.Thread | None" = None
 _loop: "asyncio.AbstractEventLoop | None" = None
 _stop_event: "asyncio.Event | None" = None
+_ready = threading.Event()   # 서버가 리스닝을 시작하면 set (재시작 시간 측정)
+_STOP_GRACE = 2.0            # 서버 종료 마감(shutdown_timeout) 이후 스레드 합류 여유 (초)
 _conn_status = "stopped"   # stopped | running | connected | error
 
+# ── 성능 지표 (PERF_INTERVAL 초마다 서버 통계 샘플링 → 성능 창 그래프 / 툴팁 요약) ──
+PERF_INTERVAL = 1.0
+_perf = PerfSampler(history=120)
+_health: "tuple[str, str] | None" = None   # (등급, 요약) — 출력 중인 세션이 없으면 None
+_path: "str | None" = None                  # 연결 경로 (net_path) — lan / direct / derp / relay
+
 # ── GUI 전용 스레드 (tkinter 스레드 안전성) ───────────────────────────
-# 모든 CTk/tkinter 창은 이 단일 스레드에서 순차 실행되어
-# Tcl 인터프리터 스레드 불일치(RuntimeError: main thread is not in main loop)를 방지한다.
-_gui_queue: "_queue.Queue" = _queue.Queue()
+# 숨겨진 CTk 루트 1개가 이 스레드에서 mainloop 를 돌고, 모든 창은 그 위의 Toplevel 로
+# 만들어진다.  다른 스레드는 _gui_queue 에 함수를 넣기만 하고(_open_window / _gui_call),
+# 루트가 주기적으로 꺼내 실행한다 → 창들이 동시에 열리고 서로를 막지 않으며,
+# Tcl 인터프리터 스레드 불일치(RuntimeError: main thread is not in main loop)도 없다.
+_gui_queue: "_queue.SimpleQueue" = _queue.SimpleQueue()
 _gui_thread: "threading.Thread | None" = None
+_gui_root = None                       # 숨겨진 CTk/Tk 루트 (GUI 스레드 전용)
+_windows: "dict[str, object]" = {}     # 열린 창 (키별 1개)
+_GUI_POLL_MS = 50
 
 
 def _gui_worker() -> None:
-    while True:
-        fn = _gui_queue.get()
-        if fn is None:
-            return
-        try:
-            fn()
-        except Exception as exc:
-            print(f"[GUI 오류] {exc}")
+    global _gui_root
+    _apply_ctk_theme()
+    _gui_root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
+    _gui_root.withdraw()
+
+    def _drain():
+        while True:
+            try:
+                fn = _gui_queue.get_nowait()
+            except _queue.Empty:
+                break
+            if fn is None:
+                _gui_root.quit()
+                return
+            try:
+                fn()
+            except Exception as exc:
+                print(f"[GUI 오류] {exc}")
+        _gui_root.after(_GUI_POLL_MS, _drain)
+
+    _drain()
+    _gui_root.mainloop()
 
 
 # ── 설정 로드/저장 ────────────────────────────────────────────────────
@@ -120,18 +146,12 @@ def _save_config(cfg: dict) -> None:
 
 
 def _get_url() -> str:
-    cfg = _load_config()
-    port = cfg.get('port', 8443)
-    if cfg.get('mode') == 'tailscale' and cfg.get('hostname'):
-        return f"https://{cfg['hostname']}:{port}"
-    try:
-        local_ip = socket.gethostbyname(socket.gethostname())
-    except Exception:
-        local_ip = "127.0.0.1"
-    return f"https://{local_ip}:{port}"
+    # 서버 배너·대기 화면과 같은 계산 (config 'listen' 반영, 캐시된 인터페이스 — listeners.py)
+    return listeners.access_url(_load_config())
 
 
 # ── 트레이 아이콘 이미지 ──────────────────────────────────────────────
+STATUS_COALESCE = 0.05   # 상태 이벤트를 모으는 시간 (초) — 연속 변경은 한 번의 갱신으로
 _STATUS_COLORS = {
     'stopped':   (120, 120, 120),
     'running':   (255, 165,   0),
@@ -140,7 +160,9 @@ _STATUS_COLORS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def _make_icon_image(status: str = 'stopped') -> "Image.Image":
+    """상태별 아이콘 (상태마다 한 번만 그려 캐시 — main() 에서 미리 생성)"""
     color = _STATUS_COLORS.get(status, _STATUS_COLORS['stopped'])
     img  = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -152,17 +174,93 @@ def _make_icon_image(status: str = 'stopped') -> "Image.Image":
 
 
 # ── 트레이 아이콘/메뉴 업데이트 ──────────────────────────────────────
+# 아이콘·툴팁·메뉴는 상태 스레드(_status_worker)만 만진다.  다른 스레드는 버스에 발행만 한다.
 def _update_icon() -> None:
-    if _icon is None:
-        return
-    _icon.icon = _make_icon_image(_conn_status)
+    """아무 스레드에서나 호출 — 아이콘/툴팁 재계산 요청"""
+    _bus.publish(REFRESH, 'icon')
+
+
+def _refresh_menu() -> None:
+    """아무 스레드에서나 호출 — 메뉴 재구성 요청"""
+    _bus.publish(REFRESH, 'menu')
+
+
+def _status_title() -> str:
     label = {
         'stopped':   t('status_stopped'),
         'running':   t('status_running'),
         'connected': t('status_connected'),
         'error':     t('status_error'),
     }.get(_conn_status, _conn_status)
-    _icon.title = f"LNDIVC – {label}"
+    if srv is not None and srv.is_recording():
+        label += f" ● {t('recording')}"
+    if _health is not None and _conn_status == 'connected':
+        level, summary = _health
+        label += f" · {t('health_' + level)} {summary}"
+    if _path is not None and _conn_status == 'connected':
+        label += f" · {t('path_' + _path)}"
+    return f"LNDIVC – {label}"
+
+
+_shown: "tuple[str | None, str | None]" = (None, None)   # 마지막으로 반영한 (상태, 툴팁)
+
+
+def _apply_icon() -> None:
+    """상태 스레드 전용 — 바뀐 부분만 pystray 에 반영 (아이콘 이미지는 캐시)"""
+    global _shown
+    if _icon is None:
+        return
+    status, title = _conn_status, _status_title()
+    if status != _shown[0]:
+        _icon.icon = _make_icon_image(status)
+    if title != _shown[1]:
+        _icon.title = title
+    _shown = (status, title)
+
+
+def _status_worker() -> None:
+    """상태 버스 소비자. 이벤트를 잠깐 모아 순서대로 접은 뒤 아이콘/메뉴를 한 번만 갱신"""
+    global _conn_status, _health, _path
+    while True:
+        _bus.wait()
+        time.sleep(STATUS_COALESCE)
+        menu   = False
+        notify = None
+        for kind, value in _bus.drain():
+            if kind == SERVER:
+                _conn_status = value
+                menu = True
+                if value != 'running':
+                    _path = None
+            elif kind == STATE:
+                # 서버가 멈춘 뒤 늦게 도착한 연결 상태는 무시
+                if _conn_status in ('running', 'connected'):
+                    if value == 'connected':
+                        _conn_status = 'connected'
+                    elif value in ('disconnected', 'failed', 'closed'):
+                        _conn_status = 'running'   # 서버는 살아있음
+            elif kind == HEALTH:
+                _health = value
+            elif kind == PATH:
+                if value in ('derp', 'relay') and _path not in ('derp', 'relay') \
+                        and srv is not None and srv.g_config.get('relay_mode', 'auto') != 'off':
+                    notify = (t('path_' + value), t('path_low_bandwidth'))
+                _path = value
+            elif kind == ERROR:
+                notify = (t('status_error'), value)
+            elif kind == NOTIFY:
+                notify = value
+            elif kind == REFRESH:
+                menu = menu or value == 'menu'
+        try:
+            _apply_icon()
+            if menu and _icon is not None:
+                _icon.menu = _build_menu()
+            if notify is not None and _icon is not None:
+                title, body = notify
+                _icon.notify(body, title)
+        except Exception as exc:
+            print(f"[트레이 갱신 오류] {exc}")
 
 
 def _build_menu() -> "pystray.Menu":
@@ -179,12 +277,22 @@ def _build_menu() -> "pystray.Menu":
             lambda item: t('server_stop') if running else t('server_start'),
             _toggle,
         ),
+        pystray.MenuItem(t('server_restart'), _restart_async, enabled=running),
+        pystray.MenuItem(
+            lambda item: t('record_stop') if _is_recording() else t('record_start'),
+            _toggle_recording,
+            enabled=running,
+        ),
         pystray.Menu.SEPARATOR,
         pystray.MenuItem(
             t('show_qr'),
             lambda icon, item: _open_window(_qr_window_fn),
             enabled=running,
         ),
+        pystray.MenuItem(
+            t('performance'),
+            lambda icon, item: _open_window(_perf_window_fn),
+        ),
         pystray.MenuItem(
             t('settings'),
             lambda icon, item: _open_window(_settings_window_fn),
@@ -203,49 +311,97 @@ def _build_menu() -> "pystray.Menu":
     )
 
 
-def _refresh_menu() -> None:
-    if _icon is not None:
-        _icon.menu = _build_menu()
+# ── 녹화 ──────────────────────────────────────────────────────────────
+def _is_recording() -> bool:
+    return srv is not None and srv.is_recording()
 
 
-# ── 서버 관리 ─────────────────────────────────────────────────────────
-def _on_status_change(state: str) -> None:
-    """server.py에서 WebRTC 상태 변경 시 호출"""
-    global _conn_status
-    if state == 'connected':
-        _conn_status = 'connected'
-    elif state in ('disconnected', 'failed', 'closed'):
-        _conn_status = 'running'   # 서버는 살아있음
-    _update_icon()
+def _toggle_recording(icon=None, item=None) -> None:
+    if srv is None:
+        return
+    if srv.is_recording():
+        # 인코딩 잔량 마무리에 시간이 걸리므로 메뉴 스레드를 막지 않도록 별도 스레드
+        def _stop():
+            path = srv.stop_recording()
+            _update_icon()
+            _refresh_menu()
+            if path is not None:
+                _bus.publish(NOTIFY, (t('record_saved'), str(path)))
+        threading.Thread(target=_stop, daemon=True).start()
+    else:
+        srv.start_recording()
+        _update_icon()
+        _refresh_menu()
 
 
+# ── 성능 샘플링 ───────────────────────────────────────────────────────
+def _perf_worker() -> None:
+    """서버가 실행 중일 때만 PERF_INTERVAL 마다 get_stats() 샘플링. 요약이 바뀔 때만 발행"""
+    last = None
+    while True:
+        time.sleep(PERF_INTERVAL)
+        if srv is None or _loop is None:
+            if _perf.latest:
+                _perf.reset()
+            health = None
+        else:
+            try:
+                _perf.sample(srv.get_stats())
+            except Exception:
+                continue   # 세션 정리 중 등 일시적 불일치 — 다음 샘플에서
+            health = _perf.health(srv.VIDEO_FPS)
+        if health != last:
+            last = health
+            _bus.publish(HEALTH, health)
+
+
+# ── 서버 관리 ─────────────────────────────────────────────────────────
+# 연결 상태는 server.py 가 상태 버스(STATE)로 발행 → _status_worker 가 반영
 def _server_thread_fn() -> None:
-    global _loop, _stop_event, _conn_status
-    _loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(_loop)
-    _stop_event = asyncio.Event()
-    _conn_status = 'running'
-    _update_icon()
-    _refresh_menu()
-    try:
-        _loop.run_until_complete(
-            srv.run_server(stop_event=_stop_event, on_status=_on_status_change)
-        )
-    except Exception as e:
-        print(f"[서버 오류] {e}")
-    finally:
-        _conn_status = 'stopped'
-        _update_icon()
-        _refresh_menu()
-        _loop.close()
-        _loop = None
-        _stop_event = None
+    global _loop, _stop_event
+    _bus.publish(SERVER, 'running')
+    final = 'stopped'
+    # asyncio.Runner: 종료 시 남은 태스크 취소, async generator·기본 executor 정리까지 수행
+    # → 시작/중지를 반복해도 루프·스레드가 쌓이지 않음
+    with asyncio.Runner() as runner:
+        _loop = runner.get_loop()
+        _stop_event = asyncio.Event()
+        try:
+            runner.run(srv.run_server(stop_event=_stop_event, on_ready=_ready.set))
+        except Exception as e:
+            print(f"[서버 오류] {e}")
+            _bus.publish(ERROR, str(e))
+            final = 'error'
+        finally:
+            _loop = None
+            _stop_event = None
+    _ready.clear()
+    _bus.publish(SERVER, final)
+
+
+def _join_server(timeout: "float | None" = None) -> bool:
+    """종료 중인 서버 스레드가 끝날 때까지 대기 (마감 있음). 끝났으면 True"""
+    th = _server_thread
+    if th is None or th is threading.current_thread():
+        return True
+    if timeout is None:
+        cfg = srv.g_config if srv is not None else {}
+        timeout = float(cfg.get('shutdown_timeout', getattr(srv, 'SHUTDOWN_TIMEOUT', 3.0))) + _STOP_GRACE
+    th.join(timeout)
+    if th.is_alive():
+        print(f"[서버 종료 지연] {timeout:.1f}초 안에 끝나지 않음")
+        return False
+    return True
 
 
 def start_server() -> None:
     global _server_thread
     if _server_thread and _server_thread.is_alive():
-        return
+        if _stop_event is not None and not _stop_event.is_set():
+            return   # 이미 실행 중
+        # 중지 직후 시작 — 이전 스레드가 싱크를 다 닫을 때까지 기다려야 장치를 다시 열 수 있음
+        if not _join_server():
+            return
     if not _import_server():   # 가상환경 미활성 시 오류 안내 후 중단
         return
     if not (DATA_DIR / "cert.pem").exists():
@@ -253,48 +409,123 @@ def start_server() -> None:
         return
     _server_thread = threading.Thread(target=_server_thread_fn, daemon=True)
     _server_thread.start()
+    qr_cache.warm(_get_url())   # QR 창이 바로 열리도록 미리 렌더링
     _refresh_menu()
 
 
-def stop_server() -> None:
-    global _conn_status
-    if _loop and _stop_event:
-        _loop.call_soon_threadsafe(_stop_event.set)
-    _conn_status = 'stopped'
-    _update_icon()
-    _refresh_menu()
+def stop_server(wait: bool = False, restarting: bool = False) -> bool:
+    """
+    서버 중지 요청. wait=True 면 정리(세션·싱크 닫기)가 끝날 때까지 대기 — 끝났으면 True.
+    restarting=True 면 fast_restart 로 유지 중인 리스닝 소켓을 닫지 않는다.
+    """
+    loop, ev = _loop, _stop_event
+    if loop is not None and ev is not None:
+        try:
+            loop.call_soon_threadsafe(ev.set)
+        except RuntimeError:
+            pass   # 루프가 막 닫힘
+    if not restarting and srv is not None:
+        srv.close_listeners()
+    _bus.publish(SERVER, 'stopped')
+    return _join_server() if wait else True
+
+
+def restart_server() -> "float | None":
+    """
+    서버 재시작 (설정 변경 적용 등). 이전 서버가 완전히 정리된 뒤 새로 시작하고
+    다시 리스닝할 때까지의 시간(ms)을 반환. 실패하면 None.
+    메뉴 스레드를 막지 않도록 별도 스레드에서 호출한다.
+    """
+    t0 = time.perf_counter()
+    if not stop_server(wait=True, restarting=True):
+        return None
+    _ready.clear()
+    start_server()
+    if not _ready.wait(10.0):
+        return None
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"[서버 재시작] {ms:.0f} ms")
+    return ms
+
+
+def _restart_async(icon=None, item=None) -> None:
+    def _run():
+        ms = restart_server()
+        if ms is not None:
+            _bus.publish(NOTIFY, (t('server_restart'), t('restart_done').format(ms=ms)))
+        else:
+            _bus.publish(ERROR, t('restart_failed'))
+    threading.Thread(target=_run, name='restart', daemon=True).start()
 
 
 def _on_quit(icon, item=None) -> None:
-    stop_server()
+    stop_server(wait=True)   # 가상 카메라·오디오 장치를 닫고 종료
+    _gui_queue.put(None)   # GUI 루트 종료
     if _icon is not None:
         _icon.stop()
 
 
 # ── 창 유틸리티 ───────────────────────────────────────────────────────
-def _open_window(fn) -> None:
-    """GUI 전용 스레드에서 창 열기 (tkinter 스레드 안전)"""
+def _gui_call(fn) -> None:
+    """아무 스레드에서나 호출 — fn 을 GUI 스레드에서 실행 (tkinter 스레드 안전)"""
     global _gui_thread
     if _gui_thread is None or not _gui_thread.is_alive():
-        _gui_thread = threading.Thread(target=_gui_worker, daemon=True)
+        _gui_thread = threading.Thread(target=_gui_worker, name='gui', daemon=True)
         _gui_thread.start()
     _gui_queue.put(fn)
 
 
+def _open_window(fn) -> None:
+    """GUI 전용 스레드에서 창 열기"""
+    _gui_call(fn)
+
+
+def _new_window(key: str, title: str, geometry: "str | None" = None):
+    """
+    GUI 스레드에서 호출.  공용 루트 위에 Toplevel 을 만든다.
+    같은 key 의 창이 이미 열려 있으면 앞으로 가져오고 None 반환.
+    """
+    win = _windows.get(key)
+    if win is not None and win.winfo_exists():
+        win.deiconify()
+        win.lift()
+        win.focus_force()
+        return None
+    win = ctk.CTkToplevel(_gui_root) if HAVE_CTK else ctk.Toplevel(_gui_root)  # type: ignore
+    win.title(title)
+    win.resizable(False, False)
+    if geometry:
+        win.geometry(geometry)
+    _windows[key] = win
+
+    def _forget(event, k=key, w=win):
+        if event.widget is w and _windows.get(k) is w:
+            del _windows[k]
+
+    win.bind('<Destroy>', _forget, add='+')
+    # 트레이 메뉴에서 연 창이 다른 창 뒤에 뜨지 않도록
+    win.after(100, lambda: win.winfo_exists() and (win.lift(), win.focus_force()))
+    return win
+
+
+_theme_applied = False
+
+
 def _apply_ctk_theme() -> None:
-    if HAVE_CTK:
+    global _theme_applied
+    if HAVE_CTK and not _theme_applied:
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
+        _theme_applied = True
 
 
 # ── QR 코드 창 ────────────────────────────────────────────────────────
 def _qr_window_fn() -> None:
     url = _get_url()
-    _apply_ctk_theme()
 
-    root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
-    root.title(f"LNDIVC – {t('show_qr')}")
-    root.resizable(False, False)
+    root = _new_window('qr', f"LNDIVC – {t('show_qr')}")
+    if root is None:
+        return
 
     lbl_title = ctk.CTkLabel(root, text=t('scan_qr'), font=('', 15, 'bold')) if HAVE_CTK \
         else ctk.Label(root, text=t('scan_qr'))     # type: ignore
@@ -304,11 +535,10 @@ def _qr_window_fn() -> None:
         else ctk.Label(root, text=url, wraplength=300)  # type: ignore
     lbl_url.pack(pady=(0, 10))
 
-    if HAVE_QR:
+    if qr_cache.HAVE_QR:
         try:
             from PIL import ImageTk
-            qr_img = qrcode.make(url).resize((240, 240))
-            photo  = ImageTk.PhotoImage(qr_img)
+            photo  = ImageTk.PhotoImage(qr_cache.image(url), master=root)   # URL 별 캐시
             lbl_qr = ctk.CTkLabel(root, image=photo, text='') if HAVE_CTK \
                 else ctk.Label(root, image=photo)   # type: ignore
             lbl_qr.image = photo   # type: ignore  # GC 방지
@@ -317,7 +547,7 @@ def _qr_window_fn() -> None:
             pass
 
     # URL 복사 버튼
-    _copy_text = ctk.StringVar(value=t('copy_url'))
+    _copy_text = ctk.StringVar(master=root, value=t('copy_url'))
 
     def _copy():
         root.clipboard_clear()
@@ -333,26 +563,131 @@ def _qr_window_fn() -> None:
         ctk.Button(root, textvariable=_copy_text, command=_copy).pack(pady=4)   # type: ignore
         ctk.Button(root, text=t('close'), command=root.destroy).pack(pady=(0, 16))  # type: ignore
 
-    root.mainloop()
+
+# ── 성능 창 ───────────────────────────────────────────────────────────
+class _Sparkline:
+    """
+    Canvas 위의 작은 시계열 그래프.  새 값마다 기존 선분 전체를 한 번에 왼쪽으로 옮기고
+    (태그 move 1회) 선분 1개만 추가/삭제한다.  세로 축 범위가 바뀔 때만 전체를 다시 그린다.
+    """
+
+    def __init__(self, parent, label: str, unit: str, color: str,
+                 width: int = 300, height: int = 36, points: int = 60):
+        import tkinter as tk
+        self.label, self.unit = label, unit
+        self.w, self.h, self.n = width, height, points
+        self.dx     = width / (points - 1)
+        self.vmax   = 1.0
+        self.color  = color
+        self.vals: deque = deque(maxlen=points)
+        self.segs: deque = deque()
+        self.text = tk.StringVar(master=parent, value=label)
+        lbl = ctk.CTkLabel(parent, textvariable=self.text, anchor='w', font=('', 11)) \
+            if HAVE_CTK else tk.Label(parent, textvariable=self.text, anchor='w')
+        lbl.pack(fill='x', padx=16, pady=(6, 0))
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg='#1c1c1e',
+                                highlightthickness=0)
+        self.canvas.pack(padx=16, pady=(0, 2))
+
+    def _y(self, v: float) -> float:
+        return self.h - 2 - (self.h - 4) * min(v, self.vmax) / self.vmax
+
+    def _redraw(self) -> None:
+        c = self.canvas
+        c.delete('seg')
+        self.segs.clear()
+        vals = list(self.vals)
+        x0 = self.w - (len(vals) - 1) * self.dx
+        for i in range(1, len(vals)):
+            self.segs.append(c.create_line(
+                x0 + (i - 1) * self.dx, self._y(vals[i - 1]),
+                x0 + i * self.dx, self._y(vals[i]),
+                fill=self.color, width=1.5, tags='seg'))
+
+    def push(self, v: float) -> None:
+        self.vals.append(v)
+        self.text.set(f"{self.label}  {v:.1f} {self.unit}")
+        top = max(self.vals)
+        # 범위를 벗어나거나 너무 작아지면 축 재조정 후 전체 재그리기 (드묾)
+        if top > self.vmax or top < self.vmax / 4:
+            self.vmax = max(1.0, top * 1.25)
+            self._redraw()
+            return
+        if len(self.vals) < 2:
+            return
+        c = self.canvas
+        c.move('seg', -self.dx, 0)
+        self.segs.append(c.create_line(
+            self.w - self.dx, self._y(self.vals[-2]), self.w, self._y(v),
+            fill=self.color, width=1.5, tags='seg'))
+        while len(self.segs) > self.n - 1:
+            c.delete(self.segs.popleft())
+
+
+_PERF_GRAPHS = (
+    # 키, 라벨 키, 단위, 색
+    ('fps_in',      'perf_fps_in',   'fps', '#0a84ff'),
+    ('fps_out',     'perf_fps_out',  'fps', '#34c759'),
+    ('latency_ms',  'perf_latency',  'ms',  '#ffa500'),
+    ('audio_queue', 'perf_audio',    '',    '#bf5af2'),
+    ('loss_pct',    'perf_loss',     '%',   '#ff3b30'),
+    ('cpu_pct',     'perf_cpu',      '%',   '#64d2ff'),
+)
+
+
+def _perf_window_fn() -> None:
+    root = _new_window('perf', f"LNDIVC – {t('performance')}")
+    if root is None:
+        return
+
+    graphs: "dict[str, _Sparkline]" = {}
+    for key, label, unit, color in _PERF_GRAPHS:
+        graphs[key] = _Sparkline(root, t(label), unit, color)
+    stage_box = ctk.CTkFrame(root, fg_color='transparent') if HAVE_CTK \
+        else ctk.Frame(root)   # type: ignore
+    stage_box.pack(fill='x', pady=(4, 0))
+    status = ctk.StringVar(master=root, value='')
+    (ctk.CTkLabel(root, textvariable=status, text_color='gray') if HAVE_CTK
+     else ctk.Label(root, textvariable=status)).pack(pady=(4, 12))   # type: ignore
+
+    last_seq = [_perf.seq]
+
+    def _tick():
+        if not root.winfo_exists():
+            return
+        # 새 샘플이 있을 때만 그리기 (샘플링은 _perf_worker 가 담당)
+        if _perf.seq != last_seq[0]:
+            last_seq[0] = _perf.seq
+            m = _perf.latest
+            for key, value in m.items():
+                g = graphs.get(key)
+                if g is None and key.startswith('stage.'):
+                    # 스테이지는 세션 구성(autoframe / effects 등)에 따라 나타나므로 필요할 때 생성
+                    g = graphs[key] = _Sparkline(stage_box, f"{t('perf_stage')}: {key[6:]}",
+                                                 '%', '#8e8e93', height=24)
+                if g is not None:
+                    g.push(value)
+            status.set(t('perf_no_session') if not m.get('fps_out') else '')
+        root.after(int(PERF_INTERVAL * 1000), _tick)
+
+    _tick()
 
 
 # ── 설정 창 ───────────────────────────────────────────────────────────
 def _settings_window_fn() -> None:
-    _apply_ctk_theme()
     cfg  = _load_config()
     lang = cfg.get('lang', 'ko')
 
-    root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
-    root.title(t('settings'))
-    root.resizable(False, False)
-    root.geometry("380x300")
+    root = _new_window('settings', t('settings'), "380x300")
+    if root is None:
+        return
 
     if HAVE_CTK:
         ctk.CTkLabel(root, text=t('settings'), font=('', 16, 'bold')).pack(pady=(20, 14))
 
         # 언어
         ctk.CTkLabel(root, text=t('language'), anchor='w').pack(fill='x', padx=24)
-        lang_var = ctk.StringVar(value=lang)
+        lang_var = ctk.StringVar(master=root, value=lang)
         ctk.CTkOptionMenu(root, variable=lang_var, values=LANG_OPTIONS).pack(
             fill='x', padx=24, pady=(4, 14))
 
@@ -383,86 +718,152 @@ def _settings_window_fn() -> None:
         ctk.Label(root, text=t('settings')).pack(pady=10)    # type: ignore
         ctk.Button(root, text=t('close'), command=root.destroy).pack(pady=10)  # type: ignore
 
-    root.mainloop()
 
+# ── 인증서 설정 작업 (task_runner 스레드에서 실행) ────────────────────
+_SETUP_TIMEOUT = 120   # 초 — Tailscale 조회 + ACME 발급 여유 포함
+
+
+async def _setup_task(progress, mode: str, ts_host: "str | None",
+                      lang: "str | None" = None) -> bool:
+    """인증서 발급 + config 저장. 성공 시 실행 중인 서버에 즉시 재확인 요청"""
+    from setup_wizard import setup_tailscale_async, setup_self_signed_async, \
+        save_config as wiz_save
+    if mode == 'tailscale' and ts_host:
+        ok = await setup_tailscale_async(progress, ts_host, DATA_DIR)
+        if ok:
+            wiz_save('tailscale', ts_host, DATA_DIR)
+    else:
+        ok = await setup_self_signed_async(progress, DATA_DIR)
+        if ok:
+            wiz_save('self_signed', '', DATA_DIR)
+    if ok and lang is not None:
+        cfg = _load_config()
+        cfg['lang'] = lang
+        _save_config(cfg)
+    if ok:
+        _poke_cert_manager()
+    return ok
+
+
+def _poke_cert_manager() -> None:
+    """서버 실행 중이면 CertManager 가 새 인증서를 바로 다시 읽도록 요청"""
+    loop = _loop
+    certs = getattr(srv, 'g_certs', None) if srv is not None else None
+    if loop is not None and certs is not None:
+        loop.call_soon_threadsafe(certs.poke)
 
-# ── 인증서 설정 창 ────────────────────────────────────────────────────
-def _setup_window_fn() -> None:
-    from setup_wizard import (get_tailscale_hostname, setup_tailscale,
-                               setup_self_signed, save_config as wiz_save)
-    _apply_ctk_theme()
 
-    root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
-    root.title(t('setup_title'))
-    root.resizable(False, False)
-    root.geometry("420x380")
+def _setup_result_text(state: str, ok) -> str:
+    if state == 'done' and ok:
+        return t('setup_done')
+    if state == 'timeout':
+        return t('setup_timeout')
+    if state == 'cancelled':
+        return t('setup_cancelled')
+    return t('setup_failed')
 
-    ts_host    = get_tailscale_hostname()
-    ts_present = ts_host is not None
+
+def _detect_tailscale(root, on_result) -> None:
+    """Tailscale 호스트명 비동기 조회. on_result(host | None) 는 Tk 스레드에서 호출"""
+    from setup_wizard import get_tailscale_hostname_async
+    handle = _runner().submit(get_tailscale_hostname_async, timeout=8)
+    handle.pump(root, on_done=lambda state, host: on_result(host if state == 'done' else None))
+
+
+# ── 인증서 설정 창 ────────────────────────────────────────────────────
+def _setup_window_fn() -> None:
+    root = _new_window('setup', t('setup_title'), "420x380")
+    if root is None:
+        return
 
     if HAVE_CTK:
         ctk.CTkLabel(root, text=t('setup_title'), font=('', 16, 'bold')).pack(pady=(20, 14))
 
-        mode_var = ctk.StringVar(value='tailscale' if ts_present else 'self_signed')
+        # Tailscale 조회는 백그라운드 — 창은 바로 뜨고 결과가 오면 라디오 버튼 활성화
+        ts_host  = [None]
+        mode_var = ctk.StringVar(master=root, value='self_signed')
 
         ctk.CTkLabel(root, text=t('cert_mode'), anchor='w').pack(fill='x', padx=24)
-        ctk.CTkRadioButton(
+        rb_ts = ctk.CTkRadioButton(
             root, text=t('cert_tailscale'), variable=mode_var, value='tailscale',
-            state='normal' if ts_present else 'disabled'
-        ).pack(anchor='w', padx=48, pady=2)
+            state='disabled'
+        )
+        rb_ts.pack(anchor='w', padx=48, pady=2)
         ctk.CTkRadioButton(
             root, text=t('cert_self_signed'), variable=mode_var, value='self_signed'
         ).pack(anchor='w', padx=48, pady=2)
 
-        ts_info = f"  ✓ {t('tailscale_detected')}: {ts_host}" if ts_present \
-            else f"  {t('tailscale_not_found')}"
-        ctk.CTkLabel(root, text=ts_info,
-                     text_color='#34c759' if ts_present else 'gray',
-                     anchor='w').pack(fill='x', padx=24, pady=(4, 10))
+        ts_lbl = ctk.CTkLabel(root, text=f"  {t('tailscale_detecting')}",
+                              text_color='gray', anchor='w')
+        ts_lbl.pack(fill='x', padx=24, pady=(4, 10))
+
+        def _on_ts(host):
+            ts_host[0] = host
+            if host:
+                rb_ts.configure(state='normal')
+                mode_var.set('tailscale')
+                ts_lbl.configure(text=f"  ✓ {t('tailscale_detected')}: {host}",
+                                 text_color='#34c759')
+            else:
+                ts_lbl.configure(text=f"  {t('tailscale_not_found')}")
+
+        _detect_tailscale(root, _on_ts)
 
-        log_var = ctk.StringVar(value='')
+        log_var = ctk.StringVar(master=root, value='')
         ctk.CTkLabel(root, textvariable=log_var, wraplength=360, anchor='w').pack(
             fill='x', padx=24, pady=(0, 8))
 
+        task = [None]
+
         def _do_setup():
-            mode = mode_var.get()
             log_var.set(t('setup_in_progress'))
-            root.update()
-            ok = False
-            if mode == 'tailscale' and ts_present:
-                ok = setup_tailscale(ts_host, DATA_DIR)
-                if ok:
-                    wiz_save('tailscale', ts_host, DATA_DIR)
+            btn_apply.configure(state='disabled')
+            task[0] = _runner().submit(_setup_task, mode_var.get(), ts_host[0],
+                                       timeout=_SETUP_TIMEOUT, name='setup')
+            task[0].pump(root, on_progress=log_var.set, on_done=_on_done)
+
+        def _on_done(state, ok):
+            task[0] = None
+            log_var.set(_setup_result_text(state, ok))
+            btn_apply.configure(state='normal')
+
+        def _cancel():
+            # 진행 중이면 작업만 취소, 아니면 창 닫기
+            if task[0] is not None:
+                task[0].cancel()
             else:
-                ok = setup_self_signed(DATA_DIR)
-                if ok:
-                    wiz_save('self_signed', '', DATA_DIR)
-            log_var.set(t('setup_done') if ok else t('setup_failed'))
+                root.destroy()
+
+        def _on_close():
+            if task[0] is not None:
+                task[0].cancel()
+            root.destroy()
+
+        root.protocol('WM_DELETE_WINDOW', _on_close)
 
         row = ctk.CTkFrame(root, fg_color='transparent')
         row.pack(fill='x', padx=24, pady=12)
-        ctk.CTkButton(row, text=t('cancel'), command=root.destroy,
+        ctk.CTkButton(row, text=t('cancel'), command=_cancel,
                       fg_color='gray30').pack(side='left', expand=True, fill='x', padx=(0, 6))
-        ctk.CTkButton(row, text=t('apply'), command=_do_setup).pack(
-            side='right', expand=True, fill='x')
+        btn_apply = ctk.CTkButton(row, text=t('apply'), command=_do_setup)
+        btn_apply.pack(side='right', expand=True, fill='x')
     else:
         ctk.Label(root, text=t('setup_title')).pack(pady=10)  # type: ignore
         ctk.Button(root, text=t('close'), command=root.destroy).pack(pady=10)  # type: ignore
 
-    root.mainloop()
-
 
-# ── 최초 실행 설정 마법사 (메인 스레드, pystray 시작 전) ──────────────
+# ── 최초 실행 설정 마법사 (pystray 시작 전) ───────────────────────────
 def _first_run_wizard() -> bool:
     """
     config.json 없을 때 최초 실행 시 호출되는 GUI 마법사.
-    메인 스레드에서 pystray 시작 전에 실행됨.
+    메인 스레드에서 pystray 시작 전에 호출되며, 창은 GUI 스레드의 공용 루트에 뜬다
+    (메인 스레드는 결과를 기다리기만 함).
     완료 시 True, 취소/종료 시 False 반환.
     """
     from setup_wizard import (get_tailscale_hostname, setup_tailscale,
                                setup_self_signed, save_config as wiz_save)
 
-    # CTK 없으면 자동으로 self-signed 설정 후 진행
+    # CTK 없으면 자동으로 self-signed 설정 후 진행 (GUI 없음 — 동기 실행)
     if not HAVE_CTK:
         ts = get_tailscale_hostname()
         if ts:
@@ -475,14 +876,50 @@ def _first_run_wizard() -> bool:
             wiz_save('self_signed', '', DATA_DIR)
         return ok
 
-    _apply_ctk_theme()
+    result: "concurrent.futures.Future[bool]" = concurrent.futures.Future()
+    _open_window(lambda: _first_run_window(result))
+    # GUI 스레드가 죽으면(CTk 생성 실패 등) 결과가 영영 오지 않으므로 주기적으로 확인
+    while True:
+        try:
+            return result.result(timeout=0.5)
+        except concurrent.futures.TimeoutError:
+            if _gui_thread is None or not _gui_thread.is_alive():
+                print("[GUI 오류] 설정 마법사 창을 열 수 없습니다 (GUI 스레드 종료)")
+                return False
+        except Exception as exc:
+            print(f"[GUI 오류] 설정 마법사: {exc}")
+            return False
+
+
+def _first_run_window(result: "concurrent.futures.Future[bool]") -> None:
+    """GUI 스레드에서 마법사 창 생성 — 어떤 경로로 끝나든 result 를 채운다"""
+    root = None
+    try:
+        root = _new_window('wizard', 'LNDIVC', '480x510')
+        if root is None:
+            result.set_result(False)
+            return
+        _build_first_run_window(root, result)
+    except Exception as exc:
+        if not result.done():
+            result.set_exception(exc)
+        if root is not None:
+            try:
+                root.destroy()
+            except Exception:
+                pass
+        raise   # _drain 이 로그 출력
+
+
+def _build_first_run_window(root, result: "concurrent.futures.Future[bool]") -> None:
     completed = [False]
 
-    root = ctk.CTk()
-    root.title('LNDIVC')
-    root.resizable(False, False)
-    root.geometry('480x510')
-    root.protocol('WM_DELETE_WINDOW', root.destroy)  # X 클릭 = 취소
+    # 창이 어떤 식으로 닫히든 메인 스레드에 결과 전달
+    def _on_destroy(event):
+        if event.widget is root and not result.done():
+            result.set_result(completed[0])
+
+    root.bind('<Destroy>', _on_destroy, add='+')
 
     # ── 헤더 ──────────────────────────────────────────────────────────
     ctk.CTkLabel(root, text='LNDIVC', font=('', 28, 'bold')).pack(pady=(28, 2))
@@ -495,33 +932,43 @@ def _first_run_wizard() -> bool:
     _lang_labels = ['한국어 (ko)', 'English (en)']
     _lang_codes   = {'한국어 (ko)': 'ko', 'English (en)': 'en'}
     _lang_reverse = {v: k for k, v in _lang_codes.items()}
-    seg_var = ctk.StringVar(value=_lang_reverse.get(get_lang(), '한국어 (ko)'))
+    seg_var = ctk.StringVar(master=root, value=_lang_reverse.get(get_lang(), '한국어 (ko)'))
     seg = ctk.CTkSegmentedButton(root, values=_lang_labels, variable=seg_var)
     seg.pack(fill='x', padx=30, pady=(6, 22))
 
     # ── 인증서 방식 ────────────────────────────────────────────────────
     ctk.CTkLabel(root, text=t('cert_mode'), anchor='w',
                  font=('', 12)).pack(fill='x', padx=30)
-    ts_host    = get_tailscale_hostname()
-    ts_present = ts_host is not None
-    mode_var   = ctk.StringVar(value='tailscale' if ts_present else 'self_signed')
+    ts_host  = [None]
+    mode_var = ctk.StringVar(master=root, value='self_signed')
 
-    ctk.CTkRadioButton(
+    rb_ts = ctk.CTkRadioButton(
         root, text=t('cert_tailscale'), variable=mode_var, value='tailscale',
-        state='normal' if ts_present else 'disabled',
-    ).pack(anchor='w', padx=48, pady=2)
+        state='disabled',
+    )
+    rb_ts.pack(anchor='w', padx=48, pady=2)
     ctk.CTkRadioButton(
         root, text=t('cert_self_signed'), variable=mode_var, value='self_signed',
     ).pack(anchor='w', padx=48, pady=2)
 
-    ts_info = (f"  ✓ {t('tailscale_detected')}: {ts_host}" if ts_present
-               else f"  {t('tailscale_not_found')}")
-    ctk.CTkLabel(root, text=ts_info,
-                 text_color='#34c759' if ts_present else 'gray',
-                 anchor='w').pack(fill='x', padx=30, pady=(4, 16))
+    ts_lbl = ctk.CTkLabel(root, text=f"  {t('tailscale_detecting')}",
+                          text_color='gray', anchor='w')
+    ts_lbl.pack(fill='x', padx=30, pady=(4, 16))
+
+    def _on_ts(host):
+        ts_host[0] = host
+        if host:
+            rb_ts.configure(state='normal')
+            mode_var.set('tailscale')
+            ts_lbl.configure(text=f"  ✓ {t('tailscale_detected')}: {host}",
+                             text_color='#34c759')
+        else:
+            ts_lbl.configure(text=f"  {t('tailscale_not_found')}")
+
+    _detect_tailscale(root, _on_ts)
 
     # ── 상태 라벨 ──────────────────────────────────────────────────────
-    log_var = ctk.StringVar(value='')
+    log_var = ctk.StringVar(master=root, value='')
     ctk.CTkLabel(root, textvariable=log_var, wraplength=400,
                  anchor='w', text_color='gray').pack(fill='x', padx=30, pady=(0, 10))
 
@@ -529,8 +976,24 @@ def _first_run_wizard() -> bool:
     btn_row = ctk.CTkFrame(root, fg_color='transparent')
     btn_row.pack(fill='x', padx=30, pady=(0, 24))
 
+    task = [None]
+
+    def _quit():
+        # 진행 중이면 작업만 취소 (버튼은 완료 콜백에서 복구), 아니면 마법사 종료
+        if task[0] is not None:
+            task[0].cancel()
+        else:
+            root.destroy()
+
+    def _on_close():
+        if task[0] is not None:
+            task[0].cancel()
+        root.destroy()
+
+    root.protocol('WM_DELETE_WINDOW', _on_close)   # X 클릭 = 취소 (진행 중 작업도 취소)
+
     btn_quit = ctk.CTkButton(btn_row, text='종료 / Exit', fg_color='gray30',
-                              command=root.destroy)
+                              command=_quit)
     btn_quit.pack(side='left', expand=True, fill='x', padx=(0, 6))
     btn_ok = ctk.CTkButton(btn_row, text='완료 및 시작 / Finish & Start',
                             command=lambda: _run())
@@ -540,43 +1003,21 @@ def _first_run_wizard() -> bool:
         lang = _lang_codes.get(seg_var.get(), 'ko')
         set_lang(lang)
         btn_ok.configure(state='disabled')
-        btn_quit.configure(state='disabled')
         log_var.set(t('setup_in_progress'))
-        root.update()
-
-        mode = mode_var.get()
-
-        def _worker():
-            ok = False
-            if mode == 'tailscale' and ts_present:
-                ok = setup_tailscale(ts_host, DATA_DIR)
-                if ok:
-                    wiz_save('tailscale', ts_host, DATA_DIR)
-            else:
-                ok = setup_self_signed(DATA_DIR)
-                if ok:
-                    wiz_save('self_signed', '', DATA_DIR)
-            # 언어도 config에 저장
-            if ok:
-                cfg = _load_config()
-                cfg['lang'] = lang
-                _save_config(cfg)
-
-            def _done():
-                if ok:
-                    completed[0] = True
-                    log_var.set(t('setup_done'))
-                    root.after(700, root.destroy)
-                else:
-                    log_var.set(t('setup_failed'))
-                    btn_ok.configure(state='normal')
-                    btn_quit.configure(state='normal')
-            root.after(0, _done)
-
-        threading.Thread(target=_worker, daemon=True).start()
-
-    root.mainloop()
-    return completed[0]
+        # 언어도 config에 저장 (성공 시)
+        task[0] = _runner().submit(_setup_task, mode_var.get(), ts_host[0], lang,
+                                   timeout=_SETUP_TIMEOUT, name='setup')
+        task[0].pump(root, on_progress=log_var.set, on_done=_done)
+
+    def _done(state, ok):
+        task[0] = None
+        log_var.set(_setup_result_text(state, ok))
+        if state == 'done' and ok:
+            completed[0] = True
+            btn_quit.configure(state='disabled')
+            root.after(700, root.destroy)
+        else:
+            btn_ok.configure(state='normal')
 
 
 # ── OBS 상태 확인 창 ──────────────────────────────────────────────────
@@ -621,30 +1062,44 @@ def _check_vbcable_installed() -> bool:
     return False
 
 
-def _drivers_window_fn() -> None:
-    _apply_ctk_theme()
+async def _probe_drivers(progress) -> "tuple[bool, str, bool]":
+    """OBS / VB-Audio 확인 (pyvirtualcam 초기화가 수 초 걸릴 수 있어 executor 에서)"""
+    loop = asyncio.get_running_loop()
+    obs_ok, obs_dev = await loop.run_in_executor(None, _check_obs_installed)
+    vbc_ok = await loop.run_in_executor(None, _check_vbcable_installed)
+    return obs_ok, obs_dev, vbc_ok
+
 
-    root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
-    root.title(t('drivers_title'))
-    root.resizable(False, False)
-    root.geometry("500x400")
+def _drivers_window_fn() -> None:
+    root = _new_window('drivers', t('drivers_title'), "500x400")
+    if root is None:
+        return
 
     if not HAVE_CTK:
         ctk.Label(root, text=t('drivers_title')).pack(pady=20)   # type: ignore
         ctk.Button(root, text=t('close'), command=root.destroy).pack()  # type: ignore
-        root.mainloop()
         return
 
     ctk.CTkLabel(root, text=t('drivers_title'),
                  font=('', 16, 'bold')).pack(pady=(20, 4))
     ctk.CTkLabel(root, text=t('drivers_desc'), text_color='gray').pack(pady=(0, 14))
 
+    # 확인은 백그라운드 — 창은 바로 뜨고 결과가 오면 채운다
+    checking = ctk.CTkLabel(root, text=t('drv_checking'), text_color='gray')
+    checking.pack(pady=(0, 10))
+
+    def _on_probe(state, result):
+        checking.destroy()
+        obs_ok, obs_dev, vbc_ok = result if state == 'done' else (False, '', False)
+        _fill_drivers(root, obs_ok, obs_dev, vbc_ok)
+
+    _runner().submit(_probe_drivers, timeout=30, name='drivers').pump(root, on_done=_on_probe)
+
+
+def _fill_drivers(root, obs_ok: bool, obs_dev: str, vbc_ok: bool) -> None:
     def _sc(ok: bool) -> str:
         return '#34c759' if ok else '#ff3b30'
 
-    obs_ok, obs_dev = _check_obs_installed()
-    vbc_ok = _check_vbcable_installed()
-
     # ── OBS 상태 행 ──────────────────────────────────────────────────
     drv_frame = ctk.CTkFrame(root)
     drv_frame.pack(fill='x', padx=24, pady=(0, 6))
@@ -695,8 +1150,6 @@ def _drivers_window_fn() -> None:
     ctk.CTkButton(root, text=t('close'), command=root.destroy,
                   fg_color='gray30').pack(padx=24, pady=(0, 16), fill='x')
 
-    root.mainloop()
-
 
 # ── 제거 헬퍼 ─────────────────────────────────────────────────────────
 def _open_browser(url: str) -> None:
@@ -748,7 +1201,7 @@ def _do_uninstall(log_cb: "callable") -> None:
     import shutil, os as _os
 
     log_cb("● 서버 중지 중...")
-    stop_server()
+    stop_server(wait=True)   # 인증서 파일을 지우기 전에 서버가 완전히 내려가도록
 
     # 설정·인증서 파일 삭제
     log_cb("● 설정 파일 삭제 중...")
@@ -788,17 +1241,13 @@ def _do_uninstall(log_cb: "callable") -> None:
 
 # ── 제거 창 ───────────────────────────────────────────────────────────
 def _uninstall_window_fn() -> None:
-    _apply_ctk_theme()
-
-    root = ctk.CTk() if HAVE_CTK else ctk.Tk()   # type: ignore
-    root.title(t('uninstall_title'))
-    root.resizable(False, False)
-    root.geometry("500x420")
+    root = _new_window('uninstall', t('uninstall_title'), "500x420")
+    if root is None:
+        return
 
     if not HAVE_CTK:
         ctk.Label(root, text=t('uninstall_title')).pack(pady=20)   # type: ignore
         ctk.Button(root, text=t('close'), command=root.destroy).pack()  # type: ignore
-        root.mainloop()
         return
 
     ctk.CTkLabel(root, text=t('uninstall_title'),
@@ -823,19 +1272,23 @@ def _uninstall_window_fn() -> None:
 
     def _log(msg: str) -> None:
         def _update():
+            if not root.winfo_exists():
+                return
             log_box.configure(state='normal')
             log_box.insert('end', msg + '\n')
             log_box.see('end')
             log_box.configure(state='disabled')
-        root.after(0, _update)
+        _gui_call(_update)   # 작업 스레드 → GUI 스레드
 
     done = [False]
 
     def _worker():
         """백그라운드 스레드에서 제거 실행 (GUI 프리즈 방지)"""
         _do_uninstall(_log)
-        # 완료 후 버튼 전환 (root.after로 GUI 스레드에서 실행)
+        # 완료 후 버튼 전환 (GUI 스레드에서 실행)
         def _on_done():
+            if not root.winfo_exists():
+                return
             btn_row.pack_forget()
             extra = ctk.CTkFrame(root, fg_color='transparent')
             extra.pack(fill='x', padx=24, pady=(0, 16))
@@ -849,7 +1302,7 @@ def _uninstall_window_fn() -> None:
                 command=lambda: [_on_quit(None), root.destroy()],
                 fg_color='#ff3b30',
             ).pack(side='right', expand=True, fill='x')
-        root.after(0, _on_done)
+        _gui_call(_on_done)
 
     def _run_uninstall() -> None:
         if done[0]:
@@ -869,13 +1322,14 @@ def _uninstall_window_fn() -> None:
                              command=_run_uninstall, fg_color='#ff3b30')
     btn_run.pack(side='right', expand=True, fill='x')
 
-    root.mainloop()
-
 
 # ── 메인 ──────────────────────────────────────────────────────────────
 def main() -> None:
     global _icon
 
+    # pipeline 'process' 스테이지의 워커 프로세스면 여기서 워커로 동작 (server.main 과 같음)
+    multiprocessing.freeze_support()
+
     cfg = _load_config()
     set_lang(cfg.get('lang', 'ko'))
 
@@ -893,10 +1347,6 @@ def main() -> None:
             pass
         return
 
-    if HAVE_CTK:
-        ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("blue")
-
     # ── 최초 실행: config.json 없으면 설정 마법사 실행 ─────────────────
     if not (DATA_DIR / 'config.json').exists():
         if not _first_run_wizard():
@@ -905,6 +1355,8 @@ def main() -> None:
         cfg = _load_config()
         set_lang(cfg.get('lang', 'ko'))
 
+    for status in _STATUS_COLORS:   # 상태별 아이콘 미리 그려 두기
+        _make_icon_image(status)
     _icon = pystray.Icon(
         name='LNDIVC',
         icon=_make_icon_image('stopped'),
@@ -912,6 +1364,9 @@ def main() -> None:
         menu=_build_menu(),
     )
 
+    threading.Thread(target=_status_worker, name='status', daemon=True).start()
+    threading.Thread(target=_perf_worker, name='perf', daemon=True).start()
+
     # cert.pem 있으면 자동 시작
     if (DATA_DIR / "cert.pem").exists():
         start_server()